@@ -57,6 +57,8 @@ PLUGIN_MODULES = [
     ("src/ground_plane.py",        "ground_plane.py"),
     ("src/signal_integrity.py",    "signal_integrity.py"),
     ("src/via_stitching.py",       "via_stitching.py"),
+    ("src/net_matching.py",        "net_matching.py"),
+    ("src/spatial_index.py",       "spatial_index.py"),
     ("emc_rules.toml",             "emc_rules.toml"),
     ("emc_icon.png",               "emc_icon.png"),
     ("icon-24.png",                "icon-24.png"),
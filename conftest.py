@@ -3,11 +3,19 @@ conftest.py — pytest session configuration (project root).
 
 Installs the pcbnew mock into sys.modules before any test module is collected,
 ensuring that ``import pcbnew`` in ``signal_integrity.py`` resolves to our stub.
+Also puts src/ on sys.path (as the plugin's __init__.py does for the deployed
+package) so checker modules loaded by file path can import shared modules
+such as net_matching.
 All shared fixtures and helper classes live in ``tests/helpers.py``.
 """
 
 import sys
 import types
+from pathlib import Path
+
+_SRC_DIR = str(Path(__file__).parent / "src")
+if _SRC_DIR not in sys.path:
+    sys.path.append(_SRC_DIR)  # Appended: test files still insert src/ first where they need it
 
 def _install_pcbnew_mock():
     if "pcbnew" in sys.modules:
@@ -50,6 +58,7 @@ def _install_pcbnew_mock():
         def AddItem(self, *a): pass
     class PCB_SHAPE(_Stub):
         def SetShape(self, *a): pass
+        def SetFilled(self, *a): pass
         def SetStart(self, *a): pass
         def SetEnd(self, *a):   pass
         def SetWidth(self, *a): pass
@@ -165,6 +174,12 @@ def _install_pcbnew_mock():
     mod.VECTOR2I   = VECTOR2I
     mod.SHAPE_POLY_SET = SHAPE_POLY_SET
     mod.SHAPE_T_SEGMENT = 0
+    mod.SHAPE_T_CIRCLE = 1
+
+    class ActionPlugin(_Stub):
+        """Base class of emc_auditor_plugin.EMCAuditorPlugin."""
+        def register(self): pass
+    mod.ActionPlugin = ActionPlugin
     sys.modules["pcbnew"] = mod
 
 _install_pcbnew_mock()
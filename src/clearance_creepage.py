@@ -55,6 +55,7 @@ class ClearanceCreepageChecker:
         self.draw_marker = None
         self.draw_arrow = None
         self.get_distance = None
+        self.get_distance_sq = None
         
         # Results tracking
         self.violation_count = 0
@@ -73,7 +74,8 @@ class ClearanceCreepageChecker:
         self.max_obstacles = self.config.get('max_obstacles', 500)  # Maximum obstacles per layer for creepage pathfinding
         self.obstacle_search_margin_mm = self.config.get('obstacle_search_margin_mm', 12.0)  # Spatial filtering margin
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Main entry point - performs complete clearance/creepage verification.
         
@@ -86,6 +88,8 @@ class ClearanceCreepageChecker:
             get_distance_func: Function(pos1, pos2) to calculate distance between points
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function(pos1, pos2) returning squared distance,
+                used where distances are only compared (no sqrt)
         
         Returns:
             int: Number of violations found
@@ -95,6 +99,7 @@ class ClearanceCreepageChecker:
         self.draw_marker = draw_marker_func
         self.draw_arrow = draw_arrow_func
         self.get_distance = get_distance_func
+        self.get_distance_sq = get_distance_sq_func
         
         self.log("\n=== CLEARANCE & CREEPAGE CHECK START ===", force=True)
         check_clearance_enabled = self.config.get('check_clearance', True)
@@ -739,7 +744,7 @@ class ClearanceCreepageChecker:
         # Return distance from point to closest point
         dist_x = point.x - closest_x
         dist_y = point.y - closest_y
-        return math.sqrt(dist_x * dist_x + dist_y * dist_y)
+        return math.hypot(dist_x, dist_y)
     
     def _calculate_clearance(self, features_a, features_b):
         """
@@ -762,6 +767,7 @@ class ClearanceCreepageChecker:
         closest_net_b = None
         closest_layer_a = None
         closest_layer_b = None
+        fast_reject_margin = pcbnew.FromMM(2.0)  # Converted once, used for every pad pair
         
         # Compare all pad pairs between domains (Phase 1: pad-to-pad only)
         for feature_a in features_a:
@@ -782,7 +788,7 @@ class ClearanceCreepageChecker:
                 
                 # If approximate distance is already much larger than current minimum,
                 # skip expensive polygon calculation (threshold: 2mm)
-                if approx_edge_distance > min_distance + pcbnew.FromMM(2.0):
+                if approx_edge_distance > min_distance + fast_reject_margin:
                     continue
                 
                 # ACCURATE PATH: Only calculate exact polygon distance for close pads
@@ -889,7 +895,8 @@ class ClearanceCreepageChecker:
         self.log(f"    Checking {len(pairs_to_check)} closest pad pair(s)...")
         
         for idx, (approx_dist, pad_a, pad_b) in enumerate(pairs_to_check):
-            self.log(f"      Pair {idx+1}/{len(pairs_to_check)}: approx {pcbnew.ToMM(approx_dist):.2f}mm")
+            if self.verbose:
+                self.log(f"      Pair {idx+1}/{len(pairs_to_check)}: approx {pcbnew.ToMM(approx_dist):.2f}mm")
             
             # Pathfinding from pad_a edge to pad_b edge
             path = self._visibility_graph_path(
@@ -1442,9 +1449,10 @@ class ClearanceCreepageChecker:
             closest_a_pos = None
             closest_b_pos = None
             
+            # Only the closest pair is needed: compare squared distances
             for pad_a in pads_a:
                 for pad_b in pads_b:
-                    dist = self.get_distance(pad_a.GetPosition(), pad_b.GetPosition())
+                    dist = self.get_distance_sq(pad_a.GetPosition(), pad_b.GetPosition())
                     if dist < min_dist:
                         min_dist = dist
                         closest_a_pos = pad_a.GetPosition()
@@ -1610,6 +1618,9 @@ class ClearanceCreepageChecker:
         self.log(f"    Barrier layer IDs to search: {barrier_layer_ids}")
 
         edge_cut_count = 0
+        # Polygon conversion parameters, converted once for all barrier graphics
+        barrier_clearance = pcbnew.FromMM(0.1)
+        barrier_max_error = pcbnew.FromMM(0.005)
 
         # Board-level graphics on Edge.Cuts (lines, arcs, circles defining outline/slots)
         board_drawing_count = 0
@@ -1626,7 +1637,7 @@ class ClearanceCreepageChecker:
                 # polygon barrier wide enough for the intersection tests to catch.
                 drawing.TransformShapeToPolygon(
                     draw_poly, drawing.GetLayer(),
-                    pcbnew.FromMM(0.1), pcbnew.FromMM(0.005), pcbnew.ERROR_INSIDE
+                    barrier_clearance, barrier_max_error, pcbnew.ERROR_INSIDE
                 )
             except Exception:
                 continue
@@ -1649,7 +1660,7 @@ class ClearanceCreepageChecker:
                 try:
                     graphic.TransformShapeToPolygon(
                         draw_poly, graphic.GetLayer(),
-                        pcbnew.FromMM(0.1), pcbnew.FromMM(0.005), pcbnew.ERROR_INSIDE
+                        barrier_clearance, barrier_max_error, pcbnew.ERROR_INSIDE
                     )
                 except Exception:
                     continue
@@ -2080,9 +2091,12 @@ class ClearanceCreepageChecker:
         # Check against ALL barriers (board outline + internal slots)
         # ------------------------------------------------------------------
         crosses = self._path_crosses_slot(start, goal, all_slot_obstacles)
-        self.log(f"        Direct line crosses slot: {crosses}")
-        self.log(f"        Start: ({pcbnew.ToMM(start.x):.2f}, {pcbnew.ToMM(start.y):.2f})mm, "
-                 f"Goal: ({pcbnew.ToMM(goal.x):.2f}, {pcbnew.ToMM(goal.y):.2f})mm")
+        # Coordinate dumps are only formatted when the logger will keep them
+        verbose = self.verbose
+        if verbose:
+            self.log(f"        Direct line crosses slot: {crosses}")
+            self.log(f"        Start: ({pcbnew.ToMM(start.x):.2f}, {pcbnew.ToMM(start.y):.2f})mm, "
+                     f"Goal: ({pcbnew.ToMM(goal.x):.2f}, {pcbnew.ToMM(goal.y):.2f})mm")
         if not crosses:
             distance = pcbnew.ToMM(self.get_distance(start, goal))
             return {'length': distance, 'nodes': [start, goal]}
@@ -2101,7 +2115,7 @@ class ClearanceCreepageChecker:
         # off-board and unreachable.  Internal slots are the real obstacles
         # the creepage path must detour around.
         # ------------------------------------------------------------------
-        for si, s in enumerate(internal_slots):
+        for si, s in enumerate(internal_slots if verbose else ()):
             bb = s.get('bbox')
             if bb:
                 self.log(f"        Slot[{si}]: ({pcbnew.ToMM(bb.GetLeft()):.2f}, "
@@ -2131,7 +2145,7 @@ class ClearanceCreepageChecker:
             hops = len(result['nodes']) - 2
             self.log(f"        Dijkstra found: {length_mm:.2f}mm "
                      f"({hops} intermediate waypoint{'s' if hops != 1 else ''})")
-            for ni, node in enumerate(result['nodes']):
+            for ni, node in enumerate(result['nodes'] if verbose else ()):
                 label = "START" if ni == 0 else ("GOAL" if ni == len(result['nodes']) - 1 else f"WP{ni}")
                 self.log(f"          {label}: ({pcbnew.ToMM(node.x):.2f}, {pcbnew.ToMM(node.y):.2f})mm")
             return {'length': length_mm, 'nodes': result['nodes']}
@@ -2160,8 +2174,7 @@ class ClearanceCreepageChecker:
             seg.SetEnd(path[i + 1])
             seg.SetLayer(self.marker_layer)
             seg.SetWidth(line_width)
-            self.board.Add(seg)
-            group.AddItem(seg)
+            self.auditor.add_to_violation_group(self.board, group, seg)
 
         # Add length label at path midpoint
         mid_idx = len(path) // 2
@@ -2180,8 +2193,7 @@ class ClearanceCreepageChecker:
         txt.SetLayer(self.marker_layer)
         txt.SetTextSize(pcbnew.VECTOR2I(text_size, text_size))
         txt.SetTextThickness(line_width)
-        self.board.Add(txt)
-        group.AddItem(txt)
+        self.auditor.add_to_violation_group(self.board, group, txt)
 
         self.log(f"      Debug: drew creepage path ({len(path)} nodes, {hops} waypoints)")
 
@@ -2195,8 +2207,7 @@ class ClearanceCreepageChecker:
         seg.SetEnd(pt_b)
         seg.SetLayer(self.marker_layer)
         seg.SetWidth(line_width)
-        self.board.Add(seg)
-        group.AddItem(seg)
+        self.auditor.add_to_violation_group(self.board, group, seg)
 
     def _create_creepage_violation_marker(self, domain_a, domain_b, actual_mm, required_mm, path, start_pad, end_pad, create_group_func):
         """
@@ -11,6 +11,10 @@ Last Updated: 2026-02-12
 """
 
 import pcbnew
+import math
+import re
+
+from net_matching import compile_substring_matcher
 
 
 class DecouplingChecker:
@@ -49,13 +53,18 @@ class DecouplingChecker:
         self.draw_marker = None
         self.draw_arrow = None
         self.get_distance = None
+        self.get_distance_sq = None
         self.create_group = None
         
         # Results tracking
         self.violation_count = 0
         self.warning_count = 0
+        
+        # Position of every via on the board, read on first use (see _count_vias_near_capacitor)
+        self._via_positions = None
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Main entry point - performs decoupling capacitor verification.
         
@@ -68,6 +77,8 @@ class DecouplingChecker:
             get_distance_func: Function(pos1, pos2) returns distance
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function(pos1, pos2) returns squared distance
+                (threshold comparisons without sqrt)
         
         Returns:
             int: Number of violations found
@@ -77,7 +88,9 @@ class DecouplingChecker:
         self.draw_marker = draw_marker_func
         self.draw_arrow = draw_arrow_func
         self.get_distance = get_distance_func
+        self.get_distance_sq = get_distance_sq_func
         self.create_group = create_group_func
+        self._via_positions = None  # Board may have changed since a previous check()
         
         self.log("\n=== DECOUPLING CAPACITOR CHECK START ===", force=True)
         
@@ -106,146 +119,152 @@ class DecouplingChecker:
         self.log(f"Non-SMD threshold: {non_smd_value_threshold_uf} µF")
         self.log(f"Via count check: {check_via_count} (min {min_vias_per_cap} vias)")
         
-        # Scan all ICs
+        # str.startswith() takes a tuple of prefixes: one call instead of a Python any() loop
+        ic_prefix_tuple = tuple(ic_prefixes)
+        cap_prefix_tuple = tuple(cap_prefixes)
+        
+        # Power net matcher: one regex search per pad instead of a substring loop
+        is_power_net = compile_substring_matcher(power_patterns)
+        
+        # Single pass over the footprints: collect ICs and build the capacitor table,
+        # where each capacitor is listed under every net its pads touch, in footprint
+        # order (the order the search used to scan)
+        ics = []
+        caps_by_net = {}
         for footprint in self.board.GetFootprints():
             ref = str(footprint.GetReference())
-            if any(ref.startswith(prefix) for prefix in ic_prefixes):
+            if ref.startswith(ic_prefix_tuple):
+                ics.append((footprint, ref))
+            if ref.startswith(cap_prefix_tuple):
+                cap_entry = (footprint, ref, footprint.GetPosition(), self._is_smd_footprint(footprint))
+                for cap_net in {str(cap_pad.GetNetname()) for cap_pad in footprint.Pads()}:
+                    caps_by_net.setdefault(cap_net, []).append(cap_entry)
+        
+        # Scan all ICs
+        for footprint, ref in ics:
+            if self.verbose:
                 self.log(f"\n>>> Found IC: {ref}")
+            
+            # Check each power pad
+            for pad in footprint.Pads():
+                power_net = str(pad.GetNetname())  # Get actual net name for matching
+                net_name = power_net.upper()
                 
-                # Check each power pad
-                for pad in footprint.Pads():
-                    net_name = str(pad.GetNetname()).upper()
-                    power_net = str(pad.GetNetname())  # Get actual net name for matching
+                if is_power_net(net_name):
+                    pad_pos = pad.GetPosition()
+                    if self.verbose:
+                        self.log(f"    Checking power pad '{power_net}' at ({pcbnew.ToMM(pad_pos.x):.2f}, {pcbnew.ToMM(pad_pos.y):.2f}) mm")
                     
-                    if any(pat in net_name for pat in power_patterns):
-                        pad_pos = pad.GetPosition()
-                        pad_x_mm = pcbnew.ToMM(pad_pos.x)
-                        pad_y_mm = pcbnew.ToMM(pad_pos.y)
-                        self.log(f"    Checking power pad '{power_net}' at ({pad_x_mm:.2f}, {pad_y_mm:.2f}) mm")
-                        
-                        best_dist = float('inf')
-                        nearest_cap_pos = None
-                        nearest_cap_ref = None
-                        nearest_cap_fp = None
-                        
-                        # Find nearest capacitor CONNECTED TO THE SAME POWER NET
-                        # Prioritize SMD capacitors if configured
-                        smd_candidates = []
-                        tht_candidates = []
-                        
-                        for cap in self.board.GetFootprints():
-                            cap_ref = str(cap.GetReference())
-                            if any(cap_ref.startswith(prefix) for prefix in cap_prefixes):
-                                # Check if capacitor is connected to this power net
-                                cap_connected = False
-                                for cap_pad in cap.Pads():
-                                    if str(cap_pad.GetNetname()) == power_net:
-                                        cap_connected = True
-                                        break
-                                
-                                # Only consider capacitors on the same power net
-                                if cap_connected:
-                                    d = self.get_distance(pad.GetPosition(), cap.GetPosition())
-                                    is_smd = self._is_smd_footprint(cap)
-                                    
-                                    if prefer_smd and is_smd:
-                                        smd_candidates.append((d, cap, cap_ref))
-                                    else:
-                                        tht_candidates.append((d, cap, cap_ref))
-                        
-                        # Select nearest capacitor (prioritize SMD if configured)
-                        if prefer_smd and smd_candidates:
-                            smd_candidates.sort(key=lambda x: x[0])
-                            best_dist, nearest_cap_fp, nearest_cap_ref = smd_candidates[0]
-                            nearest_cap_pos = nearest_cap_fp.GetPosition()
-                        elif tht_candidates or smd_candidates:
-                            all_candidates = smd_candidates + tht_candidates
-                            all_candidates.sort(key=lambda x: x[0])
-                            best_dist, nearest_cap_fp, nearest_cap_ref = all_candidates[0]
-                            nearest_cap_pos = nearest_cap_fp.GetPosition()
+                    best_dist = float('inf')
+                    nearest_cap_pos = None
+                    nearest_cap_ref = None
+                    nearest_cap_fp = None
+                    
+                    # Find nearest capacitor CONNECTED TO THE SAME POWER NET
+                    # Prioritize SMD capacitors if configured
+                    # (squared distances; the first capacitor wins a tie)
+                    nearest_any = None  # (dist_sq, cap, cap_ref, is_smd)
+                    nearest_smd = None
+                    
+                    # Only capacitors connected to this power net are candidates
+                    for cap, cap_ref, cap_pos, is_smd in caps_by_net.get(power_net, ()):
+                        dist_sq = self.get_distance_sq(cap_pos, pad_pos)
                         
-                        # Log result of capacitor search
+                        if nearest_any is None or dist_sq < nearest_any[0]:
+                            nearest_any = (dist_sq, cap, cap_ref, is_smd)
+                        if is_smd and (nearest_smd is None or dist_sq < nearest_smd[0]):
+                            nearest_smd = (dist_sq, cap, cap_ref, is_smd)
+                    
+                    # Select nearest capacitor (prioritize SMD if configured)
+                    nearest = nearest_smd if prefer_smd and nearest_smd else nearest_any
+                    if nearest is not None:
+                        best_dist_sq, nearest_cap_fp, nearest_cap_ref, nearest_cap_smd = nearest
+                        best_dist = math.sqrt(best_dist_sq)
+                        nearest_cap_pos = nearest_cap_fp.GetPosition()
+                    
+                    # Log result of capacitor search (messages are only built when verbose)
+                    if self.verbose:
                         dist_mm = pcbnew.ToMM(best_dist) if best_dist != float('inf') else float('inf')
-                        if best_dist <= max_dist:
+                    if best_dist <= max_dist:
+                        if self.verbose:
                             cap_info = f"{nearest_cap_ref}"
                             if nearest_cap_fp:
-                                is_smd = self._is_smd_footprint(nearest_cap_fp)
-                                cap_info += f" ({'SMD' if is_smd else 'THT'})"
+                                cap_info += f" ({'SMD' if nearest_cap_smd else 'THT'})"
                             self.log(f"        ✓ Nearest capacitor ({cap_info}): {dist_mm:.2f} mm - OK")
-                            
-                            # Check via count if enabled
-                            if check_via_count and nearest_cap_fp:
-                                via_count = self._count_vias_near_capacitor(nearest_cap_fp, via_search_radius_mm)
-                                if via_count < min_vias_per_cap:
-                                    self.warning_count += 1
-                                    warning_group = self.create_group(self.board, "DecapViaWarn", nearest_cap_ref, None)
-                                    warning_msg = f"⚠ LOW VIA COUNT\n{nearest_cap_ref}\n{via_count}/{min_vias_per_cap} vias"
-                                    self.draw_marker(
-                                        self.board,
-                                        nearest_cap_fp.GetPosition(),
-                                        warning_msg,
-                                        self.marker_layer,
-                                        warning_group
-                                    )
-                                    self.log(f"        ⚠ Warning: Only {via_count} via(s) near capacitor (min {min_vias_per_cap})")
-                                else:
-                                    self.log(f"        ✓ Via count OK: {via_count} via(s)")
-                        else:
-                            self.log(f"        ❌ Nearest capacitor ({nearest_cap_ref if nearest_cap_ref else 'NONE'}): {dist_mm:.2f} mm - EXCEEDS {max_dist_mm} mm limit")
                         
-                        # If violation found, create individual group and draw markers
-                        if best_dist > max_dist:
-                            # Check if nearest cap is non-SMD large capacitor (warning instead of error)
-                            is_warning = False
-                            if nearest_cap_fp and not self._is_smd_footprint(nearest_cap_fp):
-                                cap_value_uf = self._get_capacitor_value_uf(nearest_cap_fp)
-                                if cap_value_uf is not None and cap_value_uf >= non_smd_value_threshold_uf:
-                                    is_warning = True
-                                    self.warning_count += 1
-                                    self.log(f"        ⚠ Warning: Non-SMD bulk cap ({cap_value_uf:.1f}µF) - acceptable for large values")
-                            
-                            if is_warning:
-                                # Create warning marker (yellow)
-                                warning_group = self.create_group(self.board, "DecapWarn", f"{ref}_{power_net}", None)
-                                dist_mm = pcbnew.ToMM(best_dist)
-                                msg = f"⚠ BULK CAP FAR\n({dist_mm:.1f}mm)\nTHT OK >22µF"
+                        # Check via count if enabled
+                        if check_via_count and nearest_cap_fp:
+                            via_count = self._count_vias_near_capacitor(nearest_cap_fp, via_search_radius_mm)
+                            if via_count < min_vias_per_cap:
+                                self.warning_count += 1
+                                warning_group = self.create_group(self.board, "DecapViaWarn", nearest_cap_ref, None)
+                                warning_msg = f"⚠ LOW VIA COUNT\n{nearest_cap_ref}\n{via_count}/{min_vias_per_cap} vias"
                                 self.draw_marker(
                                     self.board,
-                                    pad.GetPosition(),
-                                    msg,
+                                    nearest_cap_fp.GetPosition(),
+                                    warning_msg,
                                     self.marker_layer,
                                     warning_group
                                 )
-                            else:
-                                # Create error violation
-                                self.violation_count += 1
-                                violation_group = self.create_group(self.board, "Decap", f"{ref}_{power_net}", None)
-                                
-                                dist_mm = pcbnew.ToMM(best_dist)
-                                msg = violation_msg_template.format(distance=dist_mm)
-                                self.draw_marker(
-                                    self.board,
-                                    pad.GetPosition(),
-                                    msg,
-                                    self.marker_layer,
-                                    violation_group
-                                )
-                                pad_x_mm = pcbnew.ToMM(pad.GetPosition().x)
-                                pad_y_mm = pcbnew.ToMM(pad.GetPosition().y)
-                                self.log(f"        ✓ Violation marker created at ({pad_x_mm:.2f}, {pad_y_mm:.2f}) mm", force=True)
+                                if self.verbose:
+                                    self.log(f"        ⚠ Warning: Only {via_count} via(s) near capacitor (min {min_vias_per_cap})")
+                            elif self.verbose:
+                                self.log(f"        ✓ Via count OK: {via_count} via(s)")
+                    elif self.verbose:
+                        self.log(f"        ❌ Nearest capacitor ({nearest_cap_ref if nearest_cap_ref else 'NONE'}): {dist_mm:.2f} mm - EXCEEDS {max_dist_mm} mm limit")
+                    
+                    # If violation found, create individual group and draw markers
+                    if best_dist > max_dist:
+                        # Check if nearest cap is non-SMD large capacitor (warning instead of error)
+                        is_warning = False
+                        if nearest_cap_fp and not nearest_cap_smd:
+                            cap_value_uf = self._get_capacitor_value_uf(nearest_cap_fp)
+                            if cap_value_uf is not None and cap_value_uf >= non_smd_value_threshold_uf:
+                                is_warning = True
+                                self.warning_count += 1
+                                if self.verbose:
+                                    self.log(f"        ⚠ Warning: Non-SMD bulk cap ({cap_value_uf:.1f}µF) - acceptable for large values")
+                        
+                        if is_warning:
+                            # Create warning marker (yellow)
+                            warning_group = self.create_group(self.board, "DecapWarn", f"{ref}_{power_net}", None)
+                            dist_mm = pcbnew.ToMM(best_dist)
+                            msg = f"⚠ BULK CAP FAR\n({dist_mm:.1f}mm)\nTHT OK >22µF"
+                            self.draw_marker(
+                                self.board,
+                                pad_pos,
+                                msg,
+                                self.marker_layer,
+                                warning_group
+                            )
+                        else:
+                            # Create error violation
+                            self.violation_count += 1
+                            violation_group = self.create_group(self.board, "Decap", f"{ref}_{power_net}", None)
                             
-                            # Draw arrow showing where the nearest capacitor is
-                            if draw_arrow and nearest_cap_pos:
-                                label = f"→ {nearest_cap_ref}" if show_label else ""
-                                group_to_use = warning_group if is_warning else violation_group
-                                self.draw_arrow(
-                                    self.board,
-                                    pad.GetPosition(),
-                                    nearest_cap_pos,
-                                    label,
-                                    self.marker_layer,
-                                    group_to_use
-                                )
+                            dist_mm = pcbnew.ToMM(best_dist)
+                            msg = violation_msg_template.format(distance=dist_mm)
+                            self.draw_marker(
+                                self.board,
+                                pad_pos,
+                                msg,
+                                self.marker_layer,
+                                violation_group
+                            )
+                            self.log(f"        ✓ Violation marker created at ({pcbnew.ToMM(pad_pos.x):.2f}, {pcbnew.ToMM(pad_pos.y):.2f}) mm", force=True)
+                        
+                        # Draw arrow showing where the nearest capacitor is
+                        if draw_arrow and nearest_cap_pos:
+                            label = f"→ {nearest_cap_ref}" if show_label else ""
+                            group_to_use = warning_group if is_warning else violation_group
+                            self.draw_arrow(
+                                self.board,
+                                pad_pos,
+                                nearest_cap_pos,
+                                label,
+                                self.marker_layer,
+                                group_to_use
+                            )
         
         self.log(f"\n=== DECOUPLING CHECK COMPLETE: {self.violation_count} violation(s), {self.warning_count} warning(s) ===", force=True)
         return self.violation_count
@@ -282,22 +301,26 @@ class DecouplingChecker:
             int: Number of vias found near capacitor
         """
         search_radius = pcbnew.FromMM(search_radius_mm)
+        search_radius_sq = search_radius * search_radius
         via_count = 0
         
-        # Get capacitor pad positions
+        # Get capacitor pad positions (compared squared, no sqrt per via/pad pair)
         cap_positions = [pad.GetPosition() for pad in cap_footprint.Pads()]
         
+        # Via positions are read from the board once per check, not once per capacitor
+        if self._via_positions is None:
+            self._via_positions = []
+            for track in self.board.GetTracks():
+                if isinstance(track, pcbnew.PCB_VIA):
+                    self._via_positions.append(track.GetPosition())
+        
         # Search for vias near any capacitor pad
-        for track in self.board.GetTracks():
-            if isinstance(track, pcbnew.PCB_VIA):
-                via_pos = track.GetPosition()
-                
-                # Check if via is within search radius of any cap pad
-                for cap_pos in cap_positions:
-                    distance = self.get_distance(via_pos, cap_pos)
-                    if distance <= search_radius:
-                        via_count += 1
-                        break  # Count each via only once
+        for via_pos in self._via_positions:
+            # Check if via is within search radius of any cap pad
+            for cap_pos in cap_positions:
+                if self.get_distance_sq(via_pos, cap_pos) <= search_radius_sq:
+                    via_count += 1
+                    break  # Count each via only once
         
         return via_count
     
@@ -311,8 +334,6 @@ class DecouplingChecker:
         Returns:
             float: Capacitor value in microfarads, or None if not parseable
         """
-        import re
-        
         # Try to get value from Value field
         try:
             value_field = footprint.GetValue()
@@ -1,71 +1,225 @@
 import pcbnew
+import functools
+import importlib
+import io
 import math
 import os
+import shutil
 import sys
 import wx
-from datetime import datetime
+from contextlib import contextmanager
+from types import MappingProxyType, SimpleNamespace
 
-# TOML configuration support (Python 3.11+ has tomllib built-in)
+from spatial_index import PointGridIndex
+
+# TOML configuration support, fastest parser first: rtoml (compiled extension),
+# tomllib (Python 3.11+), tomli (same API for older Python), then toml (pure
+# Python, slowest). _toml_load(f) takes a file opened in binary mode whichever
+# backend is bound; _TOML_BACKEND names it for the load message.
 try:
-    import tomllib  # Python 3.11+
+    import rtoml
+
+    def _toml_load(f):
+        return rtoml.loads(f.read().decode('utf-8'))
+    _TOML_BACKEND = "rtoml"
 except ImportError:
     try:
-        import tomli as tomllib  # Fallback for older Python
+        import tomllib  # Python 3.11+
+        _toml_load = tomllib.load
+        _TOML_BACKEND = "tomllib"
     except ImportError:
         try:
-            import toml as tomllib  # Alternative fallback
+            import tomli  # Fallback for older Python
+            _toml_load = tomli.load
+            _TOML_BACKEND = "tomli"
         except ImportError:
-            print("ERROR: No TOML library found. Install tomli or toml: pip install tomli")
-            tomllib = None
+            try:
+                import toml  # Alternative fallback (text API)
 
-# Import clearance/creepage checking module
-try:
-    from clearance_creepage import ClearanceCreepageChecker
-except ImportError as e:
-    print(f"WARNING: Could not import clearance_creepage module: {e}")
-    ClearanceCreepageChecker = None
+                def _toml_load(f):
+                    return toml.loads(f.read().decode('utf-8'))
+                _TOML_BACKEND = "toml"
+            except ImportError:
+                print("ERROR: No TOML library found. Install tomli or toml: pip install tomli")
+                _toml_load = None
+                _TOML_BACKEND = None
 
-# Import via stitching checking module
-try:
-    from via_stitching import ViaStitchingChecker
-except ImportError as e:
-    print(f"WARNING: Could not import via_stitching module: {e}")
-    ViaStitchingChecker = None
+# Report/console separator lines, built once at import
+_BANNER = "=" * 70
+_SECTION_HEADER = f"\n{_BANNER}\n{{title}}\n{_BANNER}"
 
-# Import decoupling capacitor checking module
-try:
-    from decoupling import DecouplingChecker
-except ImportError as e:
-    print(f"WARNING: Could not import decoupling module: {e}")
-    DecouplingChecker = None
+def _freeze_config(value):
+    """Return value with every nested dict wrapped in a read-only MappingProxyType
+    and every list (patterns, prefixes, tables) converted to a tuple
+    
+    The parsed config is cached for the session and shared by every Run(), so
+    it is handed out read-only like the fallback config below.
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze_config(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze_config(v) for v in value)
+    return value
 
-# Import EMI filtering checking module
-try:
-    from emi_filtering import EMIFilteringChecker
-except ImportError as e:
-    print(f"WARNING: Could not import emi_filtering module: {e}")
-    EMIFilteringChecker = None
 
-# Import ground plane checking module
-try:
-    from ground_plane import GroundPlaneChecker
-except ImportError as e:
-    print(f"WARNING: Could not import ground_plane module: {e}")
-    GroundPlaneChecker = None
+# Fallback configuration if the TOML file cannot be loaded (see get_default_config).
+# Built once and shared read-only: the plugin and checkers only read their config.
+_DEFAULT_CONFIG = MappingProxyType({
+    'general': MappingProxyType({
+        'marker_layer': 'Cmts.User',
+        'marker_circle_radius_mm': 0.8,
+        'marker_line_width_mm': 0.1,
+        'marker_text_offset_mm': 1.2,
+        'marker_text_size_mm': 0.5
+    }),
+    'via_stitching': MappingProxyType({
+        'enabled': True,
+        'max_distance_mm': 2.0,
+        'critical_net_classes': ('HighSpeed', 'Clock'),
+        'ground_net_patterns': ('GND', 'GROUND', 'VSS'),
+        'violation_message': 'NO GND VIA'
+    }),
+    'decoupling': MappingProxyType({
+        'enabled': True,
+        'max_distance_mm': 3.0,
+        'ic_reference_prefixes': ('U',),
+        'capacitor_reference_prefixes': ('C',),
+        'power_net_patterns': ('VCC', 'VDD', 'PWR', '3V3', '5V'),
+        'violation_message': 'CAP TOO FAR ({distance:.1f}mm)'
+    }),
+})
 
-# Import signal integrity checking module
-try:
-    from signal_integrity import SignalIntegrityChecker
-except ImportError as e:
-    print(f"WARNING: Could not import signal_integrity module: {e}")
-    SignalIntegrityChecker = None
+# Checker modules are imported on first use (see _load_checker) rather than at
+# module import, so registering the plugin at KiCad startup does not parse
+# every checker module. Failed imports are cached as None.
+_checker_classes = {}
+
+
+def _load_checker(module_name, class_name):
+    """Import and return a checker class, or None if its module is unavailable"""
+    if module_name not in _checker_classes:
+        try:
+            module = importlib.import_module(module_name)
+            _checker_classes[module_name] = getattr(module, class_name)
+        except ImportError as e:
+            print(f"WARNING: Could not import {module_name} module: {e}")
+            _checker_classes[module_name] = None
+    return _checker_classes[module_name]
+
+
+class ReportBuffer:
+    """
+    Append-only report text shared by the plugin and all checker modules.
+    
+    Writers use it like the list of lines it replaces (append(line)), but the
+    lines are streamed into an io.StringIO, so the finished report is read with
+    getvalue() instead of being joined from a list into a second full copy.
+    """
+    
+    def __init__(self):
+        self._buf = io.StringIO()
+        self._write = self._buf.write
+        self._line_count = 0
+    
+    def append(self, line):
+        """Add one report line"""
+        write = self._write
+        write(line)
+        write("\n")
+        self._line_count += 1
+    
+    def __len__(self):
+        return self._line_count
+    
+    def getvalue(self):
+        """Return the report text (one line per append, newline-terminated)"""
+        return self._buf.getvalue()
+
+
+@functools.lru_cache(maxsize=1)
+def _find_text_editor():
+    """Return the path of the first common text editor found on PATH, or None
+    
+    Fallback for OnOpenConfig when xdg-open/open fails. Probed with
+    shutil.which() once per session instead of trying to launch each editor.
+    """
+    for editor in ('gedit', 'kate', 'nano', 'vim', 'vi'):
+        path = shutil.which(editor)
+        if path:
+            return path
+    return None
+
+
+def _open_with_startfile(path):
+    # Windows: os.startfile respects file associations
+    # If .toml is associated, uses TOML editor; otherwise uses .txt editor
+    os.startfile(path)
+
+
+def _open_with_open(path):
+    # macOS: use 'open' command
+    # close_fds=False lets CPython use posix_spawn() instead of forking the whole
+    # KiCad process (same for the other POSIX launchers below)
+    import subprocess
+    subprocess.run(['open', path], close_fds=False)
+
+
+def _open_with_xdg_open(path):
+    # Linux: use xdg-open
+    import subprocess
+    subprocess.run(['xdg-open', path], close_fds=False)
+
+
+def _open_with_notepad(path):
+    import subprocess
+    subprocess.Popen(['notepad.exe', path])
+
+
+def _open_with_text_editor(path):
+    # On Linux/macOS, use the first common text editor on PATH
+    editor = _find_text_editor()
+    if editor is None:
+        # Reported by _open_config_file like any other launch failure
+        raise FileNotFoundError("No text editor found on PATH (tried gedit, kate, nano, vim, vi)")
+    import subprocess
+    subprocess.Popen([editor, path], close_fds=False)
+
+
+# Platform dispatch resolved once at import: default application, then fallback
+_open_default = {'win32': _open_with_startfile, 'darwin': _open_with_open}.get(sys.platform, _open_with_xdg_open)
+_open_fallback = _open_with_notepad if sys.platform == 'win32' else _open_with_text_editor
+
+
+def _open_config_file(config_path, parent=None):
+    """Open the TOML configuration file for both dialogs' "Open Config File" button
+    
+    Tries the system default application first and falls back to notepad
+    (Windows) or a common text editor (Linux/macOS). Errors are reported in a
+    message box owned by parent (the calling dialog).
+    """
+    if not config_path or not os.path.exists(config_path):
+        wx.MessageBox("Configuration file not found.", 
+                     "File Not Found", wx.OK | wx.ICON_ERROR, parent)
+        return
+    
+    try:
+        _open_default(config_path)
+    except Exception as e:
+        try:
+            _open_fallback(config_path)
+        except Exception as fallback_error:
+            wx.MessageBox(f"Could not open config file:\n{str(e)}\n\nFallback error: {str(fallback_error)}\n\nFile location:\n{config_path}", 
+                         "Open Error", wx.OK | wx.ICON_ERROR, parent)
 
 class EMCSimpleDialog(wx.Dialog):
     """Simple dialog for quick audit summary with config file access"""
-    def __init__(self, parent, message, violations_count, config_path=None):
+    def __init__(self, parent, message, violations_count, config_path=None, config_exists=None):
         wx.Dialog.__init__(self, parent, -1, "EMC Auditor", size=(420, 180))
         
         self.config_path = config_path
+        # config_exists: result of the caller's existence check (None = check here)
+        if config_exists is None:
+            config_exists = bool(config_path) and os.path.exists(config_path)
         
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -90,7 +244,7 @@ class EMCSimpleDialog(wx.Dialog):
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
         
         # Open Config button
-        if self.config_path and os.path.exists(self.config_path):
+        if config_exists:
             config_btn = wx.Button(self, -1, "Open Config File")
             config_btn.Bind(wx.EVT_BUTTON, self.OnOpenConfig)
             button_sizer.Add(config_btn, 0, wx.ALL, 5)
@@ -106,54 +260,24 @@ class EMCSimpleDialog(wx.Dialog):
         self.Centre()
     
     def OnOpenConfig(self, event):
-        """Open TOML configuration file in text editor (reused from EMCReportDialog)"""
-        if not self.config_path or not os.path.exists(self.config_path):
-            wx.MessageBox("Configuration file not found.", 
-                         "File Not Found", wx.OK | wx.ICON_ERROR)
-            return
-        
-        try:
-            # Try to open with system default application (Windows, Linux, macOS)
-            if sys.platform == 'win32':
-                # Windows: os.startfile respects file associations
-                # If .toml is associated, uses TOML editor; otherwise uses .txt editor
-                os.startfile(self.config_path)
-            elif sys.platform == 'darwin':
-                # macOS: use 'open' command
-                import subprocess
-                subprocess.run(['open', self.config_path])
-            else:
-                # Linux: use xdg-open
-                import subprocess
-                subprocess.run(['xdg-open', self.config_path])
-        except Exception as e:
-            # Fallback: try to open with notepad on Windows or generic text editor
-            try:
-                if sys.platform == 'win32':
-                    # Fallback to notepad.exe
-                    import subprocess
-                    subprocess.Popen(['notepad.exe', self.config_path])
-                else:
-                    # On Linux/macOS, try common text editors
-                    import subprocess
-                    for editor in ['gedit', 'kate', 'nano', 'vim', 'vi']:
-                        try:
-                            subprocess.Popen([editor, self.config_path])
-                            break
-                        except FileNotFoundError:
-                            continue
-            except Exception as fallback_error:
-                wx.MessageBox(f"Could not open config file:\n{str(e)}\n\nFallback error: {str(fallback_error)}\n\nFile location:\n{self.config_path}", 
-                             "Open Error", wx.OK | wx.ICON_ERROR)
+        """Open TOML configuration file in text editor"""
+        _open_config_file(self.config_path, self)
 
 class EMCReportDialog(wx.Dialog):
-    """Dialog to display EMC audit report with copy and save functionality"""
-    def __init__(self, parent, report_text, violations_count, config_path=None):
+    """Dialog to display EMC audit report with copy and save functionality
+    
+    report is the run's ReportBuffer. The dialog keeps the buffer rather than a
+    joined copy of the text; the text is read from it when the view is filled
+    and again only if the report is saved.
+    """
+    def __init__(self, parent, report, violations_count, config_path=None, config_exists=None):
         wx.Dialog.__init__(self, parent, -1, "EMC Audit Report", size=(800, 600))
         
-        self.report_text = report_text
-        self.violations_count = violations_count
+        self.report = report
         self.config_path = config_path
+        # config_exists: result of the caller's existence check (None = check here)
+        if config_exists is None:
+            config_exists = bool(config_path) and os.path.exists(config_path)
         
         # Create main sizer
         main_sizer = wx.BoxSizer(wx.VERTICAL)
@@ -167,7 +291,7 @@ class EMCReportDialog(wx.Dialog):
         main_sizer.Add(header, 0, wx.ALL | wx.ALIGN_CENTER, 10)
         
         # Text control for report (multiline, read-only)
-        self.text_ctrl = wx.TextCtrl(self, -1, report_text, 
+        self.text_ctrl = wx.TextCtrl(self, -1, report.getvalue(), 
                                       style=wx.TE_MULTILINE | wx.TE_READONLY | wx.TE_RICH2)
         # Use monospaced font for better readability
         font = wx.Font(9, wx.FONTFAMILY_TELETYPE, wx.FONTSTYLE_NORMAL, wx.FONTWEIGHT_NORMAL)
@@ -186,7 +310,7 @@ class EMCReportDialog(wx.Dialog):
         button_sizer = wx.BoxSizer(wx.HORIZONTAL)
         
         # Open Config button
-        if self.config_path and os.path.exists(self.config_path):
+        if config_exists:
             config_btn = wx.Button(self, -1, "Open Config File")
             config_btn.Bind(wx.EVT_BUTTON, self.OnOpenConfig)
             button_sizer.Add(config_btn, 0, wx.ALL, 5)
@@ -215,6 +339,7 @@ class EMCReportDialog(wx.Dialog):
     def OnSaveReport(self, event):
         """Save report to timestamped text file"""
         # Generate default filename with timestamp
+        from datetime import datetime
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         default_filename = f"EMC_Audit_Report_{timestamp}.txt"
         
@@ -229,7 +354,7 @@ class EMCReportDialog(wx.Dialog):
             filepath = dlg.GetPath()
             try:
                 with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(self.report_text)
+                    f.write(self.report.getvalue())
                 wx.MessageBox(f"Report saved successfully to:\n{filepath}", 
                              "Save Successful", wx.OK | wx.ICON_INFORMATION)
             except Exception as e:
@@ -240,46 +365,13 @@ class EMCReportDialog(wx.Dialog):
     
     def OnOpenConfig(self, event):
         """Open TOML configuration file in text editor"""
-        if not self.config_path or not os.path.exists(self.config_path):
-            wx.MessageBox("Configuration file not found.", 
-                         "File Not Found", wx.OK | wx.ICON_ERROR)
-            return
-        
-        try:
-            # Try to open with system default application (Windows, Linux, macOS)
-            if sys.platform == 'win32':
-                # Windows: os.startfile respects file associations
-                # If .toml is associated, uses TOML editor; otherwise uses .txt editor
-                os.startfile(self.config_path)
-            elif sys.platform == 'darwin':
-                # macOS: use 'open' command
-                import subprocess
-                subprocess.run(['open', self.config_path])
-            else:
-                # Linux: use xdg-open
-                import subprocess
-                subprocess.run(['xdg-open', self.config_path])
-        except Exception as e:
-            # Fallback: try to open with notepad on Windows or generic text editor
-            try:
-                if sys.platform == 'win32':
-                    # Fallback to notepad.exe
-                    import subprocess
-                    subprocess.Popen(['notepad.exe', self.config_path])
-                else:
-                    # On Linux/macOS, try common text editors
-                    import subprocess
-                    for editor in ['gedit', 'kate', 'nano', 'vim', 'vi']:
-                        try:
-                            subprocess.Popen([editor, self.config_path])
-                            break
-                        except FileNotFoundError:
-                            continue
-            except Exception as fallback_error:
-                wx.MessageBox(f"Could not open config file:\n{str(e)}\n\nFallback error: {str(fallback_error)}\n\nFile location:\n{self.config_path}", 
-                             "Open Error", wx.OK | wx.ICON_ERROR)
+        _open_config_file(self.config_path, self)
 
 class EMCAuditorPlugin(pcbnew.ActionPlugin):
+    # Parsed configs shared by all plugin instances in this KiCad session:
+    # {config_path: ((mtime_ns, size), config_dict)}
+    _config_cache = {}
+    
     def defaults(self):
         self.name = "EMC Auditor"
         self.category = "Verification"
@@ -294,177 +386,239 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         
         # Load configuration
         self.config = self.load_config()
+        # [general] section is read by every utility method, bind it once
+        self._general = self.config.get('general', {})
+        self.resolve_config()
+        
+        # Logger cache (see get_logger)
+        self._logger = None
+        self._logger_verbose = None
+        self._logger_lines = None
+        
+        # Net class lookup cache (see get_nets_by_class), dropped at every Run()
+        self._net_classes = None
+        
+        # Utility functions injected into every checker (bound methods never change)
+        self._check_injection = {
+            'draw_marker_func': self.draw_error_marker,
+            'draw_arrow_func': self.draw_arrow,
+            'get_distance_func': self.get_distance,
+            'create_group_func': self.create_violation_group,
+            'get_distance_sq_func': self.get_distance_sq,
+        }
+        
+        # Violation groups waiting to be added to the board (see flush_violation_groups)
+        self._pending_groups = []
+        
+        # Marker geometry is fixed for the lifetime of the loaded config
+        self.cache_marker_dimensions()
     
     def load_config(self):
-        """Load EMC rules from TOML configuration file"""
-        if tomllib is None:
-            print("WARNING: TOML library not available. Using default values.")
-            return self.get_default_config()
+        """Load EMC rules from TOML configuration file
         
+        The parsed config is cached in memory for the session, keyed by the TOML
+        file's (mtime, size), so editing the file invalidates it.
+        """
+        # Resolved once here; Run() hands both values to the result dialogs
         plugin_dir = os.path.dirname(os.path.abspath(__file__))
-        config_path = os.path.join(plugin_dir, "emc_rules.toml")
+        config_path = self.config_path = os.path.join(plugin_dir, "emc_rules.toml")
         
-        if not os.path.exists(config_path):
+        try:
+            stat = os.stat(config_path)
+        except OSError:
+            self.config_exists = False
             print(f"WARNING: Config file not found: {config_path}")
             print("Using default EMC rules.")
             return self.get_default_config()
+        self.config_exists = True
+        key = (stat.st_mtime_ns, stat.st_size)
+        
+        if _toml_load is None:
+            print("WARNING: TOML library not available. Using default values.")
+            return self.get_default_config()
+        
+        # Same session: reuse the already parsed config
+        cached = EMCAuditorPlugin._config_cache.get(config_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
         
         try:
             with open(config_path, 'rb') as f:
-                config = tomllib.load(f)
+                config = _toml_load(f)
+            print(f"EMC config parsed with {_TOML_BACKEND}")
             print(f"EMC config loaded: {config['general']['plugin_name']} v{config['general']['version']}")
-            return config
         except Exception as e:
             print(f"ERROR loading config: {e}")
             return self.get_default_config()
+        
+        config = _freeze_config(config)
+        EMCAuditorPlugin._config_cache[config_path] = (key, config)
+        return config
+    
+    def resolve_config(self):
+        """
+        Resolve the config values Run() needs into a read-only namespace once.
+        
+        self.resolved.verbose / .marker_layer hold the [general] values, and one
+        entry per checker section holds its config dict (read-only view) and the
+        resolved 'enabled' flag with the same defaults Run() always used.
+        """
+        def section(name, default_enabled):
+            cfg = self.config.get(name, {})
+            return SimpleNamespace(config=MappingProxyType(cfg),
+                                   enabled=cfg.get('enabled', default_enabled))
+        
+        self.resolved = SimpleNamespace(
+            verbose=self._general.get('verbose_logging', True),
+            marker_layer=self._general.get('marker_layer', 'Cmts.User'),
+            via_stitching=section('via_stitching', True),
+            decoupling=section('decoupling', True),
+            ground_plane=section('ground_plane', False),
+            emi_filtering=section('emi_filtering', False),
+            clearance_creepage=section('clearance_creepage', False),
+            signal_integrity=section('signal_integrity', False),
+        )
+    
+    def cache_marker_dimensions(self):
+        """
+        Convert marker dimensions from config (mm) to KiCad internal units once.
+        
+        draw_error_marker() and draw_arrow() run once per violation, so the
+        FromMM conversions and the text-size VECTOR2I are computed here instead
+        of on every call. KiCad copies the VECTOR2I in SetTextSize(), so the
+        same object is safely shared by all text labels.
+        """
+        general = self._general
+        self._marker_radius = pcbnew.FromMM(general.get('marker_circle_radius_mm', 0.8))
+        self._marker_line_width = pcbnew.FromMM(general.get('marker_line_width_mm', 0.1))
+        self._marker_text_offset = pcbnew.FromMM(general.get('marker_text_offset_mm', 1.2))
+        text_size = pcbnew.FromMM(general.get('marker_text_size_mm', 0.5))
+        self._text_size_vec = pcbnew.VECTOR2I(text_size, text_size)
+        self._arrow_length = pcbnew.FromMM(0.5)  # 0.5mm arrowhead
+        
+        # Optional marker region [x1, y1, x2, y2] in mm: markers outside are not drawn
+        # (violations are still counted and logged). None = whole board (fast path).
+        region = general.get('marker_region_mm')
+        if region and len(region) == 4:
+            x1, y1, x2, y2 = (pcbnew.FromMM(v) for v in region)
+            self._cull_bbox = (min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2))
+        else:
+            self._cull_bbox = None
+        
+        # Arrow labels (e.g. "GND GAP") can be disabled globally to save one PCB_TEXT per arrow
+        self._draw_labels = general.get('draw_arrow_labels', True)
+        
+        # Merge identical markers drawn within one marker radius of each other (opt-in:
+        # a merged violation's arrow joins the surviving marker's group)
+        self._merge_markers = general.get('merge_colocated_markers', False)
+        self.reset_marker_state()
+    
+    def reset_marker_state(self):
+        """Forget markers drawn by a previous Run() (co-location index, cull counter)"""
+        self._marker_queue = []  # [layer, x, y, message, count, group] per marker, drawn by flush_markers()
+        self._marker_index = {}  # (layer, message) -> PointGridIndex of queued markers
+        self._arrow_queue = []  # (start_x, start_y, end_x, end_y, label, layer, group), drawn by flush_arrows()
+        self._marker_groups = set()  # id() of groups owning a queued marker
+        self._merged_groups = {}  # id() of a group whose marker was merged -> surviving group
+        self._group_items = {}  # id() of a group -> markers, arrows and checker items put into it
+        self._culled_markers = 0
+    
+    def _is_culled(self, pos):
+        """True if pos lies outside the configured marker region"""
+        x1, y1, x2, y2 = self._cull_bbox
+        return not (x1 <= pos.x <= x2 and y1 <= pos.y <= y2)
     
     def get_default_config(self):
-        """Fallback configuration if TOML file cannot be loaded"""
-        return {
-            'general': {
-                'marker_layer': 'Cmts.User',
-                'marker_circle_radius_mm': 0.8,
-                'marker_line_width_mm': 0.1,
-                'marker_text_offset_mm': 1.2,
-                'marker_text_size_mm': 0.5
-            },
-            'via_stitching': {
-                'enabled': True,
-                'max_distance_mm': 2.0,
-                'critical_net_classes': ['HighSpeed', 'Clock'],
-                'ground_net_patterns': ['GND', 'GROUND', 'VSS'],
-                'violation_message': 'NO GND VIA'
-            },
-            'decoupling': {
-                'enabled': True,
-                'max_distance_mm': 3.0,
-                'ic_reference_prefixes': ['U'],
-                'capacitor_reference_prefixes': ['C'],
-                'power_net_patterns': ['VCC', 'VDD', 'PWR', '3V3', '5V'],
-                'violation_message': 'CAP TOO FAR ({distance:.1f}mm)'
-            }
-        }
+        """Fallback configuration if TOML file cannot be loaded (shared, read-only)"""
+        return _DEFAULT_CONFIG
 
     def Run(self):
         board = pcbnew.GetBoard()
         # Clear previous markers to avoid duplication
         self.clear_previous_markers(board)
         
-        # Initialize report collection
-        self.report_lines = []
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
+        # Initialize report collection (streamed; see ReportBuffer)
+        self.report_lines = ReportBuffer()
+        self.reset_marker_state()
+        self._net_classes = None  # Nets or classes may have been edited since the last run
+        verbose = self.resolved.verbose
         
         # Add report header with timestamp
+        from datetime import datetime
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.report_lines.append("="*70)
+        self.report_lines.append(_BANNER)
         self.report_lines.append("EMC AUDITOR REPORT")
         self.report_lines.append(f"Generated: {timestamp}")
         self.report_lines.append(f"Board: {board.GetFileName()}")
-        self.report_lines.append("="*70)
+        self.report_lines.append(_BANNER)
         self.report_lines.append("")
         
         # Load configuration values
-        general = self.config.get('general', {})
-        marker_layer = board.GetLayerID(general.get('marker_layer', 'Cmts.User'))
+        marker_layer = board.GetLayerID(self.resolved.marker_layer)
         
         violations_found = 0
         
-        # 1. Via Stitching Verification (if enabled)
-        via_cfg = self.config.get('via_stitching', {})
-        if via_cfg.get('enabled', True):
-            print("\n" + "="*70)
-            print("STARTING VIA STITCHING CHECK")
-            print("="*70)
-            via_violations = self.check_via_stitching(board, marker_layer, via_cfg)
-            violations_found += via_violations
-            print(f"\nVia stitching check complete: {via_violations} violation(s) found")
-        
-        # 2. Decoupling Capacitor Verification (if enabled)
-        decap_cfg = self.config.get('decoupling', {})
-        if decap_cfg.get('enabled', True):
-            print("\n" + "="*70)
-            print("STARTING DECOUPLING CAPACITOR CHECK")
-            print("="*70)
-            decap_violations = self.check_decoupling(board, marker_layer, decap_cfg)
-            violations_found += decap_violations
-            print(f"\nDecoupling check complete: {decap_violations} violation(s) found")
-        
-        # 3. Ground Plane Continuity Verification (if enabled)
-        ground_cfg = self.config.get('ground_plane', {})
-        if ground_cfg.get('enabled', False):
-            print("\n" + "="*70)
-            print("STARTING GROUND PLANE CHECK")
-            print("="*70)
-            ground_violations = self.check_ground_plane(board, marker_layer, ground_cfg)
-            violations_found += ground_violations
-            print(f"\nGround plane check complete: {ground_violations} violation(s) found")
-        
-        # 4. EMI Filtering Verification (if enabled)
-        emi_cfg = self.config.get('emi_filtering', {})
-        if emi_cfg.get('enabled', False):
-            print("\n" + "="*70)
-            print("STARTING EMI FILTERING CHECK")
-            print("="*70)
-            emi_violations = self.check_emi_filtering(board, marker_layer, emi_cfg)
-            violations_found += emi_violations
-            print(f"\nEMI filtering check complete: {emi_violations} violation(s) found")
-        
-        # 5. Clearance & Creepage Verification (if enabled)
-        # NOTE: Phase 1 implementation - pad-to-pad clearance only
-        clearance_cfg = self.config.get('clearance_creepage', {})
-        if clearance_cfg.get('enabled', False):
-            print("\n" + "="*70)
-            print("STARTING CLEARANCE & CREEPAGE CHECK (Phase 1)")
-            print("="*70)
-            clearance_violations = self.check_clearance_creepage(board, marker_layer, clearance_cfg)
-            violations_found += clearance_violations
-            print(f"\nClearance check complete: {clearance_violations} violation(s) found")
-        
-        # 6. Signal Integrity Verification (if enabled)
-        signal_integrity_cfg = self.config.get('signal_integrity', {})
-        if signal_integrity_cfg.get('enabled', False):
-            print("\n" + "="*70)
-            print("STARTING SIGNAL INTEGRITY CHECK")
-            print("="*70)
-            si_violations = self.check_signal_integrity(board, marker_layer, signal_integrity_cfg)
-            violations_found += si_violations
-            print(f"\nSignal integrity check complete: {si_violations} violation(s) found")
-        
-        # Future rules can be added here:
-        # if self.config.get('trace_width', {}).get('enabled', False):
-        #     violations_found += self.check_trace_width(board, marker_layer)
+        # Enabled checks in report order: (title, summary name, check method, config).
+        # They run one after another on this thread: the pcbnew SWIG API is not
+        # thread-safe and all checkers append to the shared report_lines.
+        resolved = self.resolved
+        tasks = [
+            (title, name, check, section.config)
+            for section, title, name, check in (
+                (resolved.via_stitching, "VIA STITCHING CHECK", "Via stitching", self.check_via_stitching),
+                (resolved.decoupling, "DECOUPLING CAPACITOR CHECK", "Decoupling", self.check_decoupling),
+                (resolved.ground_plane, "GROUND PLANE CHECK", "Ground plane", self.check_ground_plane),
+                (resolved.emi_filtering, "EMI FILTERING CHECK", "EMI filtering", self.check_emi_filtering),
+                # NOTE: Phase 1 implementation - pad-to-pad clearance only
+                (resolved.clearance_creepage, "CLEARANCE & CREEPAGE CHECK (Phase 1)", "Clearance",
+                 self.check_clearance_creepage),
+                (resolved.signal_integrity, "SIGNAL INTEGRITY CHECK", "Signal integrity",
+                 self.check_signal_integrity),
+                # Future rules can be added here:
+                # (resolved.trace_width, "TRACE WIDTH CHECK", "Trace width", self.check_trace_width),
+            )
+            if section.enabled
+        ]
+        
+        # All markers are inserted inside this block; the queued violation groups
+        # are added to the board once on exit (also if a checker raises)
+        with self.batched_marker_insertion(board):
+            for title, name, check, config in tasks:
+                print(_SECTION_HEADER.format(title=f"STARTING {title}"))
+                check_violations = check(board, marker_layer, config)
+                violations_found += check_violations
+                print(f"\n{name} check complete: {check_violations} violation(s) found")
         
         pcbnew.Refresh()
         
         # Add report footer
         self.report_lines.append("")
-        self.report_lines.append("="*70)
+        self.report_lines.append(_BANNER)
         self.report_lines.append(f"TOTAL VIOLATIONS FOUND: {violations_found}")
-        self.report_lines.append("="*70)
+        self.report_lines.append(_BANNER)
+        if self._culled_markers:
+            self.report_lines.append(f"{self._culled_markers} marker(s) outside marker_region_mm were not drawn.")
         self.report_lines.append("")
         self.report_lines.append("Check the User.Comments layer in KiCad for visual markers.")
         self.report_lines.append("Each violation is grouped for easy selection and deletion.")
         
         # Print to console
-        print(f"\n{'='*70}")
-        print(f"EMC AUDIT COMPLETE: {violations_found} violation(s)")
-        print(f"{'='*70}")
+        print(_SECTION_HEADER.format(title=f"EMC AUDIT COMPLETE: {violations_found} violation(s)"))
         
-        # Get config file path to pass to dialogs
-        plugin_dir = os.path.dirname(os.path.abspath(__file__))
-        config_path = os.path.join(plugin_dir, "emc_rules.toml")
+        # Config file path and existence were resolved by load_config()
+        config_path = self.config_path
+        config_exists = self.config_exists
         
         # Show appropriate dialog based on verbose_logging setting
         if verbose:
             # Show detailed report dialog with save capability and config file access
-            report_text = "\n".join(self.report_lines)
-            dlg = EMCReportDialog(None, report_text, violations_found, config_path)
+            dlg = EMCReportDialog(None, self.report_lines, violations_found, config_path, config_exists)
             dlg.ShowModal()
             dlg.Destroy()
         else:
             # Show simple dialog with config file access (when verbose_logging is disabled)
             msg = f"EMC Audit Complete!\n\nFound {violations_found} violation(s).\nCheck User.Comments layer for markers."
-            dlg = EMCSimpleDialog(None, msg, violations_found, config_path)
+            dlg = EMCSimpleDialog(None, msg, violations_found, config_path, config_exists)
             dlg.ShowModal()
             dlg.Destroy()
     
@@ -482,34 +636,8 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         Returns:
             int: Number of violations found
         """
-        # Check if module is available
-        if ViaStitchingChecker is None:
-            print("⚠️  Via stitching checker module not available")
-            print("HINT: Ensure via_stitching.py is in same directory as plugin")
-            return 0
-        
-        # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = ViaStitchingChecker(
-            board=board,
-            marker_layer=marker_layer,
-            config=config,
-            report_lines=self.report_lines,
-            verbose=verbose,
-            auditor=self  # Pass auditor instance for utility functions
-        )
-        
-        # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return self._run_checker("via_stitching", "ViaStitchingChecker", board, marker_layer, config,
+                                 "Via stitching")
     
     def check_decoupling(self, board, marker_layer, config):
         """Check decoupling capacitor proximity to IC power pins
@@ -525,34 +653,8 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         Returns:
             int: Number of violations found
         """
-        # Check if module is available
-        if DecouplingChecker is None:
-            print("⚠️  Decoupling checker module not available")
-            print("HINT: Ensure decoupling.py is in same directory as plugin")
-            return 0
-        
-        # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = DecouplingChecker(
-            board=board,
-            marker_layer=marker_layer,
-            config=config,
-            report_lines=self.report_lines,
-            verbose=verbose,
-            auditor=self  # Pass auditor instance for utility functions
-        )
-        
-        # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return self._run_checker("decoupling", "DecouplingChecker", board, marker_layer, config,
+                                 "Decoupling")
 
     def check_ground_plane(self, board, marker_layer, config):
         """Check ground plane continuity under and around high-speed traces
@@ -568,34 +670,8 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         Returns:
             int: Number of violations found
         """
-        # Check if module is available
-        if GroundPlaneChecker is None:
-            print("⚠️  Ground plane checker module not available")
-            print("HINT: Ensure ground_plane.py is in same directory as plugin")
-            return 0
-        
-        # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = GroundPlaneChecker(
-            board=board,
-            marker_layer=marker_layer,
-            config=config,
-            report_lines=self.report_lines,
-            verbose=verbose,
-            auditor=self  # Pass auditor instance for utility functions
-        )
-        
-        # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return self._run_checker("ground_plane", "GroundPlaneChecker", board, marker_layer, config,
+                                 "Ground plane")
     
     def check_signal_integrity(self, board, marker_layer, config):
         """Check signal integrity: controlled impedance, crosstalk, return path, etc.
@@ -608,18 +684,41 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         - draw_arrow(): Draw directional arrows between violation points
         - get_distance(): Calculate distance between two points
         
+        Returns:
+            int: Number of violations found
+        """
+        return self._run_checker("signal_integrity", "SignalIntegrityChecker", board, marker_layer, config,
+                                 "Signal integrity")
+
+    def _run_checker(self, module_name, class_name, board, marker_layer, config, display_name):
+        """
+        Shared delegation for all check_* methods.
+        
+        Imports the checker module on first use, instantiates the checker with the
+        shared report lines and runs it with the utility functions injected from
+        this plugin (see _check_injection).
+        
+        Args:
+            module_name: str - Checker module name (e.g. 'via_stitching')
+            class_name: str - Checker class in that module (e.g. 'ViaStitchingChecker')
+            board: pcbnew.BOARD object
+            marker_layer: Layer ID for violation markers
+            config: Checker's section from emc_rules.toml
+            display_name: str - Human-readable checker name for warnings
+        
         Returns:
             int: Number of violations found
         """
         # Check if module is available
-        if SignalIntegrityChecker is None:
-            print("⚠️  Signal integrity checker module not available")
-            print("HINT: Ensure signal_integrity.py is in same directory as plugin")
+        checker_cls = _load_checker(module_name, class_name)
+        if checker_cls is None:
+            print(f"⚠️  {display_name} checker module not available")
+            print(f"HINT: Ensure {module_name}.py is in same directory as plugin")
             return 0
         
         # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = SignalIntegrityChecker(
+        verbose = self.resolved.verbose
+        checker = checker_cls(
             board=board,
             marker_layer=marker_layer,
             config=config,
@@ -629,19 +728,16 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         )
         
         # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return checker.check(log_func=self.get_logger(verbose), **self._check_injection)
 
     def get_distance(self, p1, p2):
-        return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
+        return math.hypot(p1.x - p2.x, p1.y - p2.y)
+    
+    def get_distance_sq(self, p1, p2):
+        """Squared distance (pure int math) for comparisons against threshold**2"""
+        dx = p1.x - p2.x
+        dy = p1.y - p2.y
+        return dx * dx + dy * dy
     
     def get_nets_by_class(self, board, class_name):
         """
@@ -655,6 +751,10 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         This function handles all cases by using substring matching,
         matching the approach used in check_via_stitching().
         
+        The board's (net class, net name) pairs are read once per Run() and
+        each class's result is memoized, so several checkers asking for the
+        same classes do not walk NetsByName() again.
+        
         Args:
             board: pcbnew.BOARD object
             class_name: Net Class name to search for (e.g., 'HIGH_VOLTAGE_DC')
@@ -666,31 +766,36 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
             >>> nets = self.get_nets_by_class(board, 'HIGH_VOLTAGE_DC')
             >>> print(nets)  # ['Net-(U5-In)', 'Net-(U7-In)', 'Net-(U8-In)']
         """
-        matching_nets = []
-        all_nets = board.GetNetInfo().NetsByName().values()
-        
-        for net in all_nets:
-            net_class = net.GetNetClassName()
-            net_name = net.GetNetname()
-            
+        cache = self._net_classes
+        if cache is None or cache[0] is not board:
+            net_classes = []
+            for net in board.GetNetInfo().NetsByName().values():
+                net_name = net.GetNetname()
+                if net_name:
+                    net_classes.append((net.GetNetClassName(), net_name))
+            cache = self._net_classes = (board, net_classes, {})
+        _, net_classes, nets_by_class = cache
+        
+        matching_nets = nets_by_class.get(class_name)
+        if matching_nets is None:
             # Substring match (handles comma-separated classes)
             # Example: class_name='HIGH_VOLTAGE_DC' matches 'HIGH_VOLTAGE_DC,Default'
-            if class_name in net_class and net_name:
-                matching_nets.append(net_name)
+            matching_nets = nets_by_class[class_name] = [
+                net_name for net_class, net_name in net_classes if class_name in net_class]
         
-        return matching_nets
+        return list(matching_nets)  # Callers own their copy; the memo stays intact
 
     def create_logger(self, verbose, report_lines):
         """
         Create a logging function for modules to use (eliminates code duplication).
         
         This function returns a logger that conditionally prints to console and appends
-        to the shared report_lines list based on the verbose flag. By centralizing this
+        to the shared report buffer based on the verbose flag. By centralizing this
         logic, we avoid duplicating the same log() method in all 5 checker modules.
         
         Args:
             verbose: bool - Enable detailed logging to console and report
-            report_lines: list - Shared report lines array (modified in-place)
+            report_lines: ReportBuffer - Shared report buffer (anything with append(str))
         
         Returns:
             function: log(msg, force=False) callable
@@ -702,14 +807,41 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
             log_func("Starting check...", force=True)  # Always logged
             log_func("Debug: Processing item")  # Only if verbose=True
         """
-        def log(msg, force=False):
-            """Log message to console and report (only if verbose enabled or force=True)"""
-            if verbose or force:
+        # Pick the closure once instead of re-testing verbose on every call
+        if verbose:
+            append = report_lines.append
+            
+            def log(msg, force=False):
+                """Log message to console and report"""
                 print(msg)
-                if verbose:
-                    report_lines.append(msg)
+                append(msg)
+        else:
+            def log(msg, force=False):
+                """Log message to console only when forced (summary messages)"""
+                if force:
+                    print(msg)
         return log
 
+    def get_logger(self, verbose):
+        """
+        Return the logger for the current run, reusing it across checker delegations.
+        
+        The logger closure is cached on the instance and rebuilt only when the
+        verbose flag changes or report_lines has been reassigned (new Run()).
+        
+        Args:
+            verbose: bool - Enable detailed logging to console and report
+        
+        Returns:
+            function: log(msg, force=False) callable (see create_logger)
+        """
+        if (self._logger is None or self._logger_verbose != verbose
+                or self._logger_lines is not self.report_lines):
+            self._logger = self.create_logger(verbose, self.report_lines)
+            self._logger_verbose = verbose
+            self._logger_lines = self.report_lines
+        return self._logger
+
     def create_violation_group(self, board, check_type, identifier, violation_number=None):
         """
         Create a standardized violation group for visual organization in KiCad.
@@ -725,7 +857,8 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
             violation_number: int - Optional violation sequence number for uniqueness
         
         Returns:
-            pcbnew.PCB_GROUP: Created and added group object ready for use
+            pcbnew.PCB_GROUP: Created group object ready for use. The group itself
+                is added to the board later by flush_violation_groups().
         
         Example:
             group = self.create_violation_group(board, "Via", "CLK", 3)
@@ -736,6 +869,7 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
             - Consistent naming convention across all checks
             - Single place to modify group creation logic
             - Eliminates 3-line boilerplate repeated 40+ times
+            - Groups are queued and added to the board in one pass at the end of Run()
         """
         group = pcbnew.PCB_GROUP(board)
         
@@ -745,113 +879,259 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
             name = f"EMC_{check_type}_{identifier}"
         
         group.SetName(name)
-        board.Add(group)
+        self._pending_groups.append(group)
         return group
 
-    def draw_error_marker(self, board, pos, message, layer, marker_group):
-        """Draw visual marker (circle + text) at violation location"""
-        general = self.config.get('general', {})
+    @contextmanager
+    def batched_marker_insertion(self, board):
+        """
+        Context manager for bulk marker insertion during Run().
         
-        # Get marker dimensions from config
-        radius = pcbnew.FromMM(general.get('marker_circle_radius_mm', 0.8))
-        line_width = pcbnew.FromMM(general.get('marker_line_width_mm', 0.1))
-        text_offset = pcbnew.FromMM(general.get('marker_text_offset_mm', 1.2))
-        text_size = pcbnew.FromMM(general.get('marker_text_size_mm', 0.5))
+        KiCad's Python API offers no way to suspend board updates, and markers
+        live on a non-copper layer, so board.Add() of a shape never triggers a
+        connectivity rebuild. What is batched here is the object creation:
+        error markers, arrows and PCB_GROUPs are queued while checks run and
+        flushed exactly once on exit, before Run() calls pcbnew.Refresh().
+        """
+        try:
+            yield
+        finally:
+            self.flush_markers(board)
+            self.flush_arrows(board)
+            self.flush_violation_groups(board)
+
+    def flush_violation_groups(self, board):
+        """
+        Add all queued violation groups to the board in a single pass.
+        
+        Called after flush_markers() and flush_arrows(), so each board.Add() for a group happens
+        in one tight loop instead of interleaved with every violation.
+        Groups that hold no items (marker culled or merged) are dropped. Items
+        are counted as they are queued or added (see _group_items), so the check
+        does not depend on the bindings' GetItems() container; checkers add their
+        own items through add_to_violation_group() for them to count.
         
-        # Draw circle around violation
-        circle = pcbnew.PCB_SHAPE(board)
-        circle.SetShape(pcbnew.SHAPE_T_CIRCLE)
-        circle.SetFilled(False)
-        circle.SetStart(pos)
-        circle.SetEnd(pcbnew.VECTOR2I(pos.x + radius, pos.y))
-        circle.SetLayer(layer)
-        circle.SetWidth(line_width)
-        board.Add(circle)
-        marker_group.AddItem(circle)
-
-        # Add text label
-        txt = pcbnew.PCB_TEXT(board)
-        txt.SetText(message)
-        txt.SetPosition(pcbnew.VECTOR2I(pos.x, pos.y + text_offset))
-        txt.SetLayer(layer)
-        txt.SetTextSize(pcbnew.VECTOR2I(text_size, text_size))
-        board.Add(txt)
-        marker_group.AddItem(txt)
+        Returns:
+            int: Number of groups added
+        """
+        # Groups whose only marker was culled or merged into an existing one stay empty
+        group_items = self._group_items
+        pending = [g for g in self._pending_groups if group_items.get(id(g))]
+        board_add = board.Add
+        for group in pending:
+            board_add(group)
+        count = len(pending)
+        self._pending_groups = []
+        # The groups are released here, so their id()s may be reused
+        self._marker_groups = set()
+        self._merged_groups = {}
+        self._group_items = {}
+        return count
 
-    def draw_arrow(self, board, start_pos, end_pos, label, layer, marker_group):
-        """Draw arrow line from start to end position with optional label"""
-        general = self.config.get('general', {})
-        line_width = pcbnew.FromMM(general.get('marker_line_width_mm', 0.1))
-        text_size = pcbnew.FromMM(general.get('marker_text_size_mm', 0.5))
+    def add_to_violation_group(self, board, group, item):
+        """
+        Add an item drawn by a checker (debug path, segment highlight, ...) to
+        the board and to its violation group.
         
-        # Draw line from start to end
-        line = pcbnew.PCB_SHAPE(board)
-        line.SetShape(pcbnew.SHAPE_T_SEGMENT)
-        line.SetStart(start_pos)
-        line.SetEnd(end_pos)
-        line.SetLayer(layer)
-        line.SetWidth(line_width)
-        board.Add(line)
-        marker_group.AddItem(line)
-        
-        # Draw arrowhead at end point (simple triangle)
-        arrow_length = pcbnew.FromMM(0.5)  # 0.5mm arrowhead
-        
-        # Calculate arrow direction
-        dx = end_pos.x - start_pos.x
-        dy = end_pos.y - start_pos.y
-        length = math.sqrt(dx*dx + dy*dy)
-        
-        if length > 0:
-            # Normalize direction
-            dx_norm = dx / length
-            dy_norm = dy / length
-            
-            # Perpendicular vector for arrowhead wings
-            perp_x = -dy_norm
-            perp_y = dx_norm
+        Use this instead of group.AddItem() so the item counts toward the
+        group's contents and flush_violation_groups() keeps the group.
+        """
+        board.Add(item)
+        group.AddItem(item)
+        self._count_group_item(group)
+
+    def _count_group_item(self, group):
+        """Record one more item queued or added into group (see flush_violation_groups)"""
+        key = id(group)
+        self._group_items[key] = self._group_items.get(key, 0) + 1
+
+    def flush_markers(self, board):
+        """
+        Create the queued error markers (circle + text) in a single pass.
+        
+        Merged duplicates were only counted while queued, so every label is
+        created once with its final text.
+        
+        Returns:
+            int: Number of markers drawn
+        """
+        # PCB_GROUP has no bulk AddItems() in the Python bindings; bind the
+        # SWIG method and marker dimensions once for the whole loop
+        board_add = board.Add
+        radius = self._marker_radius
+        line_width = self._marker_line_width
+        text_offset = self._marker_text_offset
+        text_size = self._text_size_vec
+        
+        queue = self._marker_queue
+        for layer, x, y, message, count, marker_group in queue:
+            add_item = marker_group.AddItem
             
-            # Calculate arrowhead points
-            arrow_back_x = end_pos.x - dx_norm * arrow_length
-            arrow_back_y = end_pos.y - dy_norm * arrow_length
+            # Draw circle around violation
+            circle = pcbnew.PCB_SHAPE(board)
+            circle.SetShape(pcbnew.SHAPE_T_CIRCLE)
+            circle.SetFilled(False)
+            circle.SetStart(pcbnew.VECTOR2I(x, y))
+            circle.SetEnd(pcbnew.VECTOR2I(x + radius, y))
+            circle.SetLayer(layer)
+            circle.SetWidth(line_width)
+            board_add(circle)
+            add_item(circle)
             
-            wing_offset = arrow_length * 0.4
-            wing1_x = int(arrow_back_x + perp_x * wing_offset)
-            wing1_y = int(arrow_back_y + perp_y * wing_offset)
-            wing2_x = int(arrow_back_x - perp_x * wing_offset)
-            wing2_y = int(arrow_back_y - perp_y * wing_offset)
+            # Add text label
+            txt = pcbnew.PCB_TEXT(board)
+            txt.SetText(f"{message} (x{count})" if count > 1 else message)
+            txt.SetPosition(pcbnew.VECTOR2I(x, y + text_offset))
+            txt.SetLayer(layer)
+            txt.SetTextSize(text_size)
+            board_add(txt)
+            add_item(txt)
+        
+        count = len(queue)
+        self._marker_queue = []
+        self._marker_index = {}
+        return count
+
+    def draw_error_marker(self, board, pos, message, layer, marker_group):
+        """Queue visual marker (circle + text) at violation location
+        
+        The marker is drawn by flush_markers() when the batched_marker_insertion()
+        block of Run() exits. Markers outside general.marker_region_mm are skipped.
+        A marker with the same message within one marker radius of an existing one
+        is merged into the first such marker when general.merge_colocated_markers is true: the
+        existing label gets an occurrence count instead of a new circle.
+        """
+        if self._cull_bbox is not None and self._is_culled(pos):
+            self._culled_markers += 1
+            return
+        
+        radius = self._marker_radius  # Precomputed by cache_marker_dimensions()
+        
+        # Co-located duplicate: bump the counter on the queued marker
+        if self._merge_markers and radius > 0:
+            index = self._marker_index.get((layer, message))
+            if index is None:
+                index = self._marker_index[(layer, message)] = PointGridIndex((), radius)
+            found = index.first_within(pos.x, pos.y)
+            if found is not None:
+                entry = found[0]
+                entry[4] += 1
+                # Later arrows of this violation join the surviving marker's group
+                if id(marker_group) not in self._marker_groups:
+                    self._merged_groups[id(marker_group)] = entry[5]
+                return
+        
+        entry = [layer, pos.x, pos.y, message, 1, marker_group]
+        self._marker_queue.append(entry)
+        self._marker_groups.add(id(marker_group))
+        self._count_group_item(marker_group)
+        self._merged_groups.pop(id(marker_group), None)
+        
+        if self._merge_markers and radius > 0:
+            index.add(pos.x, pos.y, entry)
+
+    def draw_arrow(self, board, start_pos, end_pos, label, layer, marker_group):
+        """Queue arrow line from start to end position with optional label
+        
+        The arrow is drawn by flush_arrows() when the batched_marker_insertion()
+        block of Run() exits. Arrows with both ends outside
+        general.marker_region_mm are skipped. The label (None or "" for no
+        label) is omitted when general.draw_arrow_labels is false. If the
+        group's marker was merged into another one, the arrow is drawn in the
+        surviving marker's group.
+        """
+        if (self._cull_bbox is not None
+                and self._is_culled(start_pos) and self._is_culled(end_pos)):
+            return
+        
+        marker_group = self._merged_groups.get(id(marker_group), marker_group)
+        self._arrow_queue.append((start_pos.x, start_pos.y, end_pos.x, end_pos.y,
+                                  label, layer, marker_group))
+        self._count_group_item(marker_group)
+
+    def flush_arrows(self, board):
+        """
+        Create the queued arrows (line, arrowhead wings, label) in a single pass.
+        
+        Returns:
+            int: Number of arrows drawn
+        """
+        line_width = self._marker_line_width
+        arrow_length = self._arrow_length
+        wing_offset = arrow_length * 2 // 5  # 40% of arrowhead length
+        draw_labels = self._draw_labels
+        text_size = self._text_size_vec
+        board_add = board.Add
+        VECTOR2I = pcbnew.VECTOR2I
+        
+        queue = self._arrow_queue
+        for start_x, start_y, end_x, end_y, label, layer, marker_group in queue:
+            add_item = marker_group.AddItem
+            end_pos = VECTOR2I(end_x, end_y)
             
-            # Draw arrowhead wings
-            wing1 = pcbnew.PCB_SHAPE(board)
-            wing1.SetShape(pcbnew.SHAPE_T_SEGMENT)
-            wing1.SetStart(end_pos)
-            wing1.SetEnd(pcbnew.VECTOR2I(wing1_x, wing1_y))
-            wing1.SetLayer(layer)
-            wing1.SetWidth(line_width)
-            board.Add(wing1)
-            marker_group.AddItem(wing1)
+            # Draw line from start to end
+            line = pcbnew.PCB_SHAPE(board)
+            line.SetShape(pcbnew.SHAPE_T_SEGMENT)
+            line.SetStart(VECTOR2I(start_x, start_y))
+            line.SetEnd(end_pos)
+            line.SetLayer(layer)
+            line.SetWidth(line_width)
+            board_add(line)
+            add_item(line)
             
-            wing2 = pcbnew.PCB_SHAPE(board)
-            wing2.SetShape(pcbnew.SHAPE_T_SEGMENT)
-            wing2.SetStart(end_pos)
-            wing2.SetEnd(pcbnew.VECTOR2I(wing2_x, wing2_y))
-            wing2.SetLayer(layer)
-            wing2.SetWidth(line_width)
-            board.Add(wing2)
-            marker_group.AddItem(wing2)
-        
-        # Add label at midpoint if provided
-        if label:
-            mid_x = (start_pos.x + end_pos.x) // 2
-            mid_y = (start_pos.y + end_pos.y) // 2
+            # Draw arrowhead at end point (simple triangle)
+            dx = end_x - start_x
+            dy = end_y - start_y
+
+            # Degenerate (zero-length) arrow has no direction: skip arrowhead entirely
+            if dx != 0 or dy != 0:
+                # Integer magnitude (coordinates are integer IU, so no float round-trip)
+                length = math.isqrt(dx*dx + dy*dy) or 1
+                
+                # Arrowhead points, scaled by a single division per coordinate:
+                #   back = end - dir * arrow_length
+                #   wing = back +/- perp * wing_offset, with perp = (-dy, dx) / length
+                back_x = dx * arrow_length
+                back_y = dy * arrow_length
+                side_x = dy * wing_offset
+                side_y = dx * wing_offset
+                wing1_x = end_x - (back_x + side_x) // length
+                wing1_y = end_y - (back_y - side_y) // length
+                wing2_x = end_x - (back_x - side_x) // length
+                wing2_y = end_y - (back_y + side_y) // length
+                
+                # Draw arrowhead wings
+                wing1 = pcbnew.PCB_SHAPE(board)
+                wing1.SetShape(pcbnew.SHAPE_T_SEGMENT)
+                wing1.SetStart(end_pos)
+                wing1.SetEnd(VECTOR2I(wing1_x, wing1_y))
+                wing1.SetLayer(layer)
+                wing1.SetWidth(line_width)
+                board_add(wing1)
+                add_item(wing1)
+                
+                wing2 = pcbnew.PCB_SHAPE(board)
+                wing2.SetShape(pcbnew.SHAPE_T_SEGMENT)
+                wing2.SetStart(end_pos)
+                wing2.SetEnd(VECTOR2I(wing2_x, wing2_y))
+                wing2.SetLayer(layer)
+                wing2.SetWidth(line_width)
+                board_add(wing2)
+                add_item(wing2)
             
-            txt = pcbnew.PCB_TEXT(board)
-            txt.SetText(label)
-            txt.SetPosition(pcbnew.VECTOR2I(mid_x, mid_y))
-            txt.SetLayer(layer)
-            txt.SetTextSize(pcbnew.VECTOR2I(text_size, text_size))
-            board.Add(txt)
-            marker_group.AddItem(txt)
+            # Add label at midpoint if provided (and labels are enabled)
+            if label and draw_labels:
+                txt = pcbnew.PCB_TEXT(board)
+                txt.SetText(label)
+                txt.SetPosition(VECTOR2I((start_x + end_x) >> 1, (start_y + end_y) >> 1))
+                txt.SetLayer(layer)
+                txt.SetTextSize(text_size)
+                board_add(txt)
+                add_item(txt)
+        
+        count = len(queue)
+        self._arrow_queue = []
+        return count
 
     def check_emi_filtering(self, board, marker_layer, config):
         """Check EMI filtering on interface connectors (USB, Ethernet, CAN, etc.)
@@ -867,34 +1147,8 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         Returns:
             int: Number of violations found
         """
-        # Check if module is available
-        if EMIFilteringChecker is None:
-            print("⚠️  EMI filtering checker module not available")
-            print("HINT: Ensure emi_filtering.py is in same directory as plugin")
-            return 0
-        
-        # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = EMIFilteringChecker(
-            board=board,
-            marker_layer=marker_layer,
-            config=config,
-            report_lines=self.report_lines,
-            verbose=verbose,
-            auditor=self  # Pass auditor instance for utility functions
-        )
-        
-        # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return self._run_checker("emi_filtering", "EMIFilteringChecker", board, marker_layer, config,
+                                 "EMI filtering")
     
     def check_clearance_creepage(self, board, marker_layer, config):
         """Check electrical clearance and creepage distances per IEC60664-1 / IPC2221
@@ -910,51 +1164,23 @@ class EMCAuditorPlugin(pcbnew.ActionPlugin):
         Returns:
             int: Number of violations found
         """
-        # Check if module is available
-        if ClearanceCreepageChecker is None:
-            print("⚠️  Clearance/Creepage checker module not available")
-            print("HINT: Ensure clearance_creepage.py is in same directory as plugin")
-            return 0
-        
-        # Create checker instance with shared report lines
-        verbose = self.config.get('general', {}).get('verbose_logging', True)
-        checker = ClearanceCreepageChecker(
-            board=board,
-            marker_layer=marker_layer,
-            config=config,
-            report_lines=self.report_lines,
-            verbose=verbose,
-            auditor=self  # Pass auditor instance for utility functions
-        )
-        
-        # Run check with injected utility functions (avoids code duplication)
-        log_func = self.create_logger(verbose, self.report_lines)
-        violations = checker.check(
-            draw_marker_func=self.draw_error_marker,
-            draw_arrow_func=self.draw_arrow,
-            get_distance_func=self.get_distance,
-            log_func=log_func,
-            create_group_func=self.create_violation_group
-        )
-        
-        return violations
+        return self._run_checker("clearance_creepage", "ClearanceCreepageChecker", board, marker_layer, config,
+                                 "Clearance/Creepage")
 
 
     def clear_previous_markers(self, board):
         """Remove old markers from the marker layer to refresh the report"""
-        general = self.config.get('general', {})
-        layer_name = general.get('marker_layer', 'Cmts.User')
+        layer_name = self.resolved.marker_layer
         layer_id = board.GetLayerID(layer_name)
         
-        # Remove all EMC violation groups (individual and master)
-        for group in board.Groups():
-            group_name = group.GetName()
-            if group_name.startswith("EMC_"):
-                board.Remove(group)
+        # Collect first, then remove: Remove() mutates the containers being iterated.
+        # EMC violation groups (individual and master), plus every drawing on the
+        # marker layer (grouped markers and ungrouped ones from previous versions)
+        to_remove = [group for group in board.Groups() if group.GetName().startswith("EMC_")]
+        to_remove.extend(drawing for drawing in board.GetDrawings() if drawing.GetLayer() == layer_id)
         
-        # Also remove any ungrouped markers from previous versions
-        for drawing in board.GetDrawings():
-            if drawing.GetLayer() == layer_id:
-                board.Remove(drawing)
+        board_remove = board.Remove
+        for item in to_remove:
+            board_remove(item)
 
 EMCAuditorPlugin().register()
\ No newline at end of file
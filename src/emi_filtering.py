@@ -13,6 +13,14 @@ Last Updated: 2026-02-12
 import pcbnew
 import math
 
+from net_matching import compile_substring_matcher
+
+
+# Connector pads on ground/power nets are not signal lines (see _get_signal_pads)
+_CONNECTOR_GROUND_PATTERNS = ['GND', 'GROUND', 'VSS', 'PGND', 'AGND', 'DGND', 'SHIELD', 'SH']
+_CONNECTOR_POWER_PATTERNS = ['VCC', 'VDD', 'PWR', '3V3', '5V', '1V8', '2V5', '12V', '+3V3', '+5V', '+', 'VBUS']
+_is_connector_supply_net = compile_substring_matcher(_CONNECTOR_GROUND_PATTERNS + _CONNECTOR_POWER_PATTERNS)
+
 
 class EMIFilteringChecker:
     """
@@ -52,11 +60,19 @@ class EMIFilteringChecker:
         self.draw_marker = None
         self.draw_arrow = None
         self.get_distance = None
+        self.get_distance_sq = None
         
         # Results tracking
         self.violation_count = 0
+        
+        # Footprint snapshot, built on first use (see _footprint_index)
+        self._fp_index = None
+        
+        # Ground/power net matcher from config, built on first use (see _analyze_component_placement)
+        self._gnd_power_match = None
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Main entry point - performs EMI filtering verification.
         
@@ -69,6 +85,8 @@ class EMIFilteringChecker:
             get_distance_func: Function(pos1, pos2) returns distance
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function(pos1, pos2) returns squared distance
+                (used for threshold comparisons, no sqrt)
         
         Returns:
             int: Number of violations found
@@ -78,6 +96,9 @@ class EMIFilteringChecker:
         self.draw_marker = draw_marker_func
         self.draw_arrow = draw_arrow_func
         self.get_distance = get_distance_func
+        self.get_distance_sq = get_distance_sq_func
+        self._fp_index = None  # Board may have changed since a previous check()
+        self._gnd_power_match = None
         
         self.log("\n=== EMI FILTERING CHECK START ===", force=True)
         
@@ -180,14 +201,40 @@ class EMIFilteringChecker:
         self.log(f"\n=== EMI FILTERING CHECK COMPLETE: {self.violation_count} violation(s) ===", force=True)
         return self.violation_count
     
+    def _footprint_index(self):
+        """
+        Snapshot the board's footprints once for all connector/filter searches.
+        
+        Every signal pad used to rescan board.GetFootprints() and each footprint's
+        Pads() and GetPosition() several times; the scans now read this snapshot instead.
+        
+        Returns:
+            tuple: (entries, entries_by_net)
+                - entries: list of (ref, footprint, pads, net_codes, position) in board order
+                - entries_by_net: {net_code: [entry, ...]} for footprints with a
+                  pad on that net, in board order
+        """
+        if self._fp_index is None:
+            entries = []
+            entries_by_net = {}
+            for fp in self.board.GetFootprints():
+                pads = list(fp.Pads())
+                net_codes = set()
+                for pad in pads:
+                    pad_net = pad.GetNet()
+                    if pad_net:
+                        net_codes.add(pad_net.GetNetCode())
+                entry = (str(fp.GetReference()), fp, pads, net_codes, fp.GetPosition())
+                entries.append(entry)
+                for net_code in net_codes:
+                    entries_by_net.setdefault(net_code, []).append(entry)
+            self._fp_index = (entries, entries_by_net)
+        return self._fp_index
+    
     def _find_connectors(self, prefix):
         """Find all footprints with reference starting with specified prefix (e.g., 'J')"""
-        connectors = []
-        for fp in self.board.GetFootprints():
-            ref = str(fp.GetReference())
-            if ref.startswith(prefix):
-                connectors.append((ref, fp))
-        return connectors
+        entries, _ = self._footprint_index()
+        return [(ref, fp) for ref, fp, _, _, _ in entries if ref.startswith(prefix)]
     
     def _detect_interface_type(self, ref, footprint):
         """Detect interface type from reference or footprint name"""
@@ -219,9 +266,6 @@ class EMIFilteringChecker:
         """Get signal pads from connector (exclude GND, VCC, shield, etc.)"""
         signal_pads = []
         
-        ground_patterns = ['GND', 'GROUND', 'VSS', 'PGND', 'AGND', 'DGND', 'SHIELD', 'SH']
-        power_patterns = ['VCC', 'VDD', 'PWR', '3V3', '5V', '1V8', '2V5', '12V', '+3V3', '+5V', '+', 'VBUS']
-        
         for pad in footprint.Pads():
             net = pad.GetNet()
             if not net:
@@ -229,11 +273,8 @@ class EMIFilteringChecker:
             
             net_name = str(net.GetNetname()).upper()
             
-            # Exclude ground and power nets
-            is_ground = any(pattern in net_name for pattern in ground_patterns)
-            is_power = any(pattern in net_name for pattern in power_patterns)
-            
-            if not is_ground and not is_power:
+            # Exclude ground and power nets (one regex search over both pattern lists)
+            if not _is_connector_supply_net(net_name):
                 signal_pads.append(pad)
         
         return signal_pads
@@ -250,24 +291,11 @@ class EMIFilteringChecker:
         
         # Find all filter components on this net
         all_filter_components = []
-        for fp in self.board.GetFootprints():
-            ref = str(fp.GetReference())
-            
-            if not any(ref.startswith(prefix) for prefix in prefixes):
-                continue
-            
-            component_on_net = False
-            for pad in fp.Pads():
-                if pad.GetNet() and pad.GetNet().GetNetCode() == net.GetNetCode():
-                    component_on_net = True
-                    break
-            
-            if component_on_net:
-                comp_pos = fp.GetPosition()
-                distance = math.sqrt(
-                    (comp_pos.x - connector_pos.x)**2 + 
-                    (comp_pos.y - connector_pos.y)**2
-                )
+        prefix_tuple = tuple(prefixes)
+        _, entries_by_net = self._footprint_index()
+        for ref, fp, _, _, comp_pos in entries_by_net.get(net.GetNetCode(), ()):
+            if ref.startswith(prefix_tuple):
+                distance = self.get_distance(comp_pos, connector_pos)
                 all_filter_components.append((ref, fp, distance))
         
         if not all_filter_components:
@@ -309,34 +337,26 @@ class EMIFilteringChecker:
     def _find_first_filter_component(self, net, connector_pos, max_distance, prefixes):
         """Find the first filter component within max_distance of connector"""
         nearest_component = None
-        nearest_distance = float('inf')
-        
-        for fp in self.board.GetFootprints():
-            ref = str(fp.GetReference())
-            
-            if not any(ref.startswith(prefix) for prefix in prefixes):
+        nearest_distance_sq = float('inf')
+        max_distance_sq = max_distance * max_distance
+        prefix_tuple = tuple(prefixes)
+        
+        # Only footprints with a pad on this net are candidates
+        _, entries_by_net = self._footprint_index()
+        for ref, fp, _, _, fp_pos in entries_by_net.get(net.GetNetCode(), ()):
+            if not ref.startswith(prefix_tuple):
                 continue
             
-            component_on_net = False
-            for pad in fp.Pads():
-                if pad.GetNet() and pad.GetNet().GetNetCode() == net.GetNetCode():
-                    component_on_net = True
-                    break
+            # Compare squared distances; sqrt only for the reported nearest component
+            distance_sq = self.get_distance_sq(fp_pos, connector_pos)
             
-            if not component_on_net:
-                continue
-            
-            comp_pos = fp.GetPosition()
-            distance = math.sqrt(
-                (comp_pos.x - connector_pos.x)**2 + 
-                (comp_pos.y - connector_pos.y)**2
-            )
-            
-            if distance <= max_distance and distance < nearest_distance:
-                nearest_component = (ref, fp, distance)
-                nearest_distance = distance
+            if distance_sq <= max_distance_sq and distance_sq < nearest_distance_sq:
+                nearest_component = (ref, fp)
+                nearest_distance_sq = distance_sq
         
-        return nearest_component
+        if nearest_component is None:
+            return None
+        return (*nearest_component, math.sqrt(nearest_distance_sq))
     
     def _analyze_component_placement(self, footprint, signal_net):
         """Determine if component is series (in-line) or shunt (to GND/power)"""
@@ -353,15 +373,18 @@ class EMIFilteringChecker:
             else:
                 pad_nets.append('NC')
         
-        ground_patterns = self.config.get('ground_patterns', ['GND', 'GROUND', 'VSS', 'AGND', 'DGND', 'PGND'])
-        power_patterns = self.config.get('power_patterns', ['VCC', 'VDD', 'PWR', '+', 'VBUS', '3V3', '5V'])
-        gnd_power_patterns = ground_patterns + power_patterns
+        # Compiled once per check from the config's ground + power patterns
+        is_gnd_power = self._gnd_power_match
+        if is_gnd_power is None:
+            ground_patterns = self.config.get('ground_patterns', ['GND', 'GROUND', 'VSS', 'AGND', 'DGND', 'PGND'])
+            power_patterns = self.config.get('power_patterns', ['VCC', 'VDD', 'PWR', '+', 'VBUS', '3V3', '5V'])
+            is_gnd_power = self._gnd_power_match = compile_substring_matcher((*ground_patterns, *power_patterns))
         
         signal_net_name = str(signal_net.GetNetname())
         signal_net_count = pad_nets.count(signal_net_name)
         
         has_gnd_power = any(
-            any(pattern in net_name.upper() for pattern in gnd_power_patterns)
+            is_gnd_power(net_name.upper())
             for net_name in pad_nets if net_name != 'NC'
         )
         
@@ -406,59 +429,44 @@ class EMIFilteringChecker:
         inductor_prefixes = component_classes.get('inductor_prefixes', ['L', 'FB'])
         capacitor_prefixes = component_classes.get('capacitor_prefixes', ['C'])
         
+        max_distance_sq = max_distance * max_distance
+        inductor_prefix_tuple = tuple(inductor_prefixes)
+        capacitor_prefix_tuple = tuple(capacitor_prefixes)
+        entries, _ = self._footprint_index()
+        
         # Look for common-mode choke
-        for fp in self.board.GetFootprints():
-            ref = str(fp.GetReference())
-            
-            if not any(ref.startswith(prefix) for prefix in inductor_prefixes):
+        for ref, fp, pads, nets_on_component, fp_pos in entries:
+            if not ref.startswith(inductor_prefix_tuple):
                 continue
             
-            pads = list(fp.Pads())
             if len(pads) < min_pins:
                 continue
             
-            comp_pos = fp.GetPosition()
-            distance = math.sqrt(
-                (comp_pos.x - connector_pos.x)**2 + 
-                (comp_pos.y - connector_pos.y)**2
-            )
+            distance_sq = self.get_distance_sq(fp_pos, connector_pos)
             
-            if distance > max_distance:
+            if distance_sq > max_distance_sq:
                 continue
             
-            nets_on_component = set()
-            for pad in pads:
-                pad_net = pad.GetNet()
-                if pad_net:
-                    nets_on_component.add(pad_net.GetNetCode())
-            
             if net.GetNetCode() in nets_on_component and pair_net.GetNetCode() in nets_on_component:
                 return {
                     'ref': ref,
                     'type': 'common_mode_choke',
                     'net1': net_name,
                     'net2': str(pair_net.GetNetname()),
-                    'distance': distance
+                    'distance': math.sqrt(distance_sq)
                 }
         
         # Look for common-mode capacitor
-        for fp in self.board.GetFootprints():
-            ref = str(fp.GetReference())
-            
-            if not any(ref.startswith(prefix) for prefix in capacitor_prefixes):
+        for ref, fp, pads, _, fp_pos in entries:
+            if not ref.startswith(capacitor_prefix_tuple):
                 continue
             
-            pads = list(fp.Pads())
             if len(pads) != 2:
                 continue
             
-            comp_pos = fp.GetPosition()
-            distance = math.sqrt(
-                (comp_pos.x - connector_pos.x)**2 + 
-                (comp_pos.y - connector_pos.y)**2
-            )
+            distance_sq = self.get_distance_sq(fp_pos, connector_pos)
             
-            if distance > max_distance:
+            if distance_sq > max_distance_sq:
                 continue
             
             pad_nets = []
@@ -475,7 +483,7 @@ class EMIFilteringChecker:
                         'type': 'common_mode_capacitor',
                         'net1': net_name,
                         'net2': str(pair_net.GetNetname()),
-                        'distance': distance
+                        'distance': math.sqrt(distance_sq)
                     }
         
         return None
@@ -485,16 +493,21 @@ class EMIFilteringChecker:
         if not line_components:
             return 'simple'
         
+        # str.startswith() takes a tuple of prefixes
+        inductor_prefix_tuple = tuple(inductor_prefixes)
+        resistor_prefix_tuple = tuple(resistor_prefixes)
+        capacitor_prefix_tuple = tuple(capacitor_prefixes)
+        
         has_series_L = any(
-            any(comp['ref'].startswith(prefix) for prefix in inductor_prefixes)
+            comp['ref'].startswith(inductor_prefix_tuple)
             for comp in line_components if comp['type'] == 'series'
         )
         has_series_R = any(
-            any(comp['ref'].startswith(prefix) for prefix in resistor_prefixes)
+            comp['ref'].startswith(resistor_prefix_tuple)
             for comp in line_components if comp['type'] == 'series'
         )
         has_shunt_C = any(
-            any(comp['ref'].startswith(prefix) for prefix in capacitor_prefixes)
+            comp['ref'].startswith(capacitor_prefix_tuple)
             for comp in line_components if comp['type'] == 'shunt'
         )
         
@@ -598,17 +611,20 @@ class EMIFilteringChecker:
         
         topology_desc = " → ".join(desc_parts)
         
-        # Classify topology
+        # Classify topology (str.startswith() takes a tuple of prefixes)
+        inductor_prefix_tuple = tuple(inductor_prefixes)
+        resistor_prefix_tuple = tuple(resistor_prefixes)
+        capacitor_prefix_tuple = tuple(capacitor_prefixes)
         has_series_L = any(
-            any(comp['ref'].startswith(prefix) for prefix in inductor_prefixes)
+            comp['ref'].startswith(inductor_prefix_tuple)
             for comp in component_analysis if comp['type'] == 'series'
         )
         has_shunt_C = any(
-            any(comp['ref'].startswith(prefix) for prefix in capacitor_prefixes)
+            comp['ref'].startswith(capacitor_prefix_tuple)
             for comp in component_analysis if comp['type'] == 'shunt'
         )
         has_series_R = any(
-            any(comp['ref'].startswith(prefix) for prefix in resistor_prefixes)
+            comp['ref'].startswith(resistor_prefix_tuple)
             for comp in component_analysis if comp['type'] == 'series'
         )
         
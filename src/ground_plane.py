@@ -11,6 +11,7 @@ License: MIT (see LICENSE file in repository)
 
 import pcbnew
 import math
+import time
 
 try:
     import wx
@@ -18,6 +19,26 @@ try:
 except ImportError:
     HAS_WX = False  # Testing environment without wxPython
 
+from net_matching import UpperCaseCache, compile_substring_matcher
+from spatial_index import PointGridIndex, ZoneGridIndex, zone_bounds
+
+
+class LayerNameCache(dict):
+    """
+    layer_id -> board layer name, filled on first lookup.
+    
+    Each GetLayerName() call crosses the SWIG boundary; a check resolves the
+    same few layers for every zone and track, so each name is fetched once.
+    """
+    
+    def __init__(self, board):
+        super().__init__()
+        self.board = board
+    
+    def __missing__(self, layer_id):
+        name = self[layer_id] = self.board.GetLayerName(layer_id)
+        return name
+
 
 class GroundPlaneChecker:
     """
@@ -73,8 +94,11 @@ class GroundPlaneChecker:
         self.report_lines = report_lines
         self.verbose = verbose
         self.auditor = auditor  # For accessing get_nets_by_class() if needed
+        self.net_upper = UpperCaseCache()  # Uppercased net names, shared by all sub-checks
+        self.zone_hit_cache = {}  # (id(zone), layer, x, y) -> HitTestFilledArea result
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Execute ground plane continuity check.
         
@@ -87,17 +111,28 @@ class GroundPlaneChecker:
             get_distance_func: Function to calculate distance (signature: p1, p2 -> float)
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function to calculate squared distance (signature: p1, p2 -> int)
         
         Returns:
             int: Number of violations found
         """
         # Store utility functions for reuse
         self.log = log_func  # Centralized logger from main plugin
+        self.get_distance_sq = get_distance_sq_func
+        # Per-track/per-sample detail is only formatted when verbose logging is on
+        # (the logger drops it otherwise); IU -> mm is a multiply, not a ToMM() call
+        verbose = self.verbose
+        self.mm_per_iu = mm_per_iu = 1.0 / pcbnew.FromMM(1.0)
         self.log("\n=== GROUND PLANE CHECK START ===", force=True)
         
         # Load configuration parameters
         critical_classes = self.config.get('critical_net_classes', ['HighSpeed', 'Clock'])
-        gnd_patterns = [p.upper() for p in self.config.get('ground_net_patterns', ['GND'])]
+        gnd_patterns = tuple(p.upper() for p in self.config.get('ground_net_patterns', ['GND']))
+        is_critical_class = compile_substring_matcher(critical_classes)
+        is_ground_net = compile_substring_matcher(gnd_patterns)
+        layer_names = LayerNameCache(self.board)
+        self.zone_hit_cache = {}  # Zone ids are only stable while this check holds the zones
+        net_upper = self.net_upper
         
         self.log(f"Looking for net classes: {critical_classes}")
         self.log(f"Looking for ground patterns: {gnd_patterns}")
@@ -129,10 +164,10 @@ class GroundPlaneChecker:
         self.log(f"Ignore pad clearance: {ignore_pad_clearance_mm} mm")
         self.log(f"Min ground polygon area: {min_area_mm2} mm²")
         
-        max_gap_under = pcbnew.FromMM(self.config.get('max_gap_under_trace_mm', 0.5))
+        # All mm -> internal unit conversions happen here, once per check
+        # (max_gap_under_trace_mm / max_ground_gap_in_clearance_zone_mm are not used yet)
         sampling_interval = pcbnew.FromMM(self.config.get('sampling_interval_mm', 0.5))
         clearance_zone = pcbnew.FromMM(self.config.get('min_clearance_around_trace_mm', 1.0))
-        max_gap_clearance = pcbnew.FromMM(self.config.get('max_ground_gap_in_clearance_zone_mm', 2.0))
         via_clearance_radius = pcbnew.FromMM(ignore_via_clearance_mm)
         pad_clearance_radius = pcbnew.FromMM(ignore_pad_clearance_mm)
         
@@ -141,23 +176,32 @@ class GroundPlaneChecker:
         
         violations = 0
         
+        # Split the board's tracks by type in one pass (PCB_VIA subclasses PCB_TRACK,
+        # so vias are tested first); sub-checks reuse these lists
+        traces, vias = self._partition_tracks()
+        
         # Get all tracks on critical net classes
         self.log("\n--- Scanning all tracks ---")
-        critical_tracks = []
-        for track in self.board.GetTracks():
-            if isinstance(track, pcbnew.PCB_TRACK):
-                net_name = track.GetNetname()
+        critical_tracks = []  # (track, net name), the name is reused by the track loop
+        class_by_net = {}  # net name -> (net class, is critical): classes belong to nets
+        for track in traces:
+            net_name = track.GetNetname()
+            net_info = class_by_net.get(net_name)
+            if net_info is None:
                 net_class = track.GetNetClassName()
                 # Check if any critical class name is in the net class string
                 # (KiCad may return "HighSpeed,Default" for nets in multiple classes)
-                is_critical = any(crit_class in net_class for crit_class in critical_classes)
-                
-                # Debug output for CLK or if already marked critical
-                if is_critical or 'CLK' in net_name.upper():
-                    self.log(f"Track: net='{net_name}', class='{net_class}'")
-                    if is_critical:
-                        critical_tracks.append(track)
-                        self.log(f"  ✓ Added to critical check")
+                net_info = class_by_net[net_name] = (net_class, is_critical_class(net_class) is not None)
+            net_class, is_critical = net_info
+            
+            if is_critical:
+                critical_tracks.append((track, net_name))
+            
+            # Debug output for CLK or if already marked critical
+            if verbose and (is_critical or 'CLK' in net_upper[net_name]):
+                self.log(f"Track: net='{net_name}', class='{net_class}'")
+                if is_critical:
+                    self.log(f"  ✓ Added to critical check")
         
         if not critical_tracks:
             self.log(f"\n❌ ERROR: No tracks found in critical net classes!", force=True)
@@ -172,43 +216,48 @@ class GroundPlaneChecker:
         all_reference_zones = []  # All zones (ground AND power) for split detection
         ground_zones_by_layer = {}  # Pre-filter zones by layer for O(1) lookup
         all_zones_by_layer = {}  # All reference planes by layer
+        bounds_by_zone = {}  # id(zone) -> (left, top, right, bottom), read once per zone
+        iu_per_mm = pcbnew.FromMM(1.0)
+        iu2_per_mm2 = iu_per_mm * iu_per_mm
+        min_area_iu2 = min_area_mm2 * iu2_per_mm2
         
         for zone in self.board.Zones():
-            zone_net = zone.GetNetname().upper()
+            zone_net = net_upper[zone.GetNetname()]
             zone_layer = zone.GetLayer()
-            layer_name = self.board.GetLayerName(zone_layer)
+            layer_name = layer_names[zone_layer]
             is_filled = zone.IsFilled()
-            self.log(f"Zone: net='{zone.GetNetname()}', layer={layer_name}, filled={is_filled}")
+            if verbose:
+                self.log(f"Zone: net='{zone.GetNetname()}', layer={layer_name}, filled={is_filled}")
             
             if not is_filled:
-                self.log(f"  ⚠️  WARNING: Zone NOT FILLED! Press 'B' to fill zones.")
+                if verbose:
+                    self.log(f"  ⚠️  WARNING: Zone NOT FILLED! Press 'B' to fill zones.")
                 continue  # Skip unfilled zones (can't hit test them)
             
             # Check minimum polygon area (filter out small copper islands)
-            bbox = zone.GetBoundingBox()
-            width_mm = pcbnew.ToMM(bbox.GetWidth())
-            height_mm = pcbnew.ToMM(bbox.GetHeight())
-            zone_area_mm2 = width_mm * height_mm  # Bounding box area in mm²
-            if zone_area_mm2 < min_area_mm2:
-                self.log(f"  ⚠️  Zone too small ({zone_area_mm2:.1f} mm² < {min_area_mm2:.1f} mm²), skipping")
+            # (bounding box area compared in internal units: no per-zone ToMM calls)
+            aabb = zone_bounds(zone)
+            zone_area_iu2 = (aabb[2] - aabb[0]) * (aabb[3] - aabb[1])
+            zone_area_mm2 = zone_area_iu2 / iu2_per_mm2  # Bounding box area in mm²
+            if zone_area_iu2 < min_area_iu2:
+                if verbose:
+                    self.log(f"  ⚠️  Zone too small ({zone_area_mm2:.1f} mm² < {min_area_mm2:.1f} mm²), skipping")
                 continue
             
             # Add ALL zones to reference plane list (for split detection)
             all_reference_zones.append(zone)
-            if zone_layer not in all_zones_by_layer:
-                all_zones_by_layer[zone_layer] = []
-            all_zones_by_layer[zone_layer].append(zone)
+            all_zones_by_layer.setdefault(zone_layer, []).append(zone)
+            bounds_by_zone[id(zone)] = aabb
             
             # Also track ground zones specifically
-            if any(pat in zone_net for pat in gnd_patterns):
+            if is_ground_net(zone_net):
                 ground_zones.append(zone)
                 
                 # Add to layer-indexed dict for fast lookup
-                if zone_layer not in ground_zones_by_layer:
-                    ground_zones_by_layer[zone_layer] = []
-                ground_zones_by_layer[zone_layer].append(zone)
-                self.log(f"  ✓ Added as GROUND zone ({zone_area_mm2:.1f} mm²)")
-            else:
+                ground_zones_by_layer.setdefault(zone_layer, []).append(zone)
+                if verbose:
+                    self.log(f"  ✓ Added as GROUND zone ({zone_area_mm2:.1f} mm²)")
+            elif verbose:
                 self.log(f"  ✓ Added as REFERENCE zone (non-ground) ({zone_area_mm2:.1f} mm²)")
         
         if not ground_zones:
@@ -223,22 +272,46 @@ class GroundPlaneChecker:
             self.log(f"\nPreferred ground layers: {preferred_layers}")
             # Sort ground zones by preferred layer priority
             # Zones on preferred layers will be checked first
-            preferred_layer_names = [name.upper() for name in preferred_layers]
+            is_preferred_layer = compile_substring_matcher([name.upper() for name in preferred_layers])
             for layer_id, zones in ground_zones_by_layer.items():
-                layer_name = self.board.GetLayerName(layer_id).upper()
+                layer_name = layer_names[layer_id].upper()
                 # Check if this layer matches any preferred pattern
-                is_preferred = any(pref in layer_name for pref in preferred_layer_names)
-                if is_preferred:
-                    self.log(f"  ✓ Layer {self.board.GetLayerName(layer_id)} marked as preferred")
+                if is_preferred_layer(layer_name):
+                    self.log(f"  ✓ Layer {layer_names[layer_id]} marked as preferred")
+        
+        # Spatial index per layer: each sample only hit-tests zones whose bbox contains it
+        # (bounding boxes were already read during the zone scan)
+        ground_index_by_layer = {
+            layer: ZoneGridIndex(zones, bounds=[bounds_by_zone[id(z)] for z in zones])
+            for layer, zones in ground_zones_by_layer.items()
+        }
+        all_index_by_layer = {
+            layer: ZoneGridIndex(zones, bounds=[bounds_by_zone[id(z)] for z in zones])
+            for layer, zones in all_zones_by_layer.items()
+        }
+        
+        # GND pad/via positions for the ignore-near-ground test, collected once
+        # instead of re-walking all footprints, pads and tracks for every sample,
+        # and hashed into grids with cell size = ignore radius
+        gnd_pad_xy, gnd_via_xy = self._collect_ground_connections(
+            vias, is_ground_net,
+            include_pads=ignore_pad_clearance_mm > 0,
+            include_vias=ignore_via_clearance_mm > 0
+        )
+        gnd_pad_index = PointGridIndex(gnd_pad_xy, pad_clearance_radius)
+        gnd_via_index = PointGridIndex(gnd_via_xy, via_clearance_radius)
         
         self.log(f"\n✓ Found {len(critical_tracks)} critical tracks, {len(ground_zones)} ground zones, {len(all_reference_zones)} total reference zones", force=True)
         self.log(f"   Ground zones indexed by {len(ground_zones_by_layer)} layers for fast lookup", force=True)
         self.log(f"   All zones indexed by {len(all_zones_by_layer)} layers for split detection", force=True)
         self.log("="*60)
         
-        # Create progress dialog for user feedback
+        # Create progress dialog for user feedback (only inside a running wx event loop,
+        # i.e. launched from the KiCad GUI - not in scripted/headless runs)
         progress = None
-        if HAS_WX and len(critical_tracks) > 10:  # Only show progress for substantial work
+        last_progress_update = 0.0
+        if (HAS_WX and len(critical_tracks) > 10  # Only show progress for substantial work
+                and wx.GetApp() is not None and wx.App.IsMainLoopRunning()):
             try:
                 progress = wx.ProgressDialog(
                     "Ground Plane Check",
@@ -250,188 +323,146 @@ class GroundPlaneChecker:
                 self.log(f"  ⚠️  Could not create progress dialog: {e}")
                 progress = None
         
+        # Layers to check depend only on the track layer; resolve them once per distinct layer
+        if check_mode == 'all':
+            all_ground_layers = list(set([zone.GetLayer() for zone in ground_zones]))
+            all_ground_layer_names = [layer_names[l] for l in all_ground_layers]
+        else:
+            adjacent_by_layer = {
+                layer: self.get_adjacent_ground_layer(layer)
+                for layer in {track.GetLayer() for track, _ in critical_tracks}
+            }
+        
         # Check each critical track
-        for track_idx, track in enumerate(critical_tracks):
-            # Update progress dialog
-            if progress:
+        for track_idx, (track, net_name) in enumerate(critical_tracks):
+            # Update progress dialog at most every 100 ms (each Update dispatches GUI events)
+            if progress and time.monotonic() - last_progress_update >= 0.1:
+                last_progress_update = time.monotonic()
                 cont, skip = progress.Update(
                     track_idx, 
-                    f"Checking track {track_idx+1}/{len(critical_tracks)} on net '{track.GetNetname()}'..."
+                    f"Checking track {track_idx+1}/{len(critical_tracks)} on net '{net_name}'..."
                 )
                 if not cont:  # User clicked Cancel
                     self.log("\n⚠️  Ground plane check CANCELLED by user", force=True)
                     progress.Destroy()
                     return violations
             
-            net_name = track.GetNetname()
             start = track.GetStart()
             end = track.GetEnd()
             track_layer = track.GetLayer()
-            track_layer_name = self.board.GetLayerName(track_layer)
+            track_layer_name = layer_names[track_layer]
             
-            self.log(f"\n>>> Checking track on net '{net_name}', layer {track_layer_name}")
-            self.log(f"    Start: ({pcbnew.ToMM(start.x):.2f}, {pcbnew.ToMM(start.y):.2f}) mm")
-            self.log(f"    End: ({pcbnew.ToMM(end.x):.2f}, {pcbnew.ToMM(end.y):.2f}) mm")
+            if verbose:
+                self.log(f"\n>>> Checking track on net '{net_name}', layer {track_layer_name}")
+                self.log(f"    Start: ({start.x * mm_per_iu:.2f}, {start.y * mm_per_iu:.2f}) mm")
+                self.log(f"    End: ({end.x * mm_per_iu:.2f}, {end.y * mm_per_iu:.2f}) mm")
             
             # Determine which layers to check
             if check_mode == 'all':
                 # Check all ground zones on all layers
-                layers_to_check = list(set([zone.GetLayer() for zone in ground_zones]))
-                layer_names = [self.board.GetLayerName(l) for l in layers_to_check]
-                self.log(f"    Checking ground on ALL layers: {layer_names}")
+                layers_to_check = all_ground_layers
+                if verbose:
+                    self.log(f"    Checking ground on ALL layers: {all_ground_layer_names}")
             else:
                 # Check only adjacent layer
-                adjacent_layer = self.get_adjacent_ground_layer(track_layer)
+                adjacent_layer = adjacent_by_layer[track_layer]
                 if adjacent_layer is None:
-                    self.log(f"    ⚠️  No adjacent layer found, skipping")
+                    if verbose:
+                        self.log(f"    ⚠️  No adjacent layer found, skipping")
                     continue
                 layers_to_check = [adjacent_layer]
-                self.log(f"    Checking ground on adjacent layer: {self.board.GetLayerName(adjacent_layer)}")
+                if verbose:
+                    self.log(f"    Checking ground on adjacent layer: {layer_names[adjacent_layer]}")
             
             # Sample points along the track
             track_length = get_distance_func(start, end)
             if track_length == 0:
-                self.log(f"    ⚠️  Zero-length track, skipping")
+                if verbose:
+                    self.log(f"    ⚠️  Zero-length track, skipping")
                 continue
             
             num_samples = max(2, int(track_length / sampling_interval))
-            self.log(f"    Track length: {pcbnew.ToMM(track_length):.2f} mm, samples: {num_samples}")
+            if verbose:
+                self.log(f"    Track length: {track_length * mm_per_iu:.2f} mm, samples: {num_samples}")
+            samples = self._sample_track_points(start, end, num_samples)
+            
+            # Points at clearance_zone distance perpendicular to the track:
+            # the offsets depend only on the track direction, so compute them once
+            offsets = []
+            if check_clearance:
+                dx = end.x - start.x
+                dy = end.y - start.y
+                length = math.sqrt(dx*dx + dy*dy)
+                
+                if length > 0:
+                    # Perpendicular vector
+                    perp_x = -dy / length * clearance_zone
+                    perp_y = dx / length * clearance_zone
+                    # Check both sides (or just one if check_both_sides = false)
+                    offsets = [(perp_x, perp_y), (-perp_x, -perp_y)] if check_both else [(perp_x, perp_y)]
+            
+            # PRIORITY 1 (continuity under trace) and the clearance check walk the same
+            # samples: scan once, report in the original order below
+            gap = None
+            clearance_pos = None
+            if check_continuity or offsets:
+                continuity_indexes = None
+                if check_continuity:
+                    continuity_indexes = self._layer_indexes(ground_index_by_layer, layers_to_check,
+                                                             self._samples_bbox(samples))
+                # The offset points stay within clearance_zone of the track
+                clearance_indexes = self._layer_indexes(ground_index_by_layer, layers_to_check,
+                                                        self._samples_bbox(samples, clearance_zone + 1))
+                gap, clearance_pos = self._scan_samples(samples, continuity_indexes,
+                                                        clearance_indexes, offsets,
+                                                        gnd_pad_index, gnd_via_index)
             
             # ========== PRIORITY 1: Check continuity under trace (slot/gap detection) ==========
             if check_continuity:
-                gap_found = False
-                gap_position = None
-                
-                for i in range(num_samples + 1):
-                    t = i / num_samples
-                    sample_x = int(start.x + (end.x - start.x) * t)
-                    sample_y = int(start.y + (end.y - start.y) * t)
-                    sample_pos = pcbnew.VECTOR2I(sample_x, sample_y)
+                if gap is not None:
+                    gap_index, gap_position = gap
+                    if verbose:
+                        self.log(f"    ❌ GAP FOUND at sample {gap_index}/{num_samples}:")
+                        self.log(f"       Position: ({gap_position.x * mm_per_iu:.2f}, {gap_position.y * mm_per_iu:.2f}) mm")
                     
-                    # Check if ground plane exists at this point on ANY of the layers to check
-                    # Use pre-filtered zones by layer for O(1) lookup instead of O(n) iteration
-                    has_ground_on_any_layer = False
-                    for check_layer in layers_to_check:
-                        # Only check zones on this specific layer (much faster)
-                        for zone in ground_zones_by_layer.get(check_layer, []):
-                            # HitTestFilledArea checks if point is inside filled zone
-                            if zone.HitTestFilledArea(check_layer, sample_pos):
-                                has_ground_on_any_layer = True
-                                break
-                        if has_ground_on_any_layer:
-                            break
-                    
-                    if not has_ground_on_any_layer:
-                        # Check if violation is near a via or pad (should be ignored)
-                        should_ignore = self._should_ignore_gap_near_ground_connections(
-                            sample_pos, gnd_patterns, 
-                            via_clearance_radius, pad_clearance_radius,
-                            ignore_via_clearance_mm, ignore_pad_clearance_mm,
-                            get_distance_func
-                        )
-                        
-                        if not should_ignore:
-                            gap_found = True
-                            gap_position = sample_pos
-                            self.log(f"    ❌ GAP FOUND at sample {i}/{num_samples}:")
-                            self.log(f"       Position: ({pcbnew.ToMM(sample_x):.2f}, {pcbnew.ToMM(sample_y):.2f}) mm")
-                        break
-                
-                if gap_found and gap_position:
                     # Create violation marker using centralized utility
                     violation_group = create_group_func(self.board, "GndPlane", net_name, violations+1)
                     
                     draw_marker_func(self.board, gap_position, violation_msg_no_gnd, self.marker_layer, violation_group)
                     violations += 1
-                    self.log(f"    ✓ Violation marker created at ({pcbnew.ToMM(gap_position.x):.2f}, {pcbnew.ToMM(gap_position.y):.2f}) mm", force=True)
-                else:
+                    self.log(f"    ✓ Violation marker created at ({gap_position.x * mm_per_iu:.2f}, {gap_position.y * mm_per_iu:.2f}) mm", force=True)
+                elif verbose:
                     self.log(f"    ✓ No gaps found - ground plane continuous")
             
             # ========== PRIORITY 2: Check split plane crossing ==========
             if check_split_crossing:
-                self.log(f"\n    --- Checking split plane crossing ---")
+                if verbose:
+                    self.log(f"\n    --- Checking split plane crossing ---")
                 split_violation = self._check_split_plane_crossing(
-                    track, start, end, num_samples, layers_to_check,
-                    all_zones_by_layer, gnd_patterns,
+                    track, samples, layers_to_check, all_index_by_layer,
                     draw_marker_func, create_group_func, net_name
                 )
                 if split_violation > 0:
                     violations += split_violation
                     self.log(f"    ✓ {split_violation} split crossing violation(s) found", force=True)
-                else:
+                elif verbose:
                     self.log(f"    ✓ No split plane crossings")
             
             # Check clearance around trace
-            if check_clearance:
-                clearance_violation = False
-                clearance_pos = None
+            if clearance_pos is not None:
+                # Create violation marker using centralized utility
+                violation_group = create_group_func(self.board, "GndPlane", f"{net_name}_clearance", violations+1)
                 
-                # Sample perpendicular to track for clearance check
-                for i in range(num_samples + 1):
-                    t = i / num_samples
-                    sample_x = int(start.x + (end.x - start.x) * t)
-                    sample_y = int(start.y + (end.y - start.y) * t)
-                    
-                    # Check points at clearance_zone distance perpendicular to track
-                    dx = end.x - start.x
-                    dy = end.y - start.y
-                    length = math.sqrt(dx*dx + dy*dy)
-                    
-                    if length > 0:
-                        # Perpendicular vector
-                        perp_x = -dy / length * clearance_zone
-                        perp_y = dx / length * clearance_zone
-                        
-                        # Check both sides (or just one if check_both_sides = false)
-                        sides = [1, -1] if check_both else [1]
-                        for side in sides:
-                            check_x = int(sample_x + side * perp_x)
-                            check_y = int(sample_y + side * perp_y)
-                            check_pos = pcbnew.VECTOR2I(check_x, check_y)
-                            
-                            # Check if ground plane exists within clearance zone on any layer
-                            # Use pre-filtered zones by layer for O(1) lookup
-                            has_ground_nearby = False
-                            for check_layer in layers_to_check:
-                                # Only check zones on this specific layer (much faster)
-                                for zone in ground_zones_by_layer.get(check_layer, []):
-                                    if zone.HitTestFilledArea(check_layer, check_pos):
-                                        has_ground_nearby = True
-                                        break
-                                if has_ground_nearby:
-                                    break
-                            
-                            if not has_ground_nearby:
-                                # Check if violation is near a via or pad (should be ignored)
-                                should_ignore = self._should_ignore_gap_near_ground_connections(
-                                    check_pos, gnd_patterns,
-                                    via_clearance_radius, pad_clearance_radius,
-                                    ignore_via_clearance_mm, ignore_pad_clearance_mm,
-                                    get_distance_func
-                                )
-                                
-                                if not should_ignore:
-                                    clearance_violation = True
-                                    clearance_pos = check_pos
-                                break
-                    
-                    if clearance_violation:
-                        break
+                # Draw marker at track position (not at clearance check point)
+                track_center_x = (start.x + end.x) // 2
+                track_center_y = (start.y + end.y) // 2
+                track_center = pcbnew.VECTOR2I(track_center_x, track_center_y)
                 
-                if clearance_violation and clearance_pos:
-                    # Create violation marker using centralized utility
-                    violation_group = create_group_func(self.board, "GndPlane", f"{net_name}_clearance", violations+1)
-                    
-                    # Draw marker at track position (not at clearance check point)
-                    track_center_x = (start.x + end.x) // 2
-                    track_center_y = (start.y + end.y) // 2
-                    track_center = pcbnew.VECTOR2I(track_center_x, track_center_y)
-                    
-                    draw_marker_func(self.board, track_center, violation_msg_clearance, self.marker_layer, violation_group)
-                    
-                    # Draw arrow pointing to ground gap
-                    draw_arrow_func(self.board, track_center, clearance_pos, "GND GAP", self.marker_layer, violation_group)
-                    violations += 1
+                draw_marker_func(self.board, track_center, violation_msg_clearance, self.marker_layer, violation_group)
+                
+                # Draw arrow pointing to ground gap
+                draw_arrow_func(self.board, track_center, clearance_pos, "GND GAP", self.marker_layer, violation_group)
+                violations += 1
         
         # Clean up progress dialog
         if progress:
@@ -441,8 +472,8 @@ class GroundPlaneChecker:
         if check_return_vias:
             self.log("\n=== RETURN VIA CONTINUITY CHECK ===", force=True)
             return_via_violations = self._check_return_via_continuity(
-                gnd_patterns, return_via_max_dist_mm,
-                draw_marker_func, create_group_func, get_distance_func
+                vias, is_ground_net, return_via_max_dist_mm,
+                draw_marker_func, create_group_func
             )
             violations += return_via_violations
             self.log(f"✓ Return via check complete: {return_via_violations} violations", force=True)
@@ -459,8 +490,68 @@ class GroundPlaneChecker:
         
         return violations
     
-    def _check_split_plane_crossing(self, track, start, end, num_samples, layers_to_check,
-                                     all_zones_by_layer, gnd_patterns,
+    def _scan_samples(self, samples, continuity_indexes, clearance_indexes, offsets,
+                      gnd_pad_index, gnd_via_index):
+        """
+        Single pass over a track's samples for the continuity and clearance checks.
+        
+        Continuity (PRIORITY 1) stops at the first sample with no ground plane under
+        it; if that point lies within the ignore radius of a GND pad/via (anti-pad,
+        thermal relief), the track is treated as continuous. Clearance stops at the
+        first perpendicular offset point without ground that is not near a GND
+        pad/via; an ignored offset point skips the rest of that sample's offsets.
+        The loop ends as soon as neither check can change its result.
+        
+        Args:
+            samples: list[tuple[int, int]] - sample coordinates from _sample_track_points()
+            continuity_indexes: list | None - _layer_indexes() for the continuity test,
+                None when continuity is not checked
+            clearance_indexes: list - _layer_indexes() covering the offset points
+            offsets: list[tuple[float, float]] - perpendicular offsets, empty when
+                clearance is not checked
+            gnd_pad_index: PointGridIndex - GND pad positions
+            gnd_via_index: PointGridIndex - GND via positions
+        
+        Returns:
+            tuple: (gap, clearance_pos) where gap is (sample index, VECTOR2I) or None
+                and clearance_pos is the VECTOR2I of the clearance gap or None
+        """
+        hit_test = self._hit_test_indexes
+        should_ignore = self._should_ignore_gap_near_ground_connections
+        VECTOR2I = pcbnew.VECTOR2I
+        continuity_open = continuity_indexes is not None
+        clearance_open = bool(offsets)
+        gap = None
+        clearance_pos = None
+        
+        for i, (sample_x, sample_y) in enumerate(samples):
+            # Check if ground plane exists at this point on ANY of the layers to check
+            if continuity_open and hit_test(continuity_indexes, sample_x, sample_y) is None:
+                continuity_open = False
+                sample_pos = VECTOR2I(sample_x, sample_y)
+                # Check if violation is near a via or pad (should be ignored)
+                if not should_ignore(sample_pos, gnd_pad_index, gnd_via_index):
+                    gap = (i, sample_pos)
+            
+            # Check if ground plane exists within clearance zone on any layer
+            if clearance_open:
+                for offset_x, offset_y in offsets:
+                    check_x = int(sample_x + offset_x)
+                    check_y = int(sample_y + offset_y)
+                    if hit_test(clearance_indexes, check_x, check_y) is None:
+                        check_pos = VECTOR2I(check_x, check_y)
+                        if not should_ignore(check_pos, gnd_pad_index, gnd_via_index):
+                            clearance_open = False
+                            clearance_pos = check_pos
+                        break
+            
+            if not (continuity_open or clearance_open):
+                break
+        
+        return gap, clearance_pos
+    
+    def _check_split_plane_crossing(self, track, samples, layers_to_check,
+                                     all_index_by_layer,
                                      draw_marker_func, create_group_func, net_name):
         """
         PRIORITY 2: Detect when a trace crosses from one reference plane to another (split crossing).
@@ -483,12 +574,9 @@ class GroundPlaneChecker:
         
         Args:
             track: PCB_TRACK object
-            start: VECTOR2I start position
-            end: VECTOR2I end position
-            num_samples: int - number of sample points
+            samples: list[tuple[int, int]] - sample coordinates from _sample_track_points()
             layers_to_check: list[int] - layer IDs to check
-            all_zones_by_layer: dict[int, list[ZONE]] - all zones indexed by layer
-            gnd_patterns: list[str] - ground net patterns (uppercase)
+            all_index_by_layer: dict[int, ZoneGridIndex] - spatial index of all zones per layer
             draw_marker_func: Function to draw violation markers
             create_group_func: Function to create PCB groups
             net_name: str - signal net name
@@ -498,51 +586,148 @@ class GroundPlaneChecker:
         """
         violations = 0
         prev_zone_net = None  # Track which zone we were over in previous sample
-        prev_sample_pos = None
         split_msg = self.config.get('violation_message_split_crossing', 'SPLIT PLANE CROSSING')
+        net_upper = self.net_upper
+        layer_indexes = self._layer_indexes(all_index_by_layer, layers_to_check,
+                                            self._samples_bbox(samples))
+        if not layer_indexes:
+            return 0  # No zone under the track on these layers, so nothing to cross
         
-        for i in range(num_samples + 1):
-            t = i / num_samples
-            sample_x = int(start.x + (end.x - start.x) * t)
-            sample_y = int(start.y + (end.y - start.y) * t)
-            sample_pos = pcbnew.VECTOR2I(sample_x, sample_y)
-            
+        for sample_x, sample_y in samples:
             # Find which zone(s) this point is over (dynamic discovery)
-            current_zone_net = None
-            current_zone_obj = None
-            
-            for check_layer in layers_to_check:
-                for zone in all_zones_by_layer.get(check_layer, []):
-                    if zone.HitTestFilledArea(check_layer, sample_pos):
-                        current_zone_net = zone.GetNetname().upper()
-                        current_zone_obj = zone
-                        break
-                if current_zone_net:
-                    break
+            current_zone_obj = self._hit_test_indexes(layer_indexes, sample_x, sample_y)
+            current_zone_net = net_upper[current_zone_obj.GetNetname()] if current_zone_obj else None
             
             # Check for split crossing
             if prev_zone_net is not None and current_zone_net is not None:
                 if prev_zone_net != current_zone_net:
                     # Trace crossed from one reference plane to another!
-                    self.log(f"    ❌ SPLIT CROSSING: {prev_zone_net} → {current_zone_net}")
-                    self.log(f"       Position: ({pcbnew.ToMM(sample_x):.2f}, {pcbnew.ToMM(sample_y):.2f}) mm")
+                    if self.verbose:
+                        mm_per_iu = self.mm_per_iu
+                        self.log(f"    ❌ SPLIT CROSSING: {prev_zone_net} → {current_zone_net}")
+                        self.log(f"       Position: ({sample_x * mm_per_iu:.2f}, {sample_y * mm_per_iu:.2f}) mm")
                     
                     # Create violation marker
                     violation_group = create_group_func(self.board, "GndPlaneSplit", net_name, violations+1)
                     
                     # Draw marker at crossing point
                     msg = f"{split_msg}: {prev_zone_net}→{current_zone_net}"
-                    draw_marker_func(self.board, sample_pos, msg, self.marker_layer, violation_group)
+                    draw_marker_func(self.board, pcbnew.VECTOR2I(sample_x, sample_y), msg,
+                                     self.marker_layer, violation_group)
                     violations += 1
             
             # Update tracking
             prev_zone_net = current_zone_net
-            prev_sample_pos = sample_pos
         
         return violations
     
-    def _check_return_via_continuity(self, gnd_patterns, max_distance_mm,
-                                     draw_marker_func, create_group_func, get_distance_func):
+    def _partition_tracks(self):
+        """
+        Split board.GetTracks() into (traces, vias) with one type test per item.
+        
+        PCB_VIA (and PCB_ARC) subclass PCB_TRACK, so the via test comes first;
+        everything else that is a PCB_TRACK is a trace.
+        
+        Returns:
+            tuple[list, list]: (traces, vias)
+        """
+        PCB_VIA = pcbnew.PCB_VIA
+        PCB_TRACK = pcbnew.PCB_TRACK
+        traces = []
+        vias = []
+        for item in self.board.GetTracks():
+            if isinstance(item, PCB_VIA):
+                vias.append(item)
+            elif isinstance(item, PCB_TRACK):
+                traces.append(item)
+        return traces, vias
+    
+    @staticmethod
+    def _sample_track_points(start, end, num_samples):
+        """
+        Compute the sample coordinates along a track segment once.
+        
+        The continuity, split-crossing and clearance checks all walk the same
+        num_samples + 1 evenly spaced points (both endpoints included), so the
+        interpolation is done here and the resulting list is shared.
+        
+        Args:
+            start: VECTOR2I start position
+            end: VECTOR2I end position
+            num_samples: int - number of sample intervals (>= 1)
+        
+        Returns:
+            list[tuple[int, int]]: (x, y) sample coordinates in internal units
+        """
+        start_x, start_y = start.x, start.y
+        dx = end.x - start_x
+        dy = end.y - start_y
+        # Each parameter t = i / num_samples is computed once and shared by x and y
+        # (bit-identical to dividing per coordinate)
+        return [(int(start_x + dx * t), int(start_y + dy * t))
+                for t in [i / num_samples for i in range(num_samples + 1)]]
+    
+    @staticmethod
+    def _layer_indexes(index_by_layer, layers_to_check, bbox=None):
+        """
+        Resolve layers_to_check to [(layer, ZoneGridIndex), ...] once per track.
+        
+        Layers without zones are dropped, as are layers none of whose zones
+        overlaps bbox (the box spanned by the points about to be tested), so an
+        empty result means no point can hit a zone.
+        
+        Args:
+            index_by_layer: dict[int, ZoneGridIndex] - zone index per layer
+            layers_to_check: list[int] - layer IDs, in order
+            bbox: tuple | None - (left, top, right, bottom) of the points to test
+        """
+        layer_indexes = [(layer, index_by_layer[layer]) for layer in layers_to_check
+                         if layer in index_by_layer]
+        if bbox is not None:
+            layer_indexes = [(layer, index) for layer, index in layer_indexes if index.overlaps(*bbox)]
+        return layer_indexes
+    
+    @staticmethod
+    def _samples_bbox(samples, margin=0):
+        """(left, top, right, bottom) of straight-track samples, grown by margin"""
+        (x1, y1), (x2, y2) = samples[0], samples[-1]
+        return (min(x1, x2) - margin, min(y1, y2) - margin,
+                max(x1, x2) + margin, max(y1, y2) + margin)
+    
+    def _hit_test_indexes(self, layer_indexes, x, y):
+        """
+        Return the first filled zone containing (x, y), or None.
+        
+        Polygon hit-test results are memoized per (zone, layer, point) for the
+        duration of the check: the continuity and split-crossing passes test the
+        same sample points (ground zones are a subset of all zones), and tracks
+        sharing an endpoint sample it twice. The VECTOR2I needed by
+        HitTestFilledArea() is only built on a cache miss for a bbox candidate.
+        
+        Args:
+            layer_indexes: list[tuple[int, ZoneGridIndex]] - from _layer_indexes(), in order
+            x, y: int - sample coordinates
+        """
+        hit_cache = self.zone_hit_cache
+        pos = None
+        for check_layer, index in layer_indexes:
+            # Only zones whose bounding box contains the point need a real hit test
+            # (the index.query() candidates, without building a list per sample)
+            for left, top, right, bottom, zone in index.bucket(x, y):
+                if not (left <= x <= right and top <= y <= bottom):
+                    continue
+                key = (id(zone), check_layer, x, y)
+                hit = hit_cache.get(key)
+                if hit is None:
+                    if pos is None:
+                        pos = pcbnew.VECTOR2I(x, y)
+                    hit = hit_cache[key] = zone.HitTestFilledArea(check_layer, pos)
+                if hit:
+                    return zone
+        return None
+    
+    def _check_return_via_continuity(self, vias, is_ground_net, max_distance_mm,
+                                     draw_marker_func, create_group_func):
         """
         PRIORITY 3: Check that signal vias changing layers have nearby ground vias.
         
@@ -561,11 +746,11 @@ class GroundPlaneChecker:
         3. Flag violation if distance > max_distance_mm
         
         Args:
-            gnd_patterns: list[str] - ground net patterns (uppercase)
+            vias: list[PCB_VIA] - all vias on the board (from _partition_tracks)
+            is_ground_net: callable - matcher from compile_substring_matcher() over uppercase ground patterns
             max_distance_mm: float - maximum allowed distance
             draw_marker_func: Function to draw violation markers
             create_group_func: Function to create PCB groups
-            get_distance_func: Function to calculate distance
         
         Returns:
             int: Number of violations found
@@ -578,15 +763,12 @@ class GroundPlaneChecker:
         signal_vias = []
         ground_vias = []
         
-        for track in self.board.GetTracks():
-            if isinstance(track, pcbnew.PCB_VIA):
-                via_net = track.GetNetname().upper()
-                is_ground = any(gnd in via_net for gnd in gnd_patterns)
-                
-                if is_ground:
-                    ground_vias.append(track)
-                else:
-                    signal_vias.append(track)
+        for via in vias:
+            via_net = self.net_upper[via.GetNetname()]
+            if is_ground_net(via_net):
+                ground_vias.append(via)
+            else:
+                signal_vias.append(via)
         
         self.log(f"Found {len(signal_vias)} signal vias, {len(ground_vias)} ground vias")
         
@@ -594,26 +776,24 @@ class GroundPlaneChecker:
             self.log("⚠️  No ground vias found - skipping return via check")
             return 0
         
+        # Ground via positions read once; distances are compared squared (integer
+        # math) and only the nearest one is square-rooted for the report
+        ground_via_positions = [gnd_via.GetPosition() for gnd_via in ground_vias]
+        max_distance_sq = max_distance * max_distance
+        
         # Check each signal via for nearby ground via
         for via in signal_vias:
             via_pos = via.GetPosition()
             via_net = via.GetNetname()
             
             # Find nearest ground via
-            min_dist = float('inf')
-            nearest_gnd_via = None
-            
-            for gnd_via in ground_vias:
-                gnd_pos = gnd_via.GetPosition()
-                dist = get_distance_func(via_pos, gnd_pos)
-                
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest_gnd_via = gnd_via
+            min_dist_sq = min(self.get_distance_sq(via_pos, gnd_pos) for gnd_pos in ground_via_positions)
+            min_dist = math.sqrt(min_dist_sq)
             
             # Check if violation
-            if min_dist > max_distance:
-                self.log(f"    ❌ Via on '{via_net}' has no return via within {max_distance_mm}mm (nearest: {pcbnew.ToMM(min_dist):.2f}mm)")
+            if min_dist_sq > max_distance_sq:
+                if self.verbose:
+                    self.log(f"    ❌ Via on '{via_net}' has no return via within {max_distance_mm}mm (nearest: {pcbnew.ToMM(min_dist):.2f}mm)")
                 
                 # Create violation marker
                 violation_group = create_group_func(self.board, "ReturnVia", via_net, violations+1)
@@ -621,8 +801,8 @@ class GroundPlaneChecker:
                 msg = f"{violation_msg}: {pcbnew.ToMM(min_dist):.1f}mm"
                 draw_marker_func(self.board, via_pos, msg, self.marker_layer, violation_group)
                 violations += 1
-            else:
-                self.log(f"    ✓ Via on '{via_net}' OK (return via {pcbnew.ToMM(min_dist):.2f}mm away)")
+            elif self.verbose:
+                self.log(f"    ✓ Via on '{via_net}' OK (return via {min_dist * self.mm_per_iu:.2f}mm away)")
         
         return violations
     
@@ -667,7 +847,8 @@ class GroundPlaneChecker:
             zone_area = zone.GetFilledArea()  # Internal units squared
             zone_area_mm2 = (pcbnew.ToMM(1) ** 2) * zone_area  # Convert to mm²
             total_gnd_area_mm2 += zone_area_mm2
-            self.log(f"  Zone '{zone.GetNetname()}' on layer {zone.GetLayer()}: {zone_area_mm2:.1f} mm²")
+            if self.verbose:
+                self.log(f"  Zone '{zone.GetNetname()}' on layer {zone.GetLayer()}: {zone_area_mm2:.1f} mm²")
         
         self.log(f"Total ground area: {total_gnd_area_mm2:.1f} mm²")
         
@@ -694,10 +875,50 @@ class GroundPlaneChecker:
         
         return violations
     
-    def _should_ignore_gap_near_ground_connections(self, pos, gnd_patterns, 
-                                                    via_clearance_radius, pad_clearance_radius,
-                                                    ignore_via_clearance_mm, ignore_pad_clearance_mm,
-                                                    get_distance_func):
+    def _collect_ground_connections(self, vias, is_ground_net, include_pads=True, include_vias=True):
+        """
+        Collect the positions of ground pads and ground vias once per check.
+        
+        Args:
+            vias: list[PCB_VIA] - all vias on the board (from _partition_tracks)
+            is_ground_net: callable - Matcher over uppercase ground net patterns
+            include_pads: bool - Collect pads (False when ignore_pad_clearance is 0)
+            include_vias: bool - Collect vias (False when ignore_via_clearance is 0)
+        
+        Returns:
+            tuple[list, list]: ([(x, y), ...] of GND pads, [(x, y), ...] of GND vias)
+        """
+        net_upper = self.net_upper
+        gnd_pad_xy = []
+        gnd_via_xy = []
+        
+        # Classify each distinct net once; boards have far more pads than nets
+        ground_by_net = {}
+        
+        def is_ground(net_name):
+            is_gnd = ground_by_net.get(net_name)
+            if is_gnd is None:
+                is_gnd = ground_by_net[net_name] = bool(is_ground_net(net_upper[net_name]))
+            return is_gnd
+        
+        if include_pads:
+            for footprint in self.board.GetFootprints():
+                for pad in footprint.Pads():
+                    if is_ground(pad.GetNetname()):
+                        pad_pos = pad.GetPosition()
+                        gnd_pad_xy.append((pad_pos.x, pad_pos.y))
+        
+        if include_vias:
+            for via in vias:
+                if is_ground(via.GetNetname()):
+                    via_pos = via.GetPosition()
+                    gnd_via_xy.append((via_pos.x, via_pos.y))
+        
+        self.log(f"Ground connections for gap ignore: {len(gnd_pad_xy)} pads, {len(gnd_via_xy)} vias "
+                 f"({sum(ground_by_net.values())} GND nets)")
+        return gnd_pad_xy, gnd_via_xy
+    
+    def _should_ignore_gap_near_ground_connections(self, pos, gnd_pad_index, gnd_via_index):
         """
         Check if a gap should be ignored because it's near a ground via or pad.
         
@@ -706,45 +927,26 @@ class GroundPlaneChecker:
         
         Args:
             pos: VECTOR2I position to check
-            gnd_patterns: list[str] - Ground net name patterns (uppercase)
-            via_clearance_radius: int - Clearance radius around vias (in KiCad units)
-            pad_clearance_radius: int - Clearance radius around pads (in KiCad units)
-            ignore_via_clearance_mm: float - User config value (0 = disabled)
-            ignore_pad_clearance_mm: float - User config value (0 = disabled)
-            get_distance_func: Injected distance calculation function
+            gnd_pad_index: PointGridIndex - GND pad positions, radius = pad ignore clearance
+            gnd_via_index: PointGridIndex - GND via positions, radius = via ignore clearance
         
         Returns:
             bool: True if gap should be ignored, False otherwise
         """
-        if ignore_via_clearance_mm <= 0 and ignore_pad_clearance_mm <= 0:
-            return False
+        x = pos.x
+        y = pos.y
         
         # Check pads
-        if ignore_pad_clearance_mm > 0:
-            for footprint in self.board.GetFootprints():
-                for pad in footprint.Pads():
-                    pad_pos = pad.GetPosition()
-                    dist_to_pad = get_distance_func(pos, pad_pos)
-                    
-                    # Ignore if near ground pad
-                    if dist_to_pad < pad_clearance_radius:
-                        pad_net = pad.GetNetname().upper()
-                        if any(gnd in pad_net for gnd in gnd_patterns):
-                            self.log(f"    ⚠️  Gap near GND pad, ignoring")
-                            return True
+        if gnd_pad_index.any_within(x, y):
+            if self.verbose:
+                self.log("    ⚠️  Gap near GND pad, ignoring")
+            return True
         
         # Check vias
-        if ignore_via_clearance_mm > 0:
-            for via_track in self.board.GetTracks():
-                if isinstance(via_track, pcbnew.PCB_VIA):
-                    via_pos = via_track.GetPosition()
-                    dist_to_via = get_distance_func(pos, via_pos)
-                    
-                    if dist_to_via < via_clearance_radius:
-                        via_net = via_track.GetNetname().upper()
-                        if any(gnd in via_net for gnd in gnd_patterns):
-                            self.log(f"    ⚠️  Gap near GND via, ignoring")
-                            return True
+        if gnd_via_index.any_within(x, y):
+            if self.verbose:
+                self.log("    ⚠️  Gap near GND via, ignoring")
+            return True
         
         return False
     
@@ -0,0 +1,69 @@
+"""
+Net Name Matching Helpers
+Part of EMC Auditor Plugin for KiCad
+
+Shared by the checker modules to match net names against the substring
+patterns configured in emc_rules.toml (ground_net_patterns, power_patterns,
+critical net classes, ...).
+
+Author: EMC Auditor Team
+License: MIT (see LICENSE file in repository)
+"""
+
+import re
+
+
+def compile_substring_matcher(patterns):
+    """
+    Build a single-pass equivalent of ``any(p in text for p in patterns)``.
+
+    The patterns are escaped and joined into one alternation so each string is
+    scanned once instead of once per pattern. Matching is case-sensitive; callers
+    uppercase both sides where needed, as before.
+
+    Args:
+        patterns: list[str] - substrings to look for
+
+    Returns:
+        callable: match(text) -> truthy match object, or None when no pattern occurs
+    """
+    if not patterns:
+        return lambda text: None  # any() over an empty list is False
+    return re.compile('|'.join(re.escape(p) for p in patterns)).search
+
+
+class UpperCaseCache(dict):
+    """
+    name -> name.upper(), computed once per distinct name.
+
+    Net names are matched case-insensitively against the (uppercase) ground
+    patterns; the same few nets recur on every zone, via, pad and sample.
+    """
+
+    def __missing__(self, name):
+        upper = self[name] = name.upper()
+        return upper
+
+
+def net_pattern_matcher(patterns):
+    """
+    Build is_match(net_name) for ``any(p.upper() in net_name.upper() for p in patterns)``.
+
+    Wraps compile_substring_matcher() over the uppercased patterns in a memo
+    per net name: the same few nets recur on every zone and track.
+
+    Args:
+        patterns: list[str] - net name substrings (case-insensitive)
+
+    Returns:
+        callable: net_name -> bool
+    """
+    search = compile_substring_matcher([p.upper() for p in patterns])
+    matches = {}
+
+    def is_match(net_name):
+        hit = matches.get(net_name)
+        if hit is None:
+            hit = matches[net_name] = search(net_name.upper()) is not None
+        return hit
+    return is_match
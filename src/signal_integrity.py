@@ -189,6 +189,9 @@ Last Updated: 2026-05-15
 """
 
 import pcbnew
+import math
+
+from net_matching import net_pattern_matcher
 
 
 class SignalIntegrityChecker:
@@ -235,12 +238,14 @@ class SignalIntegrityChecker:
         self.draw_marker = None
         self.draw_arrow = None
         self.get_distance = None
+        self.get_distance_sq = None
         self.log = None
         
         # Results tracking
         self.violation_count = 0
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Main entry point - performs signal integrity verification.
         
@@ -253,6 +258,8 @@ class SignalIntegrityChecker:
             get_distance_func: Function(pos1, pos2) returns distance
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function(pos1, pos2) returns squared distance
+                (used for threshold comparisons, no sqrt)
         
         Returns:
             int: Number of violations found
@@ -262,6 +269,7 @@ class SignalIntegrityChecker:
         self.draw_marker = draw_marker_func
         self.draw_arrow = draw_arrow_func
         self.get_distance = get_distance_func
+        self.get_distance_sq = get_distance_sq_func
         self.create_group = create_group_func
         
         self.log("\n=== SIGNAL INTEGRITY CHECK START ===", force=True)
@@ -325,10 +333,11 @@ class SignalIntegrityChecker:
         # Build zone map: layer_id → list of SHAPE_POLY_SET outlines for reference planes
         # Reference planes are zones whose net is GND-like or a power plane
         gnd_patterns = plane_edge_cfg.get('reference_plane_patterns', ['GND', 'PWR', 'VCC', 'VDD', 'POWER', 'AGND', 'DGND', 'PGND'])
+        is_reference_net = net_pattern_matcher(gnd_patterns)
         zone_outlines = {}  # layer_id → list of SHAPE_POLY_SET
         for zone in self.board.Zones():
             net_name = zone.GetNetname()
-            if not any(p.upper() in net_name.upper() for p in gnd_patterns):
+            if not is_reference_net(net_name):
                 continue
             layer_id = zone.GetLayer()
             outline = zone.Outline()
@@ -634,6 +643,8 @@ class SignalIntegrityChecker:
         max_stitch_dist_mm = crossing_cfg.get('max_stitching_distance_mm', 1.0)
         exempt_pairs = crossing_cfg.get('exempt_plane_pairs', [])
         max_stitch_dist_iu = pcbnew.FromMM(max_stitch_dist_mm)
+        # Compared squared; a negative limit accepts no via
+        max_stitch_dist_sq = max_stitch_dist_iu * max_stitch_dist_iu if max_stitch_dist_iu >= 0 else -1
         
         self.log(f"  Max stitching via distance: {max_stitch_dist_mm:.1f}mm")
         self.log(f"  Critical net classes: {critical_classes}")
@@ -667,19 +678,14 @@ class SignalIntegrityChecker:
         
         self.log(f"  Found reference planes on {len(layer_plane_nets)} layer(s)")
         
-        # Collect all vias (needed for stitching via search)
-        all_vias = []
-        for track in self.board.GetTracks():
-            if isinstance(track, pcbnew.PCB_VIA):
-                all_vias.append(track)
+        # Collect all vias once: the candidate loop and the stitching via search share it
+        PCB_VIA = pcbnew.PCB_VIA
+        all_vias = [track for track in self.board.GetTracks() if isinstance(track, PCB_VIA)]
         
         violations = 0
         
         # Check each via on critical nets
-        for track in self.board.GetTracks():
-            if not isinstance(track, pcbnew.PCB_VIA):
-                continue
-            
+        for track in all_vias:
             net = track.GetNet()
             if not net:
                 continue
@@ -750,9 +756,9 @@ class SignalIntegrityChecker:
                 
                 # Check distance
                 other_pos = other_via.GetPosition()
-                dist = self.get_distance(via_pos, other_pos)
+                dist_sq = self.get_distance_sq(via_pos, other_pos)
                 
-                if dist <= max_stitch_dist_iu:
+                if dist_sq <= max_stitch_dist_sq:
                     stitch_found = True
                     break
             
@@ -1347,9 +1353,10 @@ class SignalIntegrityChecker:
         # plane RULE AREA (not just where fill copper happens to exist after clearances).
         # This is the correct semantic: "is there a defined reference plane above/below this trace?"
         zone_polys = {}  # layer_id → list of (ZONE, outline_poly)
+        is_reference_net = net_pattern_matcher(gnd_patterns)
         for zone in self.board.Zones():
             net_name = zone.GetNetname()
-            if not any(p.upper() in net_name.upper() for p in gnd_patterns):
+            if not is_reference_net(net_name):
                 continue
             layer_id = zone.GetLayer()
             try:
@@ -1519,11 +1526,14 @@ class SignalIntegrityChecker:
 
         self.log(f"  Internal layers: {[self.board.GetLayerName(l) for l in internal_layers]}")
 
-        # Build set of (layer_id, grid_x, grid_y) for all track endpoints (non-via tracks)
+        # Build set of (layer_id, grid_x, grid_y) for all track endpoints (non-via tracks);
+        # the same pass sets the vias aside for the per-via loop below
         SNAP = pcbnew.FromMM(0.01)  # 10 µm snap tolerance
         track_points = set()
+        vias = []
         for track in self.board.GetTracks():
             if track.GetClass() in ('PCB_VIA', 'VIA'):
+                vias.append(track)
                 continue
             layer_id = track.GetLayer()
             for pt in (track.GetStart(), track.GetEnd()):
@@ -1541,10 +1551,7 @@ class SignalIntegrityChecker:
         violations = 0
         via_checked = 0
 
-        for track in self.board.GetTracks():
-            if track.GetClass() not in ('PCB_VIA', 'VIA'):
-                continue
-
+        for track in vias:
             net = track.GetNet()
             if not net:
                 continue
@@ -1659,6 +1666,7 @@ class SignalIntegrityChecker:
         gnd_patterns = iso_cfg.get(
             'ground_net_patterns', ['GND', 'AGND', 'DGND', 'PGND', 'CHASSIS', 'PE']
         )
+        is_ground_net = net_pattern_matcher(gnd_patterns)
 
         # Collect all critical net tracks and all other tracks per layer for fast lookup
         # Build: layer → list of (xmin, ymin, xmax, ymax, track) for non-critical nets
@@ -1697,6 +1705,7 @@ class SignalIntegrityChecker:
             # Required isolation: max(configured min, 3W rule)
             required_mm = max(min_isolation_mm, three_w_multiplier * crit_width_mm)
             required_iu = pcbnew.FromMM(required_mm)
+            required_sq = required_iu * required_iu if required_iu > 0 else 0  # Compared squared
 
             crit_mid = crit_track.GetCenter()
 
@@ -1705,7 +1714,7 @@ class SignalIntegrityChecker:
                 if not other_net:
                     continue
                 # Skip if it's a ground guard trace (that's the desired protection)
-                if any(p.upper() in other_net.upper() for p in gnd_patterns):
+                if is_ground_net(other_net):
                     continue
                 # Skip same net fragments
                 if other_net == crit_net:
@@ -1719,15 +1728,15 @@ class SignalIntegrityChecker:
                 if bbox_gap_x > required_iu * 2 or bbox_gap_y > required_iu * 2:
                     continue
 
-                dist_iu = self.get_distance(crit_track.GetCenter(), other.GetCenter())
-                if dist_iu < required_iu:
+                dist_sq = self.get_distance_sq(crit_mid, other.GetCenter())
+                if dist_sq < required_sq:
                     pair_key = (crit_net, other_net)
                     rev_key = (other_net, crit_net)
                     if pair_key not in violation_set and rev_key not in violation_set:
                         violation_set.add(pair_key)
                         violations += 1
                         net_class = self._resolve_net_class(crit_net)
-                        actual_mm = pcbnew.ToMM(dist_iu)
+                        actual_mm = pcbnew.ToMM(math.sqrt(dist_sq))
                         safe_name = crit_net.replace('/', '_').replace('(', '').replace(')', '')
                         group = self.create_group(self.board, "IsolationSE", safe_name, violations)
                         msg = f"ISOLATION VIOLATION (SE)\n{crit_net} ↔ {other_net}\n{actual_mm:.2f}mm < {required_mm:.2f}mm"
@@ -1792,6 +1801,7 @@ class SignalIntegrityChecker:
             'ground_net_patterns',
             ['GND', 'AGND', 'DGND', 'PGND', 'CHASSIS', 'PE']
         )
+        is_ground_net = net_pattern_matcher(gnd_patterns)
         
         # Identify differential pairs
         pairs = self._identify_differential_pairs()
@@ -1845,6 +1855,7 @@ class SignalIntegrityChecker:
         
         violations = 0
         violation_set = set()  # (dp_net, aggressor_net) pairs already reported
+        partner_max_sq = pcbnew.FromMM(5.0) ** 2  # Partner search radius, squared
         
         # Check each differential pair track
         for dp_track, dp_net, partner_net in dp_tracks:
@@ -1855,6 +1866,7 @@ class SignalIntegrityChecker:
             # Required isolation on outer edges
             required_mm = max(min_isolation_mm, outer_edge_mult * dp_width_mm)
             required_iu = pcbnew.FromMM(required_mm)
+            required_sq = required_iu * required_iu if required_iu > 0 else 0  # Compared squared
             
             # Find partner track on same layer (if exists)
             partner_track = None
@@ -1867,10 +1879,10 @@ class SignalIntegrityChecker:
                 if other_net.GetNetname() == partner_net:
                     # Check if this is close to current track (same pair segment)
                     other_center = other_track.GetCenter()
-                    dist = self.get_distance(dp_center, other_center)
+                    dist_sq = self.get_distance_sq(dp_center, other_center)
                     
                     # Partner should be within reasonable distance (5mm)
-                    if dist < pcbnew.FromMM(5.0):
+                    if dist_sq < partner_max_sq:
                         partner_track = other_track
                         partner_center = other_center
                         break
@@ -1893,14 +1905,14 @@ class SignalIntegrityChecker:
                     continue
                 
                 # Skip ground nets (desired guard traces)
-                if any(p.upper() in other_net_name.upper() for p in gnd_patterns):
+                if is_ground_net(other_net_name):
                     continue
                 
                 # Measure distance
                 other_center = other_track.GetCenter()
-                dist_iu = self.get_distance(dp_center, other_center)
+                dist_sq = self.get_distance_sq(dp_center, other_center)
                 
-                if dist_iu < required_iu:
+                if dist_sq < required_sq:
                     # Potential violation - but check if it's on the outer edge
                     # If we have a partner, verify the aggressor is NOT between us and partner
                     if partner_center is not None:
@@ -1920,12 +1932,13 @@ class SignalIntegrityChecker:
                         dot_product = (to_partner_x * to_aggressor_x +
                                       to_partner_y * to_aggressor_y)
                         
-                        partner_dist = self.get_distance(dp_center, partner_center)
-                        aggressor_dist = dist_iu
+                        # (squared distances compare the same way)
+                        partner_dist_sq = self.get_distance_sq(dp_center, partner_center)
+                        aggressor_dist_sq = dist_sq
                         
                         # If aggressor is in same direction as partner and closer,
                         # it might be between them (inner edge) - be conservative
-                        if dot_product > 0 and aggressor_dist < partner_dist:
+                        if dot_product > 0 and aggressor_dist_sq < partner_dist_sq:
                             # Aggressor on same side as partner, likely inner edge
                             # Skip this (controlled by impedance requirements)
                             continue
@@ -1938,7 +1951,7 @@ class SignalIntegrityChecker:
                         violation_set.add(pair_key)
                         violations += 1
                         
-                        actual_mm = pcbnew.ToMM(dist_iu)
+                        actual_mm = pcbnew.ToMM(math.sqrt(dist_sq))
                         safe_name = dp_net.replace('/', '_').replace('(', '').replace(')', '')
                         group = self.create_group(self.board, "IsolationDP", safe_name, violations)
                         
@@ -2768,7 +2781,7 @@ class SignalIntegrityChecker:
                     seg_mid = track.GetCenter()
                     closest_partner = min(
                         partner_tracks,
-                        key=lambda t: self.get_distance(seg_mid, t.GetCenter())
+                        key=lambda t: self.get_distance_sq(seg_mid, t.GetCenter())
                     )
                     center_dist_mm = pcbnew.ToMM(
                         self.get_distance(seg_mid, closest_partner.GetCenter())
@@ -4244,10 +4257,11 @@ class SignalIntegrityChecker:
             # Place on User.Comments layer
             highlight.SetLayer(self.marker_layer)
             
-            # Add to board and group
-            self.board.Add(highlight)
+            # Add to board and group (through the plugin, so the group counts as non-empty)
             if group:
-                group.AddItem(highlight)
+                self.auditor.add_to_violation_group(self.board, group, highlight)
+            else:
+                self.board.Add(highlight)
                 
         except Exception as e:
             # Don't fail the whole check if highlighting fails
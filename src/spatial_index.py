@@ -0,0 +1,164 @@
+"""
+Spatial Index Helpers
+Part of EMC Auditor Plugin for KiCad
+
+Uniform-grid indexes shared by the checkers and the marker code in
+emc_auditor_plugin.py: zone bounding boxes per layer (ZoneGridIndex) and
+fixed-radius point queries (PointGridIndex).
+
+Author: EMC Auditor Team
+License: MIT (see LICENSE file in repository)
+"""
+
+
+def zone_bounds(zone):
+    """Return a zone's bounding box as a plain (left, top, right, bottom) tuple"""
+    bbox = zone.GetBoundingBox()
+    return (bbox.GetLeft(), bbox.GetTop(), bbox.GetRight(), bbox.GetBottom())
+
+
+class ZoneGridIndex:
+    """
+    Uniform-grid spatial index over the zone bounding boxes of one copper layer.
+    
+    Built once per check; query(x, y) returns only the zones whose bounding box
+    contains the point, so KiCad's comparatively expensive HitTestFilledArea()
+    runs on those candidates instead of on every zone of the layer. Candidates
+    keep the original zone order (first-hit semantics are unchanged).
+    
+    Pure Python on purpose: KiCad's bundled interpreter ships without
+    shapely/rtree, and the number of zones per layer is small.
+    """
+    
+    def __init__(self, zones, cells_per_axis=16, bounds=None):
+        """
+        Args:
+            zones: list[ZONE] - zones on a single layer
+            cells_per_axis: int - grid resolution along the longer side of the zones' extent
+            bounds: list[tuple] - optional (left, top, right, bottom) per zone, already
+                read by the caller; fetched from GetBoundingBox() when omitted
+        """
+        self.zones = list(zones)
+        if bounds is None:
+            bounds = [zone_bounds(zone) for zone in self.zones]
+        self.entries = [(*aabb, zone) for aabb, zone in zip(bounds, self.zones)]  # (left, top, right, bottom, zone)
+        
+        self.cells = {}
+        if not self.entries:
+            self.min_x = self.min_y = 0
+            self.cell_size = 1
+            return
+        
+        self.min_x = min(e[0] for e in self.entries)
+        self.min_y = min(e[1] for e in self.entries)
+        span = max(max(e[2] for e in self.entries) - self.min_x,
+                   max(e[3] for e in self.entries) - self.min_y, 1)
+        self.cell_size = max(1, -(-span // cells_per_axis))  # ceil division
+        
+        for entry in self.entries:
+            cx1, cy1 = self._cell(entry[0], entry[1])
+            cx2, cy2 = self._cell(entry[2], entry[3])
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    self.cells.setdefault((cx, cy), []).append(entry)
+    
+    def _cell(self, x, y):
+        return ((x - self.min_x) // self.cell_size, (y - self.min_y) // self.cell_size)
+    
+    def bucket(self, x, y):
+        """Return the (left, top, right, bottom, zone) entries of the cell holding (x, y)
+        
+        Unfiltered and in original zone order; callers test the bounding box
+        themselves (see query). Empty tuple for an empty cell.
+        """
+        return self.cells.get(self._cell(x, y), ())
+    
+    def query(self, x, y):
+        """Return zones whose bounding box contains (x, y), in original zone order"""
+        return [e[4] for e in self.bucket(x, y) if e[0] <= x <= e[2] and e[1] <= y <= e[3]]
+    
+    def overlaps(self, left, top, right, bottom):
+        """True if any zone's bounding box intersects the given box"""
+        return any(e[0] <= right and left <= e[2] and e[1] <= bottom and top <= e[3]
+                   for e in self.entries)
+
+
+class PointGridIndex:
+    """
+    Spatial hash over 2D points for fixed-radius queries.
+    
+    Points are bucketed into square cells whose side equals the query radius,
+    so every point within the radius lies in the 3x3 cells around the query
+    point. A query costs O(points in those cells) instead of O(N).
+    
+    Each point may carry a payload (the via, the queued marker, ...) and keeps
+    its insertion order, so first_within() returns the same point a linear
+    scan in insertion order would. Points can be added after construction.
+    
+    Pure Python stand-in for a KD-tree (scipy is not bundled with KiCad).
+    """
+    
+    def __init__(self, points, radius):
+        """
+        Args:
+            points: iterable of (x, y) or (x, y, payload) tuples in KiCad internal units
+            radius: int - query radius in internal units (< 0: never matches)
+        """
+        self.radius = radius
+        self.radius_sq = radius * radius if radius >= 0 else -1
+        self.cell_size = max(1, radius)
+        self.count = 0
+        self.cells = {}
+        if radius < 0:
+            return
+        for point in points:
+            self.add(*point)
+    
+    def add(self, x, y, payload=None):
+        """Index point (x, y) with an optional payload (ignored when radius < 0)"""
+        if self.radius < 0:
+            return
+        cell_size = self.cell_size
+        self.cells.setdefault((x // cell_size, y // cell_size), []).append((self.count, x, y, payload))
+        self.count += 1
+    
+    def _candidates(self, x, y):
+        """Return the (order, x, y, payload) lists of the 3x3 cells around (x, y)"""
+        cells = self.cells
+        cell_size = self.cell_size
+        cell_x = x // cell_size
+        cell_y = y // cell_size
+        return [cells[key] for key in ((nx, ny) for nx in (cell_x - 1, cell_x, cell_x + 1)
+                                       for ny in (cell_y - 1, cell_y, cell_y + 1))
+                if key in cells]
+    
+    def any_within(self, x, y):
+        """True if any indexed point lies strictly closer than radius to (x, y)"""
+        if not self.cells:
+            return False
+        radius_sq = self.radius_sq
+        for bucket in self._candidates(x, y):
+            for _, px, py, _ in bucket:
+                dx = px - x
+                dy = py - y
+                if dx * dx + dy * dy < radius_sq:
+                    return True
+        return False
+    
+    def first_within(self, x, y):
+        """
+        Return (payload, dist_sq) of the earliest-added point within radius of (x, y).
+        
+        The radius is inclusive here (distance limits such as max_distance_mm),
+        unlike any_within(). None when no point qualifies.
+        """
+        radius_sq = self.radius_sq
+        found = None
+        for bucket in self._candidates(x, y):
+            for order, px, py, payload in bucket:
+                dx = px - x
+                dy = py - y
+                dist_sq = dx * dx + dy * dy
+                if dist_sq <= radius_sq and (found is None or order < found[0]):
+                    found = (order, payload, dist_sq)
+        return found[1:] if found is not None else None
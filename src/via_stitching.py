@@ -11,6 +11,10 @@ Last Updated: 2026-02-12
 """
 
 import pcbnew
+import math
+
+from net_matching import compile_substring_matcher
+from spatial_index import PointGridIndex
 
 
 class ViaStitchingChecker:
@@ -49,11 +53,13 @@ class ViaStitchingChecker:
         self.draw_marker = None
         self.draw_arrow = None
         self.get_distance = None
+        self.get_distance_sq = None
         
         # Results tracking
         self.violation_count = 0
     
-    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func):
+    def check(self, draw_marker_func, draw_arrow_func, get_distance_func, log_func, create_group_func,
+              get_distance_sq_func):
         """
         Main entry point - performs via stitching verification.
         
@@ -66,6 +72,8 @@ class ViaStitchingChecker:
             get_distance_func: Function(pos1, pos2) returns distance
             log_func: Function(msg, force=False) for logging
             create_group_func: Function(board, check_type, identifier, number) creates PCB_GROUP
+            get_distance_sq_func: Function(pos1, pos2) returns squared distance
+                (threshold comparisons without sqrt)
         
         Returns:
             int: Number of violations found
@@ -75,6 +83,7 @@ class ViaStitchingChecker:
         self.draw_marker = draw_marker_func
         self.draw_arrow = draw_arrow_func
         self.get_distance = get_distance_func
+        self.get_distance_sq = get_distance_sq_func
         
         self.log("\n=== VIA STITCHING CHECK START ===", force=True)
         
@@ -92,6 +101,8 @@ class ViaStitchingChecker:
         # Get all vias from board
         tracks = self.board.GetTracks()
         vias = [t for t in tracks if isinstance(t, pcbnew.PCB_VIA)]
+        # Net name of every via, read once for the class and ground filters below
+        via_nets = [(via, str(via.GetNetname())) for via in vias]  # Explicit string conversion
         
         # Filter critical vias (via Net Classes - preferred method)
         self.log("\n--- Scanning for Critical Vias ---")
@@ -100,14 +111,14 @@ class ViaStitchingChecker:
         
         for crit_class in critical_classes:
             # Use centralized get_nets_by_class utility
-            nets_in_class = self.auditor.get_nets_by_class(self.board, crit_class)
+            # (as a set: it is probed once per via)
+            nets_in_class = set(self.auditor.get_nets_by_class(self.board, crit_class))
             
             if nets_in_class:
                 self.log(f"  ✓ Found Net Class '{crit_class}' with {len(nets_in_class)} net(s)")
                 
                 # Find vias on these nets
-                for via in vias:
-                    via_net = str(via.GetNetname())  # Explicit string conversion
+                for via, via_net in via_nets:
                     if via_net in nets_in_class:
                         # Avoid duplicates using position as unique identifier
                         pos = via.GetPosition()
@@ -116,12 +127,13 @@ class ViaStitchingChecker:
                         if via_key not in seen_positions:
                             seen_positions[via_key] = via
                             critical_vias.append(via)
-                            via_class = str(via.GetNetClassName())  # Explicit string conversion
-                            self.log(f"    Critical via: net='{via_net}', class='{via_class}'")
+                            if self.verbose:
+                                via_class = str(via.GetNetClassName())  # Explicit string conversion
+                                self.log(f"    Critical via: net='{via_net}', class='{via_class}'")
             else:
                 # Fallback: Check if any vias have this class name in their net class string
                 # (handles comma-separated class names)
-                for via in vias:
+                for via, via_net in via_nets:
                     via_class = str(via.GetNetClassName())  # Explicit string conversion
                     if crit_class in via_class:
                         # Avoid duplicates using position as unique identifier
@@ -131,14 +143,14 @@ class ViaStitchingChecker:
                         if via_key not in seen_positions:
                             seen_positions[via_key] = via
                             critical_vias.append(via)
-                            via_net = str(via.GetNetname())  # Explicit string conversion
-                            self.log(f"    Critical via: net='{via_net}', class='{via_class}'")
+                            if self.verbose:
+                                self.log(f"    Critical via: net='{via_net}', class='{via_class}'")
         
         # Filter ground vias
+        is_ground_net = compile_substring_matcher(gnd_patterns)
         gnd_vias = []
-        for v in vias:
-            v_net = str(v.GetNetname()).upper()  # Explicit string conversion
-            if any(pat in v_net for pat in gnd_patterns):
+        for v, v_net in via_nets:
+            if is_ground_net(v_net.upper()):
                 gnd_vias.append(v)
         
         self.log(f"\n✓ Found {len(critical_vias)} critical via(s) and {len(gnd_vias)} ground via(s)", force=True)
@@ -147,26 +159,36 @@ class ViaStitchingChecker:
         if critical_vias and gnd_vias:
             self.log("\n--- Checking Via Stitching ---")
             
+            # Ground via positions are read once; distances are compared squared
+            # (integer math) and only the reported value takes a square root
+            gnd_via_pos = [(gv.GetPosition(), gv) for gv in gnd_vias]
+            
+            # Ground vias within max_dist of a critical via, looked up in the
+            # neighbouring grid cells (negative limit: nothing passes)
+            gnd_index = PointGridIndex(((gv_pos.x, gv_pos.y, gv) for gv_pos, gv in gnd_via_pos), max_dist)
+            
             for cv in critical_vias:
                 net_name = cv.GetNetname()
                 pos = cv.GetPosition()
-                self.log(f"\n>>> Checking via on net '{net_name}' at ({pcbnew.ToMM(pos.x):.2f}, {pcbnew.ToMM(pos.y):.2f}) mm")
+                if self.verbose:
+                    self.log(f"\n>>> Checking via on net '{net_name}' at ({pcbnew.ToMM(pos.x):.2f}, {pcbnew.ToMM(pos.y):.2f}) mm")
                 
-                found = False
-                nearest_dist = float('inf')
-                nearest_gnd_via = None
+                # First ground via (in board order) within max_dist
+                found = gnd_index.first_within(pos.x, pos.y)
                 
-                for gv in gnd_vias:
-                    dist = self.get_distance(cv.GetPosition(), gv.GetPosition())
-                    if dist < nearest_dist:
-                        nearest_dist = dist
-                        nearest_gnd_via = gv
-                    if dist <= max_dist:
-                        found = True
-                        self.log(f"    ✓ GND via found at {pcbnew.ToMM(dist):.2f} mm")
-                        break
-                
-                if not found:
+                if found is not None:
+                    if self.verbose:
+                        self.log(f"    ✓ GND via found at {pcbnew.ToMM(math.sqrt(found[1])):.2f} mm")
+                else:
+                    # Violation: full scan for the nearest ground via (for the report and arrow)
+                    nearest_dist_sq = float('inf')
+                    nearest_gnd_via = None
+                    for gv_pos, gv in gnd_via_pos:
+                        dist_sq = self.get_distance_sq(gv_pos, pos)
+                        if dist_sq < nearest_dist_sq:
+                            nearest_dist_sq = dist_sq
+                            nearest_gnd_via = gv
+                    nearest_dist = math.sqrt(nearest_dist_sq)
                     self.log(f"    ❌ NO GND VIA within {max_dist_mm} mm (nearest: {pcbnew.ToMM(nearest_dist):.2f} mm)", force=True)
                     
                     # Create violation group using centralized utility
@@ -176,7 +198,7 @@ class ViaStitchingChecker:
                     # Draw marker at critical via location
                     self.draw_marker(
                         self.board,
-                        cv.GetPosition(),
+                        pos,
                         violation_msg,
                         self.marker_layer,
                         violation_group
@@ -187,7 +209,7 @@ class ViaStitchingChecker:
                     if draw_arrow_to_nearest and nearest_gnd_via:
                         self.draw_arrow(
                             self.board,
-                            cv.GetPosition(),
+                            pos,
                             nearest_gnd_via.GetPosition(),
                             f"→ GND ({pcbnew.ToMM(nearest_dist):.1f}mm)",
                             self.marker_layer,
@@ -232,11 +254,12 @@ class ViaStitchingChecker:
         
         # Get all GND zones from board
         zones = self.board.Zones()
+        is_ground_net = compile_substring_matcher(gnd_patterns)
         gnd_zones = []
         
         for zone in zones:
             zone_net = str(zone.GetNetname()).upper()
-            if any(pat in zone_net for pat in gnd_patterns):
+            if is_ground_net(zone_net):
                 if zone.IsFilled():
                     gnd_zones.append(zone)
         
@@ -246,13 +269,21 @@ class ViaStitchingChecker:
             self.log("⚠️  No filled GND zones found - skipping density check", force=True)
             return
         
+        iu2_per_mm2 = pcbnew.FromMM(1) ** 2
+        
+        # Via positions are read once for all zones
+        gnd_via_pos = []
+        for via in gnd_vias:
+            via_pos = via.GetPosition()
+            gnd_via_pos.append((via_pos.x, via_pos.y, via_pos))
+        
         # Check density for each zone
         for zone in gnd_zones:
             zone_net = zone.GetNetname()
             
             # Get zone area in cm²
             area_internal = zone.GetFilledArea()  # Returns area in internal units²
-            area_mm2 = area_internal / (pcbnew.FromMM(1) ** 2)
+            area_mm2 = area_internal / iu2_per_mm2
             area_cm2 = area_mm2 / 100.0
             
             if area_cm2 < 0.01:  # Skip tiny zones (< 0.01 cm² = 1 mm²)
@@ -261,20 +292,24 @@ class ViaStitchingChecker:
             # Count vias inside this zone
             zone_layer = zone.GetLayer()
             vias_in_zone = 0
+            bbox = zone.GetBoundingBox()
+            left, top = bbox.GetLeft(), bbox.GetTop()
+            right, bottom = bbox.GetRight(), bbox.GetBottom()
             
-            for via in gnd_vias:
-                via_pos = via.GetPosition()
-                # Check if via is inside the filled zone area
-                if zone.HitTestFilledArea(zone_layer, via_pos):
+            for x, y, via_pos in gnd_via_pos:
+                # Check if via is inside the filled zone area; integer bounding box
+                # compares reject most vias before the polygon hit-test
+                if left <= x <= right and top <= y <= bottom and zone.HitTestFilledArea(zone_layer, via_pos):
                     vias_in_zone += 1
             
             # Calculate actual density
             actual_density = vias_in_zone / area_cm2 if area_cm2 > 0 else 0
             
-            self.log(f"\nZone '{zone_net}' on layer {self.board.GetLayerName(zone_layer)}:")
-            self.log(f"  Area: {area_cm2:.2f} cm² ({area_mm2:.1f} mm²)")
-            self.log(f"  Vias: {vias_in_zone}")
-            self.log(f"  Density: {actual_density:.2f} vias/cm² (min: {min_density})")
+            if self.verbose:
+                self.log(f"\nZone '{zone_net}' on layer {self.board.GetLayerName(zone_layer)}:")
+                self.log(f"  Area: {area_cm2:.2f} cm² ({area_mm2:.1f} mm²)")
+                self.log(f"  Vias: {vias_in_zone}")
+                self.log(f"  Density: {actual_density:.2f} vias/cm² (min: {min_density})")
             
             # Check if density is sufficient
             if actual_density < min_density:
@@ -301,7 +336,7 @@ class ViaStitchingChecker:
                     self.marker_layer,
                     violation_group
                 )
-            else:
+            elif self.verbose:
                 self.log(f"  ✓ Adequate density")
     
     def _check_board_edge_stitching(self, gnd_vias, gnd_patterns, create_group_func):
@@ -407,7 +442,7 @@ class ViaStitchingChecker:
                         self.marker_layer,
                         violation_group
                     )
-                else:
+                elif self.verbose:
                     self.log(f"  ✓ Via spacing: {spacing_mm:.1f} mm")
             
             # Check distance from edge start/end to first/last via
@@ -144,13 +144,19 @@ def _mock_utility_functions():
         dy = p2.y - p1.y  # Keep in internal units
         return (dx**2 + dy**2)**0.5
     
+    def get_distance_sq(p1, p2):
+        """Squared Euclidean distance"""
+        dx = p1.x - p2.x
+        dy = p1.y - p2.y
+        return dx*dx + dy*dy
+    
     def log(msg, force=False):
         pass  # Suppress logs in tests
     
     def create_group(board, check_type, identifier, number):
         return None  # Not needed for tests
     
-    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group
+    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq
 
 
 class TestClearanceViolations:
@@ -188,9 +194,9 @@ class TestClearanceViolations:
         auditor=_mock_auditor()
         )
         
-        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group = _mock_utility_functions()
+        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq = _mock_utility_functions()
         
-        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group)
+        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq)
         
         # Assert: violation was flagged (distance 1.5mm < required 2.5mm)
         assert violations > 0, f"Expected clearance violation but got {violations} violations"
@@ -233,9 +239,9 @@ class TestClearanceViolations:
         auditor=_mock_auditor()
         )
         
-        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group = _mock_utility_functions()
+        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq = _mock_utility_functions()
         
-        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group)
+        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq)
         
         # Debug: print violations
         import pcbnew
@@ -280,9 +286,9 @@ class TestClearanceViolations:
         auditor=_mock_auditor()
         )
         
-        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group = _mock_utility_functions()
+        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq = _mock_utility_functions()
         
-        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group)
+        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq)
         
         # Assert: no violations because checks disabled
         assert violations == 0, f"Expected 0 violations (checks disabled) but got {violations}"
@@ -322,9 +328,9 @@ class TestCreepageViolations:
         auditor=_mock_auditor()
         )
         
-        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group = _mock_utility_functions()
+        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq = _mock_utility_functions()
         
-        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group)
+        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq)
         
         # Assert: violation was flagged
         assert violations > 0, f"Expected creepage violation but got {violations} violations"
@@ -365,9 +371,9 @@ class TestCreepageViolations:
         auditor=_mock_auditor()
         )
         
-        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group = _mock_utility_functions()
+        violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq = _mock_utility_functions()
         
-        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group)
+        violations = checker.check(draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq)
         
         # Assert: no violations
         assert violations == 0, f"Expected no violations but got {violations}"
@@ -80,13 +80,19 @@ def _mock_utility_functions():
         dy = p2.y - p1.y
         return (dx**2 + dy**2)**0.5
     
+    def get_distance_sq(p1, p2):
+        """Squared Euclidean distance"""
+        dx = p1.x - p2.x
+        dy = p1.y - p2.y
+        return dx*dx + dy*dy
+    
     def log(msg, force=False):
         pass  # Suppress logs
     
     def create_group(board, check_type, identifier, number):
         return MagicMock()
     
-    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group
+    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq
 
 
 class TestConfigEdgeCases:
@@ -41,6 +41,9 @@ def _mock_auditor():
         config = {'general': {}}
         def get_nets_by_class(self, board, config):
             return {}  # No net classes
+        def add_to_violation_group(self, board, group, item):
+            board.Add(item)
+            group.AddItem(item)
     return Auditor()
 
 
@@ -60,6 +63,11 @@ def _mock_utility_functions():
         dy = p1.y - p2.y
         return math.sqrt(dx*dx + dy*dy)
     
+    def get_distance_sq(p1, p2):
+        dx = p1.x - p2.x
+        dy = p1.y - p2.y
+        return dx*dx + dy*dy
+    
     def log(msg, force=False):
         pass  # Silent during test
     
@@ -69,7 +77,7 @@ def _mock_utility_functions():
         group.SetName(f"EMC_{type_str}_{id_str}_{num}")
         return group
     
-    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group
+    return violations_drawn, draw_marker, draw_arrow, get_distance, log, create_group, get_distance_sq
 
 
 class TestSlotPathfinding:
@@ -51,7 +51,8 @@ class TestCapacitorProximity:
             checker.draw_arrow, 
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: IC without nearby cap should be flagged
@@ -86,7 +87,8 @@ class TestCapacitorProximity:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: nearby capacitor should have no violations
@@ -121,7 +123,8 @@ class TestCapacitorProximity:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: both ICs served by same cap, no violations
@@ -202,7 +205,8 @@ class TestMultipleSupplyPins:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: second pin without nearby cap should be flagged
@@ -237,7 +241,8 @@ class TestMultipleSupplyPins:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: all pins served, no violations
@@ -277,7 +282,8 @@ class TestCapacitorNetConnection:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: cap on wrong net should not count, IC should be flagged as lacking cap
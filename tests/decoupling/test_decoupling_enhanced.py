@@ -362,7 +362,13 @@ class TestCountViasNearCapacitor:
             dx = p1.x - p2.x
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
+        
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
         checker.get_distance = get_distance
+        checker.get_distance_sq = get_distance_sq
         
         # Capacitor at (0, 0) with two pads
         cap_pads = [
@@ -403,7 +409,13 @@ class TestCountViasNearCapacitor:
             dx = p1.x - p2.x
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
+        
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
         checker.get_distance = get_distance
+        checker.get_distance_sq = get_distance_sq
         
         # Capacitor at (0, 0)
         cap_pads = [MockPad(position=(0, 0))]
@@ -438,7 +450,13 @@ class TestCountViasNearCapacitor:
             dx = p1.x - p2.x
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
+        
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
         checker.get_distance = get_distance
+        checker.get_distance_sq = get_distance_sq
         
         # Capacitor at (0, 0)
         cap_pads = [MockPad(position=(0, 0))]
@@ -298,6 +298,11 @@ class TestSmdThtPrioritization:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def draw_marker(board, pos, msg, layer, group):
             pass
         
@@ -317,7 +322,8 @@ class TestSmdThtPrioritization:
             draw_arrow_func=draw_arrow,
             get_distance_func=get_distance,
             log_func=log_func,
-            create_group_func=create_group
+            create_group_func=create_group,
+            get_distance_sq_func=get_distance_sq
         )
         
         # Assert
@@ -356,6 +362,11 @@ class TestSmdThtPrioritization:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         marker_calls = []
         def draw_marker(board, pos, msg, layer, group):
             marker_calls.append({'pos': pos, 'msg': msg})
@@ -376,7 +387,8 @@ class TestSmdThtPrioritization:
             draw_arrow_func=draw_arrow,
             get_distance_func=get_distance,
             log_func=log_func,
-            create_group_func=create_group
+            create_group_func=create_group,
+            get_distance_sq_func=get_distance_sq
         )
         
         # Assert
@@ -420,6 +432,11 @@ class TestViaCountChecking:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         warning_markers = []
         def draw_marker(board, pos, msg, layer, group):
             if "VIA COUNT" in msg or "via" in msg.lower():
@@ -441,7 +458,8 @@ class TestViaCountChecking:
             draw_arrow_func=draw_arrow,
             get_distance_func=get_distance,
             log_func=log_func,
-            create_group_func=create_group
+            create_group_func=create_group,
+            get_distance_sq_func=get_distance_sq
         )
         
         # Assert
@@ -478,6 +496,11 @@ class TestViaCountChecking:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         warning_markers = []
         def draw_marker(board, pos, msg, layer, group):
             if "VIA COUNT" in msg or "LOW VIA" in msg:
@@ -499,7 +522,8 @@ class TestViaCountChecking:
             draw_arrow_func=draw_arrow,
             get_distance_func=get_distance,
             log_func=log_func,
-            create_group_func=create_group
+            create_group_func=create_group,
+            get_distance_sq_func=get_distance_sq
         )
         
         # Assert
@@ -537,6 +561,11 @@ class TestBasicProximity:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def draw_marker(board, pos, msg, layer, group):
             pass
         
@@ -555,7 +584,8 @@ class TestBasicProximity:
             draw_arrow_func=draw_arrow,
             get_distance_func=get_distance,
             log_func=log_func,
-            create_group_func=create_group
+            create_group_func=create_group,
+            get_distance_sq_func=get_distance_sq
         )
         
         # Assert
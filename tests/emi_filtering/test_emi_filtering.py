@@ -48,7 +48,8 @@ class TestFilterPresence:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: connector without filter should be flagged
@@ -84,7 +85,8 @@ class TestFilterPresence:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: connector with filter should have no violations
@@ -166,7 +168,8 @@ class TestFilterPlacement:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: filter too far should be flagged as missing
@@ -201,7 +204,8 @@ class TestFilterPlacement:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: filter within distance should have no violations
@@ -236,7 +240,8 @@ class TestConnectorClassification:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: non-J connector should not be checked
@@ -267,7 +272,8 @@ class TestConnectorClassification:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Assert: USB connector should be checked (2 signal pads without filters = 2 violations)
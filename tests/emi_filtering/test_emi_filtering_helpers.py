@@ -682,5 +682,51 @@ class TestFindConnectors:
         assert len(connectors) == 0
 
 
+# =============================================================================
+# Test: _find_first_filter_component()
+# =============================================================================
+
+class TestFindFirstFilterComponent:
+    """Test nearest filter component search (squared-distance comparisons)."""
+    
+    def _make_checker(self):
+        board = MockBoard()
+        net = board.AddNet("USB_DP")
+        board._footprints = [
+            MockFootprint(reference="R1", pads=[MockPad("1", "USB_DP")], position=(3000000, 4000000)),
+            MockFootprint(reference="C1", pads=[MockPad("1", "USB_DP")], position=(6000000, 8000000)),
+            MockFootprint(reference="U1", pads=[MockPad("1", "USB_DP")], position=(100, 0)),
+        ]
+        checker = EMIFilteringChecker(
+            board=board,
+            marker_layer=0,
+            config={},
+            report_lines=[],
+            verbose=False,
+            auditor=MagicMock()
+        )
+        checker.get_distance_sq = lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
+        return checker, net
+    
+    def test_nearest_component_reports_euclidean_distance(self):
+        """Nearest matching component is returned with its real (not squared) distance."""
+        checker, net = self._make_checker()
+        
+        result = checker._find_first_filter_component(net, pcbnew.VECTOR2I(0, 0), 20000000, ['R', 'C'])
+        
+        assert result is not None
+        ref, fp, distance = result
+        assert ref == "R1"
+        assert distance == pytest.approx(5000000)
+    
+    def test_component_beyond_max_distance_ignored(self):
+        """Threshold is applied on squared distance: 5mm component is outside a 4mm limit."""
+        checker, net = self._make_checker()
+        
+        result = checker._find_first_filter_component(net, pcbnew.VECTOR2I(0, 0), 4000000, ['R', 'C'])
+        
+        assert result is None
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -572,6 +572,11 @@ class TestFilterPresenceIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -584,7 +589,8 @@ class TestFilterPresenceIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -626,6 +632,11 @@ class TestFilterPresenceIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -638,7 +649,8 @@ class TestFilterPresenceIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -688,6 +700,11 @@ class TestFilterTopologyIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -700,7 +717,8 @@ class TestFilterTopologyIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -756,6 +774,11 @@ class TestFilterTopologyIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -768,7 +791,8 @@ class TestFilterTopologyIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert - differential filter should be detected
@@ -824,6 +848,11 @@ class TestFilterTopologyIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -836,7 +865,8 @@ class TestFilterTopologyIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Current behavior: May detect as simple filter (series inductor)
@@ -886,6 +916,11 @@ class TestFilterPlacementIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -898,7 +933,8 @@ class TestFilterPlacementIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert - filter at 15mm should be ignored (beyond 10mm limit)
@@ -949,6 +985,11 @@ class TestFilterSufficiencyIntegration:
             dy = p1.y - p2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(p1, p2):
+            dx = p1.x - p2.x
+            dy = p1.y - p2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             print(f"[TEST LOG] {msg}")
         
@@ -961,7 +1002,8 @@ class TestFilterSufficiencyIntegration:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert - C filter insufficient for LC requirement
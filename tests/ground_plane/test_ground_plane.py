@@ -24,7 +24,9 @@ from tests.helpers import MockBoard, MockZone, MockTrack, MockVia, MockPad, Mock
 # pcbnew will be available via conftest.py mock
 import pcbnew
 
-from ground_plane import GroundPlaneChecker
+from ground_plane import GroundPlaneChecker, LayerNameCache
+from net_matching import compile_substring_matcher
+from spatial_index import PointGridIndex, ZoneGridIndex
 
 
 # ========================================================================
@@ -109,7 +111,8 @@ class TestSlotUnderTrace:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert violation detected
@@ -180,7 +183,8 @@ class TestSlotUnderTrace:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations
@@ -252,7 +256,8 @@ class TestSlotUnderTrace:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations (check was skipped)
@@ -348,7 +353,8 @@ class TestPlaneSplitCrossing:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert violation detected
@@ -418,7 +424,8 @@ class TestPlaneSplitCrossing:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations (trace stayed in one zone)
@@ -497,7 +504,8 @@ class TestPlaneSplitCrossing:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations (low-speed net ignored)
@@ -602,7 +610,8 @@ class TestReturnViaContinuity:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: all_logs.append(msg),
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert violation detected
@@ -696,7 +705,8 @@ class TestReturnViaContinuity:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations
@@ -792,7 +802,8 @@ class TestMinimumPlaneArea:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert violation detected
@@ -874,13 +885,241 @@ class TestMinimumPlaneArea:
             draw_arrow_func=lambda *args: None,
             get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
             log_func=lambda msg, force=False: None,
-            create_group_func=lambda board, typ, id, num: None
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
         )
         
         # Assert no violations (coverage is adequate)
         assert violations == 0, f"Expected 0 violations for adequate coverage, got {violations}"
 
 
+# ========================================================================
+# GROUND PLANE HELPERS
+# ========================================================================
+
+class TestLayerNameCache:
+    """Layer names are fetched from the board once per layer."""
+
+    def test_fetches_each_layer_once(self):
+        board = MockBoard(layer_names={0: "F.Cu", 31: "B.Cu"})
+        calls = []
+        original = board.GetLayerName
+        board.GetLayerName = lambda layer_id: calls.append(layer_id) or original(layer_id)
+        names = LayerNameCache(board)
+
+        assert names[0] == "F.Cu"
+        assert names[31] == "B.Cu"
+        assert names[0] == "F.Cu"
+        assert calls == [0, 31]
+
+
+class TestGroundConnectionIgnore:
+    """GND pads/vias are collected once and tested by squared distance."""
+
+    def _checker(self, footprints=None, tracks=None):
+        board = MockBoard(footprints=footprints or [], tracks=tracks or [])
+        checker = GroundPlaneChecker(board, pcbnew.User_1, {}, [], False, None)
+        checker.log = lambda msg, force=False: None
+        return checker
+
+    def test_collects_only_ground_pads_and_vias(self):
+        gnd_pad = MockPad("GND", pcbnew.VECTOR2I(pcbnew.FromMM(1), pcbnew.FromMM(2)))
+        sig_pad = MockPad("CLK", pcbnew.VECTOR2I(pcbnew.FromMM(3), pcbnew.FromMM(4)), number="2")
+        gnd_via = MockVia("GND", pcbnew.VECTOR2I(pcbnew.FromMM(5), pcbnew.FromMM(6)))
+        sig_via = MockVia("CLK", pcbnew.VECTOR2I(pcbnew.FromMM(7), pcbnew.FromMM(8)))
+        checker = self._checker(footprints=[MockFootprint("U1", pads=[gnd_pad, sig_pad])],
+                                tracks=[gnd_via, sig_via])
+        _, vias = checker._partition_tracks()
+
+        pads_xy, vias_xy = checker._collect_ground_connections(
+            vias, compile_substring_matcher(["GND"]))
+
+        assert pads_xy == [(pcbnew.FromMM(1), pcbnew.FromMM(2))]
+        assert vias_xy == [(pcbnew.FromMM(5), pcbnew.FromMM(6))]
+
+    def test_matcher_runs_once_per_distinct_net(self):
+        pads = [MockPad("GND", pcbnew.VECTOR2I(i, 0), number=str(i)) for i in range(5)]
+        vias = [MockVia("GND", pcbnew.VECTOR2I(0, i)) for i in range(3)]
+        checker = self._checker(footprints=[MockFootprint("U1", pads=pads)], tracks=vias)
+        _, vias = checker._partition_tracks()
+        seen = []
+        matcher = compile_substring_matcher(["GND"])
+
+        def counting_matcher(text):
+            seen.append(text)
+            return matcher(text)
+
+        pads_xy, vias_xy = checker._collect_ground_connections(vias, counting_matcher)
+
+        assert len(pads_xy) == 5 and len(vias_xy) == 3
+        assert seen == ["GND"]
+
+    def test_ignore_radius_is_exclusive(self):
+        checker = self._checker()
+        radius = pcbnew.FromMM(0.5)
+        points = PointGridIndex([(0, 0)], radius)
+        empty = PointGridIndex([], radius)
+
+        assert checker._should_ignore_gap_near_ground_connections(
+            pcbnew.VECTOR2I(radius - 1, 0), points, empty)
+        assert not checker._should_ignore_gap_near_ground_connections(
+            pcbnew.VECTOR2I(radius, 0), points, empty)
+        assert checker._should_ignore_gap_near_ground_connections(
+            pcbnew.VECTOR2I(0, radius - 1), empty, points)
+
+
+class TestZoneHitCache:
+    """HitTestFilledArea runs once per (zone, layer, point) within a check."""
+
+    def test_repeated_point_is_hit_tested_once(self):
+        zone = MockZone("GND", 1, coverage_rects=[(0, 0, pcbnew.FromMM(10), pcbnew.FromMM(10))])
+        calls = []
+        original = zone.HitTestFilledArea
+        zone.HitTestFilledArea = lambda layer, pos: calls.append((layer, pos.x, pos.y)) or original(layer, pos)
+        checker = GroundPlaneChecker(MockBoard(), pcbnew.User_1, {}, [], False, None)
+        layer_indexes = checker._layer_indexes({1: ZoneGridIndex([zone])}, [1])
+        pos = pcbnew.VECTOR2I(pcbnew.FromMM(5), pcbnew.FromMM(5))
+
+        assert checker._hit_test_indexes(layer_indexes, pos.x, pos.y) is zone
+        assert checker._hit_test_indexes(layer_indexes, pos.x, pos.y) is zone
+        assert len(calls) == 1
+
+
+class TestScanSamples:
+    """Fused sample scan used by the continuity and clearance checks."""
+
+    def _setup(self):
+        zone = MockZone("GND", 1, coverage_rects=[(0, 0, pcbnew.FromMM(10), pcbnew.FromMM(10))])
+        checker = GroundPlaneChecker(MockBoard(), pcbnew.User_1, {}, [], False, None)
+        checker.log = lambda msg, force=False: None
+        samples = [(pcbnew.FromMM(x), pcbnew.FromMM(5)) for x in (2, 6, 12, 14)]
+        return checker, {1: ZoneGridIndex([zone])}, samples
+
+    def _first_gap(self, checker, index, samples, pads, vias):
+        indexes = checker._layer_indexes(index, [1], checker._samples_bbox(samples))
+        gap, clearance_pos = checker._scan_samples(samples, indexes, [], [], pads, vias)
+        assert clearance_pos is None
+        return gap
+
+    def test_returns_first_sample_without_ground(self):
+        checker, index, samples = self._setup()
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+
+        gap_index, gap_pos = self._first_gap(checker, index, samples, no_points, no_points)
+
+        assert gap_index == 2
+        assert (gap_pos.x, gap_pos.y) == samples[2]
+
+    def test_gap_near_ground_pad_is_ignored(self):
+        checker, index, samples = self._setup()
+        pads = PointGridIndex([samples[2]], pcbnew.FromMM(0.5))
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+
+        assert self._first_gap(checker, index, samples, pads, no_points) is None
+
+    def test_track_outside_all_zones_gaps_at_first_sample(self):
+        checker, index, _ = self._setup()
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+        samples = [(pcbnew.FromMM(x), pcbnew.FromMM(20)) for x in (2, 4, 6)]
+
+        gap_index, _ = self._first_gap(checker, index, samples, no_points, no_points)
+
+        assert gap_index == 0
+        assert checker.zone_hit_cache == {}  # Pruned by bbox, no hit test at all
+
+    def test_layer_without_zones_gaps_at_first_sample(self):
+        checker = GroundPlaneChecker(MockBoard(), pcbnew.User_1, {}, [], False, None)
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+        samples = [(0, 0), (pcbnew.FromMM(1), 0), (pcbnew.FromMM(2), 0)]
+
+        gap_index, gap_pos = self._first_gap(checker, {}, samples, no_points, no_points)
+
+        assert gap_index == 0
+        assert (gap_pos.x, gap_pos.y) == samples[0]
+
+    def test_clearance_gap_found_in_same_pass(self):
+        checker, index, _ = self._setup()
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+        samples = [(pcbnew.FromMM(x), pcbnew.FromMM(8)) for x in (2, 4, 6)]
+        offsets = [(0, -pcbnew.FromMM(1)), (0, pcbnew.FromMM(3))]
+        indexes = checker._layer_indexes(index, [1])
+
+        gap, clearance_pos = checker._scan_samples(samples, indexes, indexes, offsets,
+                                                   no_points, no_points)
+
+        assert gap is None
+        assert (clearance_pos.x, clearance_pos.y) == (pcbnew.FromMM(2), pcbnew.FromMM(11))
+
+    def test_clearance_only_skips_continuity(self):
+        checker, index, samples = self._setup()
+        no_points = PointGridIndex([], pcbnew.FromMM(0.5))
+
+        gap, clearance_pos = checker._scan_samples(samples, None, checker._layer_indexes(index, [1]),
+                                                   [(0, 0)], no_points, no_points)
+
+        assert gap is None
+        assert (clearance_pos.x, clearance_pos.y) == samples[2]
+
+
+class TestSampleTrackPoints:
+    """Sample coordinates shared by the continuity, split and clearance checks."""
+
+    def test_includes_both_endpoints_and_is_evenly_spaced(self):
+        start = pcbnew.VECTOR2I(0, 0)
+        end = pcbnew.VECTOR2I(1000, -500)
+
+        samples = GroundPlaneChecker._sample_track_points(start, end, 4)
+
+        assert samples == [(0, 0), (250, -125), (500, -250), (750, -375), (1000, -500)]
+
+    def test_matches_per_sample_interpolation(self):
+        start = pcbnew.VECTOR2I(pcbnew.FromMM(1.3), pcbnew.FromMM(7.7))
+        end = pcbnew.VECTOR2I(pcbnew.FromMM(42.1), pcbnew.FromMM(-3.9))
+        num_samples = 37
+
+        expected = [
+            (int(start.x + (end.x - start.x) * (i / num_samples)),
+             int(start.y + (end.y - start.y) * (i / num_samples)))
+            for i in range(num_samples + 1)
+        ]
+        assert GroundPlaneChecker._sample_track_points(start, end, num_samples) == expected
+
+
+class TestAdjacentLayerLookup:
+    """The adjacent ground layer is resolved once per distinct track layer."""
+
+    def test_lookup_once_per_layer(self, monkeypatch):
+        tracks = [
+            MockTrack("CLK", pcbnew.VECTOR2I(0, pcbnew.FromMM(y)),
+                      pcbnew.VECTOR2I(pcbnew.FromMM(5), pcbnew.FromMM(y)),
+                      layer=layer, net_class="HighSpeed")
+            for y, layer in ((0, pcbnew.F_Cu), (1, pcbnew.F_Cu), (2, pcbnew.B_Cu))
+        ]
+        zone = MockZone(net_name="GND", layer=pcbnew.In1_Cu, filled=True)
+        board = MockBoard(tracks=tracks, zones=[zone], copper_layer_count=4)
+        config = {
+            'critical_net_classes': ['HighSpeed'],
+            'check_split_plane_crossing': False,
+            'check_return_via_continuity': False,
+        }
+        checker = GroundPlaneChecker(board, pcbnew.User_1, config, [], False, None)
+        calls = []
+        original = checker.get_adjacent_ground_layer
+        monkeypatch.setattr(checker, "get_adjacent_ground_layer",
+                            lambda layer: calls.append(layer) or original(layer))
+
+        checker.check(
+            draw_marker_func=lambda *args: None,
+            draw_arrow_func=lambda *args: None,
+            get_distance_func=lambda p1, p2: ((p1.x - p2.x)**2 + (p1.y - p2.y)**2)**0.5,
+            log_func=lambda msg, force=False: None,
+            create_group_func=lambda board, typ, id, num: None,
+            get_distance_sq_func=lambda p1, p2: (p1.x - p2.x)**2 + (p1.y - p2.y)**2
+        )
+
+        assert sorted(calls) == sorted([pcbnew.F_Cu, pcbnew.B_Cu])
+
+
 # ========================================================================
 # INTEGRATION TESTS
 # ========================================================================
@@ -907,6 +907,12 @@ def make_si_checker_with_utilities(board=None, config=None):
         dy = pos2.y - pos1.y
         return int((dx*dx + dy*dy) ** 0.5)
     
+    def mock_get_distance_sq(pos1, pos2):
+        """Squared Euclidean distance"""
+        dx = pos2.x - pos1.x
+        dy = pos2.y - pos1.y
+        return dx*dx + dy*dy
+    
     def mock_log(msg, force=False):
         """No-op log (already wired in make_si_checker)"""
         pass
@@ -921,6 +927,7 @@ def make_si_checker_with_utilities(board=None, config=None):
     checker.draw_marker = mock_draw_marker
     checker.draw_arrow = mock_draw_arrow
     checker.get_distance = mock_get_distance
+    checker.get_distance_sq = mock_get_distance_sq
     checker.log = mock_log
     checker.create_group = mock_create_group
     
@@ -995,6 +1002,12 @@ def make_decoupling_checker_with_utilities(board=None, config=None):
         dy = pos2.y - pos1.y
         return int((dx*dx + dy*dy) ** 0.5)
     
+    def mock_get_distance_sq(pos1, pos2):
+        """Squared Euclidean distance"""
+        dx = pos2.x - pos1.x
+        dy = pos2.y - pos1.y
+        return dx*dx + dy*dy
+    
     def mock_log(msg, force=False):
         """No-op log"""
         pass
@@ -1010,6 +1023,7 @@ def make_decoupling_checker_with_utilities(board=None, config=None):
     checker.draw_marker = mock_draw_marker
     checker.draw_arrow = mock_draw_arrow
     checker.get_distance = mock_get_distance
+    checker.get_distance_sq = mock_get_distance_sq
     checker.log = mock_log
     checker.create_group = mock_create_group
     
@@ -1359,6 +1373,12 @@ def make_emi_filtering_checker_with_utilities(board=None, config=None):
         dy = pos2.y - pos1.y
         return int((dx*dx + dy*dy) ** 0.5)
     
+    def mock_get_distance_sq(pos1, pos2):
+        """Squared Euclidean distance"""
+        dx = pos2.x - pos1.x
+        dy = pos2.y - pos1.y
+        return dx*dx + dy*dy
+    
     def mock_log(msg, force=False):
         """No-op log"""
         pass
@@ -1374,6 +1394,7 @@ def make_emi_filtering_checker_with_utilities(board=None, config=None):
     checker.draw_marker = mock_draw_marker
     checker.draw_arrow = mock_draw_arrow
     checker.get_distance = mock_get_distance
+    checker.get_distance_sq = mock_get_distance_sq
     checker.log = mock_log
     checker.create_group = mock_create_group
     
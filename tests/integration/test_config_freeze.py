@@ -0,0 +1,52 @@
+"""
+Tests for the read-only session config in emc_auditor_plugin.py.
+
+The plugin module needs wx at import time; a minimal stub is installed for
+the duration of each test (pcbnew is the conftest mock).
+"""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def plugin_module(monkeypatch):
+    """emc_auditor_plugin module loaded from src/ with wx stubbed."""
+    wx = types.ModuleType("wx")
+    wx.Dialog = type("Dialog", (), {})
+    monkeypatch.setitem(sys.modules, "wx", wx)
+
+    plugin_path = Path(__file__).parent.parent.parent / 'src' / 'emc_auditor_plugin.py'
+    spec = importlib.util.spec_from_file_location("emc_auditor_plugin_module", plugin_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestFreezeConfig:
+    """_freeze_config() leaves nothing mutable in the cached config."""
+
+    def test_nested_lists_become_tuples(self, plugin_module):
+        config = plugin_module._freeze_config({
+            'via_stitching': {'ground_net_patterns': ['GND', 'VSS']},
+            'clearance_creepage': {'voltage_domains': [{'name': 'MAINS', 'net_patterns': ['L', 'N']}]},
+        })
+
+        assert config['via_stitching']['ground_net_patterns'] == ('GND', 'VSS')
+        domain = config['clearance_creepage']['voltage_domains'][0]
+        assert domain['net_patterns'] == ('L', 'N')
+        with pytest.raises(TypeError):
+            domain['name'] = 'LOW'
+
+    def test_default_config_is_read_only(self, plugin_module):
+        via_config = plugin_module._DEFAULT_CONFIG['via_stitching']
+
+        assert isinstance(via_config['critical_net_classes'], tuple)
+        with pytest.raises(TypeError):
+            via_config['max_distance_mm'] = 1.0
+        with pytest.raises(AttributeError):
+            via_config['ground_net_patterns'].append('AGND')
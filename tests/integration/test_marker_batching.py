@@ -0,0 +1,169 @@
+"""
+Tests for the batched marker/arrow/group insertion in emc_auditor_plugin.py.
+
+The plugin module needs wx at import time; a minimal stub is installed for
+the duration of each test (pcbnew is the conftest mock).
+"""
+
+import importlib.util
+import sys
+import types
+from pathlib import Path
+
+import pytest
+import pcbnew
+
+
+class _RecordingBoard:
+    """Board stub that records everything passed to Add()."""
+
+    def __init__(self):
+        self.added = []
+
+    def Add(self, item):
+        self.added.append(item)
+
+
+@pytest.fixture
+def plugin(monkeypatch):
+    """EMCAuditorPlugin instance (module loaded from src/ with wx stubbed)."""
+    wx = types.ModuleType("wx")
+    wx.Dialog = type("Dialog", (), {})
+    monkeypatch.setitem(sys.modules, "wx", wx)
+
+    plugin_path = Path(__file__).parent.parent.parent / 'src' / 'emc_auditor_plugin.py'
+    spec = importlib.util.spec_from_file_location("emc_auditor_plugin_module", plugin_path)
+    plugin_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(plugin_module)
+
+    instance = plugin_module.EMCAuditorPlugin()
+    instance.defaults()
+    return instance
+
+
+def _group(plugin, board, *name):
+    """Violation group whose AddItem() calls are recorded in group.items."""
+    group = plugin.create_violation_group(board, *name)
+    group.items = []
+    group.AddItem = group.items.append
+    return group
+
+
+def _flush(plugin, board):
+    """Flush in the same order as batched_marker_insertion()."""
+    plugin.flush_markers(board)
+    plugin.flush_arrows(board)
+    return plugin.flush_violation_groups(board)
+
+
+class TestViolationGroupFlush:
+    """flush_violation_groups() adds every group that received items."""
+
+    def test_group_with_marker_is_added(self, plugin):
+        board = _RecordingBoard()
+        group = _group(plugin, board, "Via", "CLK", 1)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "NO VIA", 3, group)
+
+        assert _flush(plugin, board) == 1
+        assert group in board.added
+        assert len(group.items) == 2  # circle + text
+
+    def test_group_with_arrow_only_is_added(self, plugin):
+        board = _RecordingBoard()
+        group = _group(plugin, board, "GndPlane", "CLK", 1)
+        plugin.draw_arrow(board, pcbnew.VECTOR2I(0, 0), pcbnew.VECTOR2I(1000000, 0), "", 3, group)
+
+        assert _flush(plugin, board) == 1
+        assert group in board.added
+
+    def test_group_filled_by_checker_item_is_added(self, plugin):
+        """Checkers add their own items (e.g. creepage paths) through the plugin."""
+        board = _RecordingBoard()
+        group = _group(plugin, board, "Clearance", "J1", 1)
+        segment = pcbnew.PCB_SHAPE(board)
+        plugin.add_to_violation_group(board, group, segment)
+
+        assert segment in board.added and group.items == [segment]
+        assert _flush(plugin, board) == 1
+        assert group in board.added
+
+    def test_empty_group_is_dropped(self, plugin):
+        board = _RecordingBoard()
+        group = _group(plugin, board, "Via", "CLK", 1)
+
+        assert _flush(plugin, board) == 0
+        assert group not in board.added
+        assert plugin._pending_groups == []
+
+
+class TestMarkerMerging:
+    """Co-located identical markers (general.merge_colocated_markers)."""
+
+    def test_merging_is_off_by_default(self, plugin):
+        board = _RecordingBoard()
+        groups = [_group(plugin, board, "Via", "CLK", n) for n in (1, 2)]
+        for group in groups:
+            plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "NO VIA", 3, group)
+
+        assert plugin.flush_markers(board) == 2
+        assert [len(g.items) for g in groups] == [2, 2]
+
+    def test_duplicate_marker_is_merged(self, plugin):
+        plugin._merge_markers = True
+        board = _RecordingBoard()
+        first = plugin.create_violation_group(board, "Via", "CLK", 1)
+        second = plugin.create_violation_group(board, "Via", "CLK", 2)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "NO VIA", 3, first)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(1000, 0), "NO VIA", 3, second)
+
+        assert plugin._marker_queue[0][4] == 2
+        assert _flush(plugin, board) == 1
+        assert first in board.added and second not in board.added
+
+    def test_different_message_is_not_merged(self, plugin):
+        plugin._merge_markers = True
+        board = _RecordingBoard()
+        first = plugin.create_violation_group(board, "Via", "CLK", 1)
+        second = plugin.create_violation_group(board, "Via", "CLK", 2)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "NO VIA", 3, first)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "GAP", 3, second)
+
+        assert _flush(plugin, board) == 2
+
+    def test_arrow_of_merged_violation_joins_surviving_group(self, plugin):
+        plugin._merge_markers = True
+        board = _RecordingBoard()
+        first = _group(plugin, board, "GndPlane", "CLK", 1)
+        second = _group(plugin, board, "GndPlane", "CLK", 2)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "GAP", 3, first)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(0, 0), "GAP", 3, second)
+        plugin.draw_arrow(board, pcbnew.VECTOR2I(0, 0), pcbnew.VECTOR2I(1000000, 0),
+                          "GND GAP", 3, second)
+
+        assert _flush(plugin, board) == 1
+        assert second.items == []
+        assert len(first.items) == 6  # circle + text + line + 2 wings + label
+
+
+class TestMarkerCulling:
+    """Markers outside general.marker_region_mm are not drawn."""
+
+    def test_marker_outside_region_is_culled(self, plugin):
+        plugin._cull_bbox = (0, 0, 10, 10)
+        board = _RecordingBoard()
+        group = plugin.create_violation_group(board, "Via", "CLK", 1)
+        plugin.draw_error_marker(board, pcbnew.VECTOR2I(20, 0), "NO VIA", 3, group)
+
+        assert plugin._culled_markers == 1
+        assert _flush(plugin, board) == 0
+        assert board.added == []
+
+    def test_arrow_with_one_end_inside_region_is_drawn(self, plugin):
+        plugin._cull_bbox = (0, 0, 10, 10)
+        board = _RecordingBoard()
+        group = plugin.create_violation_group(board, "GndPlane", "CLK", 1)
+        plugin.draw_arrow(board, pcbnew.VECTOR2I(5, 0), pcbnew.VECTOR2I(30, 0), "", 3, group)
+        plugin.draw_arrow(board, pcbnew.VECTOR2I(20, 0), pcbnew.VECTOR2I(30, 0), "", 3, group)
+
+        assert plugin.flush_arrows(board) == 1
+        assert plugin.flush_violation_groups(board) == 1
@@ -0,0 +1,54 @@
+"""
+Test suite for net_matching.py - shared net name pattern matching helpers.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent src/ to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from net_matching import UpperCaseCache, compile_substring_matcher, net_pattern_matcher
+
+
+class TestCompileSubstringMatcher:
+    """Single-regex replacement for any(pattern in text ...) scans."""
+
+    def test_matches_like_any_substring(self):
+        patterns = ["GND", "VSS", "A+B"]
+        match = compile_substring_matcher(patterns)
+
+        for text in ["GND", "/AGND_1", "VSSA", "NET_A+B", "VCC", "GN D", ""]:
+            assert bool(match(text)) == any(p in text for p in patterns)
+
+    def test_empty_pattern_list_never_matches(self):
+        match = compile_substring_matcher([])
+
+        assert not match("GND")
+        assert not match("")
+
+
+class TestUpperCaseCache:
+    """Each distinct name is uppercased once."""
+
+    def test_uppercases_and_memoizes(self):
+        cache = UpperCaseCache()
+
+        assert cache["gnd_a"] == "GND_A"
+        assert cache == {"gnd_a": "GND_A"}
+
+
+class TestNetPatternMatcher:
+    """net_pattern_matcher() must agree with the per-pattern substring scan it replaces."""
+
+    def test_matches_like_any_case_insensitive_substring(self):
+        patterns = ['GND', 'agnd', 'PE', 'A+B']
+        is_match = net_pattern_matcher(patterns)
+
+        for net_name in ['GND', '/agnd_1', 'Net-(PE1)', 'pe', 'net_a+b', 'VCC', 'G N D', '']:
+            expected = any(p.upper() in net_name.upper() for p in patterns)
+            assert is_match(net_name) == expected
+            assert is_match(net_name) == expected  # memoized result
+
+    def test_empty_pattern_list_matches_nothing(self):
+        assert net_pattern_matcher([])('GND') is False
@@ -0,0 +1,136 @@
+"""
+Test suite for spatial_index.py - grid indexes shared by the checkers and the plugin.
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent src/ to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / 'src'))
+
+from tests.helpers import MockZone
+
+# pcbnew will be available via conftest.py mock
+import pcbnew
+
+from spatial_index import PointGridIndex, ZoneGridIndex
+
+
+class TestZoneGridIndex:
+    """Per-layer zone index used to limit HitTestFilledArea calls."""
+
+    def _zones(self):
+        left = MockZone("GND", 1, coverage_rects=[(0, 0, pcbnew.FromMM(10), pcbnew.FromMM(10))])
+        right = MockZone("VCC", 1, coverage_rects=[(pcbnew.FromMM(20), 0, pcbnew.FromMM(30), pcbnew.FromMM(10))])
+        overlap = MockZone("GND2", 1, coverage_rects=[(pcbnew.FromMM(5), 0, pcbnew.FromMM(25), pcbnew.FromMM(5))])
+        return left, right, overlap
+
+    def test_query_returns_only_zones_containing_point(self):
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left, right, overlap])
+
+        assert index.query(pcbnew.FromMM(2), pcbnew.FromMM(8)) == [left]
+        assert index.query(pcbnew.FromMM(28), pcbnew.FromMM(8)) == [right]
+        assert index.query(pcbnew.FromMM(15), pcbnew.FromMM(8)) == []
+
+    def test_query_preserves_zone_order(self):
+        """Overlapping bboxes come back in original zone order (first hit wins)."""
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left, right, overlap])
+
+        assert index.query(pcbnew.FromMM(7), pcbnew.FromMM(2)) == [left, overlap]
+        assert index.query(pcbnew.FromMM(22), pcbnew.FromMM(2)) == [right, overlap]
+
+    def test_query_outside_extent_and_empty_index(self):
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left, right, overlap])
+
+        assert index.query(pcbnew.FromMM(-50), pcbnew.FromMM(-50)) == []
+        assert index.query(pcbnew.FromMM(500), pcbnew.FromMM(500)) == []
+        assert ZoneGridIndex([]).query(0, 0) == []
+
+    def test_bbox_edges_are_inclusive(self):
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left])
+
+        assert index.query(pcbnew.FromMM(10), pcbnew.FromMM(10)) == [left]
+        assert index.query(0, 0) == [left]
+
+    def test_overlaps_track_box(self):
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left, right])
+        mm = pcbnew.FromMM
+
+        assert index.overlaps(mm(12), mm(2), mm(18), mm(3)) is False
+        assert index.overlaps(mm(12), mm(2), mm(20), mm(3)) is True
+        assert index.overlaps(mm(-5), mm(-5), mm(-1), mm(-1)) is False
+        assert ZoneGridIndex([]).overlaps(0, 0, mm(1), mm(1)) is False
+
+    def test_bucket_is_unfiltered_superset_of_query(self):
+        left, right, overlap = self._zones()
+        index = ZoneGridIndex([left, right, overlap])
+        x, y = pcbnew.FromMM(7), pcbnew.FromMM(8)
+
+        zones = [entry[4] for entry in index.bucket(x, y)]
+        assert index.query(x, y) == [left]
+        assert zones[:1] == [left] and set(index.query(x, y)) <= set(zones)
+        assert index.bucket(pcbnew.FromMM(-50), pcbnew.FromMM(-50)) == ()
+
+
+class TestPointGridIndex:
+    """Fixed-radius proximity queries (GND pads/vias, via stitching, marker merging)."""
+
+    def test_matches_brute_force(self):
+        import random
+        rng = random.Random(7)
+        radius = pcbnew.FromMM(0.3)
+        span = pcbnew.FromMM(5)
+        points = [(rng.randint(-span, span), rng.randint(-span, span)) for _ in range(60)]
+        index = PointGridIndex(points, radius)
+
+        for _ in range(500):
+            x, y = rng.randint(-span, span), rng.randint(-span, span)
+            expected = any((px - x) ** 2 + (py - y) ** 2 < radius * radius for px, py in points)
+            assert index.any_within(x, y) == expected
+
+    def test_zero_radius_never_matches_any_within(self):
+        index = PointGridIndex([(0, 0)], 0)
+
+        assert not index.any_within(0, 0)
+
+    def test_negative_radius_indexes_nothing(self):
+        index = PointGridIndex([(0, 0)], -1)
+        index.add(0, 0)
+
+        assert index.count == 0
+        assert not index.any_within(0, 0)
+        assert index.first_within(0, 0) is None
+
+    def test_first_within_returns_earliest_added_point(self):
+        radius = pcbnew.FromMM(1)
+        index = PointGridIndex([(radius // 2, 0, "far"), (0, radius - 1, "near")], radius)
+        index.add(0, 0, "late")
+
+        assert index.first_within(0, 0) == ("far", (radius // 2) ** 2)
+
+    def test_first_within_radius_is_inclusive(self):
+        radius = pcbnew.FromMM(1)
+        index = PointGridIndex([(radius, 0, "edge")], radius)
+
+        assert index.first_within(0, 0) == ("edge", radius * radius)
+        assert index.first_within(-1, 0) is None
+        assert PointGridIndex([(0, 0, "same")], 0).first_within(0, 0) == ("same", 0)
+
+    def test_first_within_matches_linear_scan(self):
+        import random
+        rng = random.Random(11)
+        radius = pcbnew.FromMM(0.8)
+        span = pcbnew.FromMM(5)
+        points = [(rng.randint(-span, span), rng.randint(-span, span), n) for n in range(60)]
+        index = PointGridIndex(points, radius)
+
+        for _ in range(500):
+            x, y = rng.randint(-span, span), rng.randint(-span, span)
+            expected = next(((n, (px - x) ** 2 + (py - y) ** 2) for px, py, n in points
+                             if (px - x) ** 2 + (py - y) ** 2 <= radius * radius), None)
+            assert index.first_within(x, y) == expected
@@ -60,7 +60,8 @@ class TestCheck01TraceNearPlaneEdge:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Disabled check should skip and return 0
@@ -122,7 +123,8 @@ class TestCheck05NetLength:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # 20mm trace is within 30mm limit
@@ -156,7 +158,8 @@ class TestCheck05NetLength:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Non-critical net should be skipped
@@ -198,7 +201,8 @@ class TestCheck07UnreferencedTraces:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Valid netted track should have no violations
@@ -263,7 +267,8 @@ class TestCheck09IsolationSingleEnded:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Traces 2mm apart satisfy 1mm clearance
@@ -313,7 +318,8 @@ class TestCheck12DifferentialPairMatching:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Matched pair should have no violations
@@ -350,7 +356,8 @@ class TestCheck12DifferentialPairMatching:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Non-DP nets should be skipped
@@ -399,7 +406,8 @@ class TestCheck14ControlledImpedance:
             checker.draw_arrow,
             checker.get_distance,
             checker.log,
-            checker.create_group
+            checker.create_group,
+            checker.get_distance_sq
         )
         
         # Should skip gracefully without crash
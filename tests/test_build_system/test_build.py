@@ -167,6 +167,8 @@ class TestPackageContents:
         "emi_filtering.py",
         "ground_plane.py",
         "via_stitching.py",
+        "net_matching.py",
+        "spatial_index.py",
         "emc_rules.toml",
         "emc_icon.png",
         "icon-24.png",
@@ -93,6 +93,11 @@ class TestReturnViaProximity:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -109,7 +114,8 @@ class TestReturnViaProximity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -173,6 +179,11 @@ class TestReturnViaProximity:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -186,7 +197,8 @@ class TestReturnViaProximity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -236,6 +248,11 @@ class TestReturnViaProximity:
         def mock_get_distance(pos1, pos2):
             return 0
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -248,7 +265,8 @@ class TestReturnViaProximity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -296,6 +314,11 @@ class TestReturnViaProximity:
         def mock_get_distance(pos1, pos2):
             return 0
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -308,7 +331,8 @@ class TestReturnViaProximity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert
@@ -382,6 +406,11 @@ class TestStitchingDensity:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -396,7 +425,8 @@ class TestStitchingDensity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Expected: 2500 mm² / 100 = 25 cm² * 4 vias/cm² = 100 vias needed, only 1 present
@@ -469,6 +499,11 @@ class TestStitchingDensity:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -481,7 +516,8 @@ class TestStitchingDensity:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Should return 0 violations (4 vias in 1 cm² = exactly 4 vias/cm²)
@@ -557,6 +593,11 @@ class TestViaNetAssignment:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -571,7 +612,8 @@ class TestViaNetAssignment:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert: VCC via should NOT be counted, so violation should be created
@@ -644,6 +686,11 @@ class TestViaNetAssignment:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -656,7 +703,8 @@ class TestViaNetAssignment:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Assert: Unnetted via should NOT be counted, so violation should be created
@@ -721,6 +769,11 @@ class TestEdgeStitching:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -735,7 +788,8 @@ class TestEdgeStitching:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Should create violation for 60mm gap (exceeds 20mm max)
@@ -800,6 +854,11 @@ class TestEdgeStitching:
             dy = pos1.y - pos2.y
             return (dx*dx + dy*dy) ** 0.5
         
+        def mock_get_distance_sq(pos1, pos2):
+            dx = pos1.x - pos2.x
+            dy = pos1.y - pos2.y
+            return dx*dx + dy*dy
+        
         def mock_log(msg, force=False):
             pass
         
@@ -812,7 +871,8 @@ class TestEdgeStitching:
             mock_draw_arrow,
             mock_get_distance,
             mock_log,
-            mock_create_group
+            mock_create_group,
+            mock_get_distance_sq
         )
         
         # Should return 0 violations (all spacing ≤ 20mm)